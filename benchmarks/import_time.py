@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the CLI entry point
+
+Imports ``notebooklm_mcp.cli`` in fresh interpreters under ``python -X
+importtime`` and reports the median cumulative import time, the slowest
+modules of the median run, and whether any browser or server stack module
+(selenium, fastmcp, ...) was loaded. Exits with status 1 when the median is
+over ``--budget-ms`` or a heavy module was loaded, so it can gate CI.
+
+Usage:
+    python benchmarks/import_time.py --runs 9 --budget-ms 150 -o imports.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+MODULE = "notebooklm_mcp.cli"
+# Only commands that start a browser or the MCP server may import these
+HEAVY_MODULES = (
+    "selenium",
+    "undetected_chromedriver",
+    "fastmcp",
+    "pydantic",
+    "psutil",
+    "prometheus_client",
+    "loguru",
+)
+
+PROBE = (
+    "import json, sys\n"
+    f"import {MODULE}\n"
+    f"heavy = {list(HEAVY_MODULES)!r}\n"
+    "print(json.dumps(sorted(m for m in heavy if m in sys.modules)))\n"
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """(module, cumulative microseconds) for each line of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(cumulative)))
+    return rows
+
+
+def measure_once() -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = parse_importtime(result.stderr)
+    total = dict(rows)[MODULE]
+    slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:10]
+    return {
+        "total_ms": total / 1000,
+        "slowest": [{"module": m, "ms": us / 1000} for m, us in slowest],
+        "heavy_modules": json.loads(result.stdout),
+    }
+
+
+def run(runs: int, budget_ms: float) -> Dict[str, Any]:
+    samples = [measure_once() for _ in range(runs)]
+    totals = [sample["total_ms"] for sample in samples]
+    median = statistics.median(totals)
+    median_run = min(samples, key=lambda sample: abs(sample["total_ms"] - median))
+    heavy = sorted({m for sample in samples for m in sample["heavy_modules"]})
+    return {
+        "module": MODULE,
+        "runs": runs,
+        "median_ms": median,
+        "min_ms": min(totals),
+        "max_ms": max(totals),
+        "budget_ms": budget_ms,
+        "heavy_modules": heavy,
+        "slowest": median_run["slowest"],
+        "ok": median <= budget_ms and not heavy,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=9, help="Fresh interpreters")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=150.0,
+        help="Fail when the median import time is above this",
+    )
+    parser.add_argument("-o", "--output", help="Write results JSON here")
+    args = parser.parse_args()
+
+    results = run(args.runs, args.budget_ms)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    sys.stdout.write(text + "\n")
+    if not results["ok"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
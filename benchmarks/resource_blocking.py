@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Page-load benchmark for CDP resource blocking
+
+Loads the bundled fake NotebookLM page, padded with fonts, images and an
+analytics script, in a headless browser with ``block_resources`` off and on,
+and reports navigation time, hydration time, asset requests that reached the
+server and the browser's process-tree RSS for each mode.
+
+Usage:
+    python benchmarks/resource_blocking.py --loads 10 -o blocking.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from notebooklm_mcp.client import NotebookLMClient
+from notebooklm_mcp.config import AuthConfig, ServerConfig
+from notebooklm_mcp.fake_notebooklm import FakeNotebookLMOptions, FakeNotebookLMServer
+from notebooklm_mcp.monitoring import collect_browser_resources
+
+NOTEBOOKS = ("bench-notebook-a", "bench-notebook-b")
+
+
+def mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+async def measure(
+    fake: FakeNotebookLMServer, profile_dir: Path, block: bool, loads: int
+) -> Dict[str, Any]:
+    """Navigate between two notebooks ``loads`` times with blocking on or off"""
+    config = ServerConfig(
+        headless=True,
+        timeout=30,
+        base_url=fake.base_url,
+        default_notebook_id=NOTEBOOKS[0],
+        block_resources=block,
+        auth=AuthConfig(profile_dir=str(profile_dir), use_persistent_session=False),
+    )
+    client = NotebookLMClient(config)
+    assets_before = fake.stats()["asset_requests"]
+    navigate: List[float] = []
+    hydrate: List[float] = []
+    loop = asyncio.get_running_loop()
+
+    await client.start()
+    try:
+        for i in range(loads):
+            started = loop.time()
+            await client.navigate_to_notebook(NOTEBOOKS[i % len(NOTEBOOKS)])
+            navigate.append(loop.time() - started)
+            if client.last_hydration_time is not None:
+                hydrate.append(client.last_hydration_time)
+
+        resources = await loop.run_in_executor(
+            None, collect_browser_resources, client.driver
+        )
+    finally:
+        await client.close()
+
+    return {
+        "block_resources": block,
+        "loads": loads,
+        "navigate_mean_s": mean(navigate),
+        "navigate_max_s": max(navigate, default=0.0),
+        "hydrate_mean_s": mean(hydrate),
+        "asset_requests": fake.stats()["asset_requests"] - assets_before,
+        "rss_mb": resources.rss_mb if resources else None,
+        "renderer_processes": (
+            resources.process_types.get("renderer", 0) if resources else None
+        ),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    options = FakeNotebookLMOptions(
+        asset_kb=args.asset_kb,
+        asset_count=args.asset_count,
+        asset_delay=args.asset_delay,
+    )
+    results: Dict[str, Any] = {}
+    with FakeNotebookLMServer(options) as fake, tempfile.TemporaryDirectory() as tmp:
+        for block in (False, True):
+            mode = "blocked" if block else "unblocked"
+            results[mode] = await measure(fake, Path(tmp) / mode, block, args.loads)
+
+    unblocked, blocked = results["unblocked"], results["blocked"]
+    results["navigate_speedup"] = (
+        unblocked["navigate_mean_s"] / blocked["navigate_mean_s"]
+        if blocked["navigate_mean_s"]
+        else None
+    )
+    if unblocked["rss_mb"] is not None and blocked["rss_mb"] is not None:
+        results["rss_saved_mb"] = unblocked["rss_mb"] - blocked["rss_mb"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--loads", type=int, default=10, help="Page loads per mode")
+    parser.add_argument(
+        "--asset-kb", type=int, default=256, help="Size of each fake asset"
+    )
+    parser.add_argument(
+        "--asset-count", type=int, default=8, help="Images per notebook page"
+    )
+    parser.add_argument(
+        "--asset-delay",
+        type=float,
+        default=0.05,
+        help="Seconds the fake server stalls each asset",
+    )
+    parser.add_argument("-o", "--output", help="Write results JSON here")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks for the NotebookLM MCP server
+
+Drives a real ``notebooklm-mcp server`` process over the stdio or HTTP transport
+against the bundled fake NotebookLM page (``notebooklm_mcp.fake_notebooklm``),
+so numbers are reproducible on a plain Linux box with Chrome installed.
+
+Usage:
+    python benchmarks/run_benchmarks.py run --transport stdio -o stdio.json
+    python benchmarks/run_benchmarks.py run --transport http -o http.json
+    python benchmarks/run_benchmarks.py compare baseline.json current.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastmcp import Client
+from fastmcp.client.transports import StdioTransport, StreamableHttpTransport
+
+from notebooklm_mcp.fake_notebooklm import FakeNotebookLMOptions, FakeNotebookLMServer
+
+NOTEBOOK_A = "bench-notebook-a"
+NOTEBOOK_B = "bench-notebook-b"
+DEFAULT_CONCURRENCY = (1, 4, 16)
+
+# Metrics where a larger value is an improvement; everything else is a latency
+HIGHER_IS_BETTER = ("rps",)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of ``values`` (``q`` in 0..100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary for a list of samples in seconds"""
+    return {
+        "n": len(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0,
+    }
+
+
+def write_server_config(directory: Path, base_url: str) -> Path:
+    """Write a headless config pointing the server at the fake page"""
+    config = {
+        "headless": True,
+        "timeout": 30,
+        "default_notebook_id": NOTEBOOK_A,
+        "base_url": base_url,
+        "streaming_timeout": 30,
+        "response_stability_checks": 2,
+        "auth": {
+            "profile_dir": str(directory / "profile"),
+            "use_persistent_session": False,
+        },
+    }
+    path = directory / "bench-config.json"
+    path.write_text(json.dumps(config, indent=2))
+    return path
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(config_path: Path, *extra: str) -> List[str]:
+    return [
+        sys.executable,
+        "-m",
+        "notebooklm_mcp.cli",
+        "--config",
+        str(config_path),
+        "server",
+        "--headless",
+        *extra,
+    ]
+
+
+class ServerUnderTest:
+    """Launches the MCP server for one transport and hands out clients"""
+
+    def __init__(self, transport: str, config_path: Path, workdir: Path):
+        self.transport = transport
+        self.config_path = config_path
+        self.workdir = workdir
+        self.process: Optional[subprocess.Popen] = None
+        self.url: Optional[str] = None
+
+    def start(self) -> None:
+        if self.transport != "http":
+            return
+
+        port = free_port()
+        self.url = f"http://127.0.0.1:{port}/mcp/"
+        self.process = subprocess.Popen(
+            server_command(
+                self.config_path, "--transport", "http", "--port", str(port)
+            ),
+            cwd=self.workdir,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                    return
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError("HTTP server did not start within 30s")
+
+    def client(self) -> Client:
+        if self.transport == "http":
+            return Client(StreamableHttpTransport(url=self.url))
+        command = server_command(self.config_path)
+        return Client(
+            StdioTransport(command=command[0], args=command[1:], cwd=str(self.workdir))
+        )
+
+    def stop(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+
+async def timed(call: Callable[[], Awaitable[Any]]) -> float:
+    start = time.perf_counter()
+    await call()
+    return time.perf_counter() - start
+
+
+async def measure_latencies(
+    client: Client, tool: str, arguments: Dict[str, Any], iterations: int
+) -> List[float]:
+    return [
+        await timed(lambda: client.call_tool(tool, arguments))
+        for _ in range(iterations)
+    ]
+
+
+async def measure_throughput(
+    sut: ServerUnderTest, shared: Client, concurrency: int, requests: int
+) -> Dict[str, float]:
+    """Issue ``requests`` chats from ``concurrency`` concurrent callers.
+
+    HTTP uses one MCP session per caller. stdio spawns one server per session,
+    so concurrent callers share the already-open session instead of launching
+    a browser each.
+    """
+    clients: List[Client] = []
+    if sut.transport == "http":
+        clients = [sut.client() for _ in range(concurrency)]
+        for client in clients:
+            await client.__aenter__()
+
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(requests):
+        queue.put_nowait(index)
+    samples: List[float] = []
+
+    async def worker(client: Client) -> None:
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            samples.append(
+                await timed(
+                    lambda: client.call_tool(
+                        "chat_with_notebook", {"message": f"throughput {index}"}
+                    )
+                )
+            )
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(worker(clients[i] if clients else shared) for i in range(concurrency))
+        )
+    finally:
+        for client in clients:
+            await client.__aexit__(None, None, None)
+    elapsed = time.perf_counter() - start
+
+    result = summarize(samples)
+    result["rps"] = len(samples) / elapsed if elapsed else 0.0
+    return result
+
+
+async def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    options = FakeNotebookLMOptions(
+        token_rate=args.token_rate,
+        answer_tokens=args.answer_tokens,
+        first_token_delay=args.first_token_delay,
+    )
+    metrics: Dict[str, Any] = {}
+
+    with FakeNotebookLMServer(options) as fake, tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        config_path = write_server_config(workdir, fake.base_url)
+        sut = ServerUnderTest(args.transport, config_path, workdir)
+
+        start = time.perf_counter()
+        sut.start()
+        client = sut.client()
+        try:
+            async with client:
+                await client.list_tools()
+                metrics["cold_start_s"] = time.perf_counter() - start
+
+                metrics["first_call_s"] = await timed(
+                    lambda: client.call_tool(
+                        "chat_with_notebook", {"message": "first question"}
+                    )
+                )
+
+                metrics["chat_with_notebook"] = summarize(
+                    await measure_latencies(
+                        client,
+                        "chat_with_notebook",
+                        {"message": "latency probe"},
+                        args.iterations,
+                    )
+                )
+                metrics["send_chat_message"] = summarize(
+                    await measure_latencies(
+                        client,
+                        "send_chat_message",
+                        {"message": "latency probe", "wait_for_response": True},
+                        args.iterations,
+                    )
+                )
+
+                same, switched = await measure_notebook_switch(client, args.iterations)
+                metrics["notebook_switch"] = {
+                    "same_notebook": summarize(same),
+                    "switched_notebook": summarize(switched),
+                    "overhead_p50_s": percentile(switched, 50) - percentile(same, 50),
+                }
+
+                metrics["throughput"] = {}
+                for concurrency in args.concurrency:
+                    metrics["throughput"][str(concurrency)] = await measure_throughput(
+                        sut, client, concurrency, args.throughput_requests
+                    )
+        finally:
+            sut.stop()
+
+        metrics["fake_server"] = fake.stats()
+
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "transport": args.transport,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "fake_options": vars(options),
+        },
+        "metrics": metrics,
+    }
+
+
+async def measure_notebook_switch(
+    client: Client, iterations: int
+) -> Tuple[List[float], List[float]]:
+    """Latency of chats that stay on a notebook vs. ones that switch"""
+    same: List[float] = []
+    switched: List[float] = []
+    current = NOTEBOOK_A
+
+    for index in range(iterations * 2):
+        target = (
+            current
+            if index % 2 == 0
+            else (NOTEBOOK_B if current == NOTEBOOK_A else NOTEBOOK_A)
+        )
+        elapsed = await timed(
+            lambda: client.call_tool(
+                "chat_with_notebook",
+                {"message": "switch probe", "notebook_id": target},
+            )
+        )
+        (same if target == current else switched).append(elapsed)
+        current = target
+
+    return same, switched
+
+
+def flatten(metrics: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    for key, value in metrics.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[Dict[str, Any]]:
+    """Return per-metric deltas, marking those worse than ``threshold``"""
+    base = flatten(baseline.get("metrics", {}))
+    head = flatten(current.get("metrics", {}))
+    rows = []
+
+    for name in sorted(base.keys() & head.keys()):
+        if name.startswith("fake_server.") or name.endswith(".n"):
+            continue
+        before, after = base[name], head[name]
+        if before:
+            # abs(): overheads such as notebook_switch.overhead_p50_s can be
+            # negative, and growing from -0.2 to -0.1 is still a slowdown
+            change = (after - before) / abs(before)
+        else:
+            # Nothing to scale against: any move away from zero is unbounded
+            change = math.copysign(math.inf, after) if after else 0.0
+        higher_is_better = name.rsplit(".", 1)[-1] in HIGHER_IS_BETTER
+        regressed = change < -threshold if higher_is_better else change > threshold
+        rows.append(
+            {
+                "metric": name,
+                "baseline": before,
+                "current": after,
+                "change": change,
+                "regression": regressed,
+            }
+        )
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    run_parser.add_argument("--iterations", type=int, default=20)
+    run_parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=list(DEFAULT_CONCURRENCY),
+        help="Comma separated concurrency levels (default: 1,4,16)",
+    )
+    run_parser.add_argument("--throughput-requests", type=int, default=32)
+    run_parser.add_argument("--token-rate", type=float, default=200.0)
+    run_parser.add_argument("--answer-tokens", type=int, default=60)
+    run_parser.add_argument("--first-token-delay", type=float, default=0.2)
+    run_parser.add_argument("--output", "-o", help="Write results JSON to this file")
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two result files and flag regressions"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative change that counts as a regression (default: 0.10)",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = asyncio.run(run_suite(args))
+        output = json.dumps(results, indent=2)
+        if args.output:
+            Path(args.output).write_text(output)
+            print(f"Results written to {args.output}")
+        else:
+            print(output)
+        return
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    rows = compare(baseline, current, args.threshold)
+
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['metric']:<50} {row['baseline']:>10.4f} -> "
+            f"{row['current']:>10.4f} ({row['change']:+.1%}) {flag}"
+        )
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed beyond {args.threshold:.0%}")
+        sys.exit(1)
+    print("\nNo regressions detected")
+
+
+if __name__ == "__main__":
+    main()
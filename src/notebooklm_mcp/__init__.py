@@ -13,10 +13,34 @@ __description__ = (
     "FastMCP v2 server for NotebookLM automation with modern async support"
 )
 
-from .client import NotebookLMClient
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .config import AuthConfig, ServerConfig
 from .exceptions import AuthenticationError, NotebookLMError, StreamingError
-from .server import NotebookLMFastMCP
+
+if TYPE_CHECKING:
+    from .client import NotebookLMClient
+    from .server import NotebookLMFastMCP
+
+# Imported on first access: they pull in selenium and fastmcp
+_LAZY_EXPORTS = {
+    "NotebookLMClient": ".client",
+    "NotebookLMFastMCP": ".server",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "NotebookLMFastMCP",
@@ -0,0 +1,187 @@
+"""
+stdio front end for a shared HTTP backend
+
+Every stdio MCP client normally spawns its own server, and therefore its own
+Chrome on the same profile. In shared mode the stdio server is only a proxy:
+it forwards every MCP request to one HTTP/SSE backend per profile, discovered
+through a state file next to the profile, and spawns that backend if none is
+running. Many editors then share one warm browser.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from .browser_cache import file_lock
+from .config import ServerConfig
+from .ports import DEBUG_HOST, allocate_debugging_port, release_debugging_port
+
+STATE_SUFFIX = ".backend.json"
+BACKEND_PATHS = {"http": "/mcp/", "sse": "/sse/"}
+CONNECT_TIMEOUT = 1.0
+SPAWN_TIMEOUT = 60.0
+
+
+def state_path(config: ServerConfig) -> Path:
+    """Shared backend state file for the config's Chrome profile"""
+    profile = Path(config.auth.profile_dir).absolute()
+    return profile.with_name(profile.name + STATE_SUFFIX)
+
+
+def backend_url(transport: str, host: str, port: int) -> str:
+    # A wildcard bind is still reachable on loopback
+    if host in ("0.0.0.0", "::", ""):
+        host = DEBUG_HOST
+    return f"http://{host}:{port}{BACKEND_PATHS[transport]}"
+
+
+def reachable(url: str) -> bool:
+    parsed = urlparse(url)
+    try:
+        with socket.create_connection(
+            (parsed.hostname, parsed.port), timeout=CONNECT_TIMEOUT
+        ):
+            return True
+    except OSError:
+        return False
+
+
+def discover_backend(config: ServerConfig) -> Optional[Dict[str, Any]]:
+    """The running shared backend for this profile, dropping a stale record"""
+    path = state_path(config)
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if reachable(state["url"]):
+        return state
+
+    logger.info(f"Shared backend at {state['url']} is gone")
+    path.unlink(missing_ok=True)
+    return None
+
+
+@contextmanager
+def register_backend(
+    config: ServerConfig, transport: str, host: str, port: int
+) -> Iterator[Dict[str, Any]]:
+    """Advertise this HTTP/SSE server as the profile's shared backend"""
+    path = state_path(config)
+    state = {
+        "url": backend_url(transport, host, port),
+        "transport": transport,
+        "pid": os.getpid(),
+        "started_at": time.time(),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state))
+    try:
+        yield state
+    finally:
+        try:
+            if json.loads(path.read_text()).get("pid") == os.getpid():
+                path.unlink()
+        except (OSError, ValueError):
+            pass
+
+
+def spawn_command(
+    config_file: Optional[str],
+    port: int,
+    debug: bool = False,
+    server_args: Sequence[str] = (),
+) -> List[str]:
+    """Command line of a backend, carrying over the ``server`` CLI overrides"""
+    command = [sys.executable, "-m", "notebooklm_mcp.cli"]
+    if config_file and os.path.exists(config_file):
+        command += ["--config", config_file]
+    if debug:
+        command.append("--debug")
+    return command + [
+        "server",
+        *server_args,
+        "--transport",
+        "http",
+        "--host",
+        DEBUG_HOST,
+        "--port",
+        str(port),
+    ]
+
+
+def ensure_backend(
+    config: ServerConfig,
+    config_file: Optional[str] = None,
+    timeout: float = SPAWN_TIMEOUT,
+    server_args: Sequence[str] = (),
+) -> Dict[str, Any]:
+    """Find the shared backend or start one, returning its state
+
+    A file lock makes editors starting at the same moment spawn one backend
+    between them. ``server_args`` are the ``server`` options (``--headless``,
+    ``--notebook``, ...) a new backend is started with.
+    """
+    path = state_path(config)
+    with file_lock(path.with_suffix(".lock")):
+        state = discover_backend(config)
+        if state is not None:
+            return state
+
+        # Any free port will do; the backend binds it right away
+        port = allocate_debugging_port()
+        release_debugging_port(port)
+        command = spawn_command(config_file, port, config.debug, server_args)
+        log_path = path.with_suffix(".log")
+        with open(log_path, "ab") as log:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        logger.info(f"Spawned shared backend (pid {process.pid}), log: {log_path}")
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Shared backend exited early, see {log_path}")
+            state = discover_backend(config)
+            if state is not None:
+                return state
+            time.sleep(0.2)
+
+    raise RuntimeError(f"Shared backend did not come up within {timeout:.0f}s")
+
+
+def create_proxy(url: str, name: str) -> Any:
+    """FastMCP server that forwards every request to ``url``"""
+    try:
+        from fastmcp.server import create_proxy as fastmcp_create_proxy
+    except ImportError:  # fastmcp 2.x
+        from fastmcp import FastMCP
+
+        return FastMCP.as_proxy(url, name=name)
+    return fastmcp_create_proxy(url, name=name)
+
+
+async def run_stdio_bridge(
+    config: ServerConfig,
+    config_file: Optional[str] = None,
+    server_args: Sequence[str] = (),
+) -> None:
+    """Serve stdio by proxying to the profile's shared backend"""
+    state = ensure_backend(config, config_file, server_args=server_args)
+    logger.info(f"Bridging stdio to shared backend at {state['url']}")
+    proxy = create_proxy(state["url"], name="NotebookLM MCP Server v2")
+    await proxy.run_async(transport="stdio")
@@ -0,0 +1,211 @@
+"""
+Startup cache for undetected-chromedriver
+
+``uc.Chrome(version_main=None)`` probes the installed Chrome version and
+downloads and patches a chromedriver on every start, which costs seconds and
+corrupts the binary when two starts patch it at once. This module does that
+work once per Chrome install: the detected version and a patched driver are
+kept under a cache directory, keyed by the Chrome binary path and invalidated
+when the binary changes (e.g. after an update). A file lock serializes the
+first start so concurrent browsers (recycling, daemon, CLI) reuse one result.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+CACHE_FILE = "startup.json"
+LOCK_FILE = "startup.lock"
+VERSION_PROBE_TIMEOUT = 10
+CHROME_NAMES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+)
+
+
+@dataclass
+class BrowserStartup:
+    """What ``uc.Chrome`` would otherwise work out on every start"""
+
+    browser_path: str
+    version_main: Optional[int]
+    driver_path: Optional[str]
+
+    def chrome_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "browser_executable_path": self.browser_path,
+            "version_main": self.version_main,
+        }
+        if self.driver_path:
+            # An already patched custom driver is used as is, no download
+            kwargs["driver_executable_path"] = self.driver_path
+        return kwargs
+
+
+def cache_dir(configured: Optional[str] = None) -> Path:
+    if configured:
+        return Path(configured).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "notebooklm-mcp"
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Exclusive lock across processes, held for the ``with`` block"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def find_chrome(uc: Any = None) -> Optional[str]:
+    """Path of the Chrome binary undetected-chromedriver would launch"""
+    finder = getattr(uc, "find_chrome_executable", None)
+    if finder is not None:
+        try:
+            found = finder()
+        except Exception:
+            found = None
+        if found:
+            return str(found)
+
+    for name in CHROME_NAMES:
+        found = shutil.which(name)
+        if found:
+            return found
+    return None
+
+
+def probe_version(browser_path: str) -> Optional[int]:
+    """Major version reported by ``<chrome> --version``"""
+    try:
+        result = subprocess.run(
+            [browser_path, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=VERSION_PROBE_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Chrome version probe failed: {e}")
+        return None
+
+    match = re.search(r"(\d+)\.\d+\.\d+", result.stdout)
+    return int(match.group(1)) if match else None
+
+
+def patch_driver(uc: Any, version_main: int, directory: Path) -> Optional[str]:
+    """Download and patch a chromedriver once and keep a copy in ``directory``"""
+    suffix = ".exe" if sys.platform.startswith("win") else ""
+    target = directory / f"chromedriver-{version_main}{suffix}"
+
+    try:
+        patcher = uc.Patcher(version_main=version_main)
+        if target.exists() and patcher.is_binary_patched(str(target)):
+            return str(target)
+
+        patcher.auto()
+        shutil.copy2(patcher.executable_path, target)
+    except Exception as e:
+        logger.warning(f"Could not cache patched chromedriver: {e}")
+        return None
+    return str(target)
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(path: Path, data: Dict[str, Any]) -> None:
+    temp = path.with_suffix(".tmp")
+    temp.write_text(json.dumps(data, indent=2))
+    os.replace(temp, path)
+
+
+def prepare(uc: Any, configured_dir: Optional[str] = None) -> Optional[BrowserStartup]:
+    """Cached Chrome version and patched driver, computing them on a miss
+
+    Returns None when no Chrome binary can be found or its version cannot be
+    probed, leaving detection to uc. A driver for an unknown version would be
+    the latest one, which may not match the installed Chrome, and caching it
+    would keep it around after that Chrome fails to start.
+    """
+    browser_path = find_chrome(uc)
+    if browser_path is None:
+        return None
+
+    directory = cache_dir(configured_dir)
+    stat = os.stat(browser_path)
+    with file_lock(directory / LOCK_FILE):
+        data = _load(directory / CACHE_FILE)
+        entry = data.get(browser_path)
+        if (
+            entry
+            and entry["mtime"] == stat.st_mtime
+            and entry["size"] == stat.st_size
+            and (entry["driver_path"] is None or Path(entry["driver_path"]).exists())
+        ):
+            logger.debug(f"Browser startup cache hit for {browser_path}")
+            return BrowserStartup(
+                browser_path, entry["version_main"], entry["driver_path"]
+            )
+
+        logger.info(f"Preparing browser startup cache for {browser_path}")
+        version_main = probe_version(browser_path)
+        if version_main is None:
+            logger.warning(
+                f"Cannot tell the version of {browser_path}; "
+                "starting without the browser startup cache"
+            )
+            return None
+        driver_path = patch_driver(uc, version_main, directory)
+        data[browser_path] = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "version_main": version_main,
+            "driver_path": driver_path,
+        }
+        _save(directory / CACHE_FILE, data)
+    return BrowserStartup(browser_path, version_main, driver_path)
+
+
+def invalidate(startup: BrowserStartup, configured_dir: Optional[str] = None) -> None:
+    """Forget a cached entry that failed to start a browser"""
+    directory = cache_dir(configured_dir)
+    with file_lock(directory / LOCK_FILE):
+        data = _load(directory / CACHE_FILE)
+        if data.pop(startup.browser_path, None) is not None:
+            _save(directory / CACHE_FILE, data)
+    if startup.driver_path:
+        Path(startup.driver_path).unlink(missing_ok=True)
@@ -5,14 +5,19 @@ Enhanced with improved response parsing for cleaner AI responses.
 """
 
 import asyncio
+import contextvars
+import fnmatch
+import functools
 import time
+from collections import Counter, deque
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from loguru import logger
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
@@ -24,8 +29,76 @@ try:
 except ImportError:
     USE_UNDETECTED = False
 
+from . import browser_cache, cookies, detached, telemetry
 from .config import ServerConfig
 from .exceptions import AuthenticationError, ChatError, NavigationError
+from .monitoring import metrics_collector
+from .ports import (
+    DEBUG_HOST,
+    allocate_debugging_port,
+    debugger_port,
+    release_debugging_port,
+)
+from .profile import compact_profile, tree_size
+from .profiler import CommandTracer, traced_phase
+from .recovery import is_dead_session_error
+
+# Chat input candidates, most specific first
+CHAT_INPUT_SELECTORS = (
+    "textarea[placeholder*='Ask']",
+    "textarea[data-testid*='chat']",
+    "textarea[aria-label*='message']",
+    "[contenteditable='true'][role='textbox']",
+    "input[type='text'][placeholder*='Ask']",
+    "textarea:not([disabled])",
+)
+
+# Polls in the page until a chat input is visible and no new resources have
+# loaded for idleMs, the page turned out to be a sign-in page, or the deadline
+# passed. performance.now() is the time since this document started loading.
+PAGE_READY_SCRIPT = """
+const [selectors, deadlineMs, idleMs, done] = arguments;
+const start = performance.now();
+let lastCount = -1;
+let stableSince = start;
+function visible(el) {
+  const rect = el.getBoundingClientRect();
+  return rect.width > 0 && rect.height > 0 && !el.disabled;
+}
+function check() {
+  const now = performance.now();
+  const result = {selector: null, since_navigation: now, waited: now - start};
+  if (location.hostname.includes("accounts.google.com") ||
+      location.pathname.includes("signin")) {
+    done(Object.assign(result, {state: "signin"}));
+    return;
+  }
+  const count = performance.getEntriesByType("resource").length;
+  if (count !== lastCount) {
+    lastCount = count;
+    stableSince = now;
+  }
+  for (const selector of selectors) {
+    const el = document.querySelector(selector);
+    if (el && visible(el)) {
+      result.selector = selector;
+      break;
+    }
+  }
+  const idle = document.readyState === "complete" && now - stableSince >= idleMs;
+  if (result.selector && idle) {
+    done(Object.assign(result, {state: "ready"}));
+  } else if (now - start >= deadlineMs) {
+    done(Object.assign(result, {state: "timeout"}));
+  } else {
+    setTimeout(check, 50);
+  }
+}
+check();
+"""
+
+# WebDriver's default script timeout
+DEFAULT_SCRIPT_TIMEOUT = 30.0
 
 
 class NotebookLMClient:
@@ -36,6 +109,40 @@ class NotebookLMClient:
         self.driver: Optional[webdriver.Chrome] = None
         self.current_notebook_id: Optional[str] = config.default_notebook_id
         self._is_authenticated = False
+        self.tracer = CommandTracer(metrics_collector)
+        self.last_poll_iterations = 0
+        # Label for per-browser resource metrics
+        self.browser_id = "primary"
+        # Bumped on every crash restart so concurrent callers restart only once
+        self.generation = 0
+        self._restart_lock = asyncio.Lock()
+        # Serializes driver work so background prefetch never interleaves with
+        # a tool call
+        self._browser_lock = asyncio.Lock()
+        # Recently used notebooks and the (notebook_id, window handle) of a tab
+        # preloaded in the background
+        self._notebook_history: deque = deque(maxlen=config.prefetch_history_size)
+        self._prefetched: Optional[Tuple[str, str]] = None
+        # Notebook our own navigation left loaded and ready in the active tab;
+        # None when unknown. Trusting it saves a URL round trip per message.
+        self.loaded_notebook_id: Optional[str] = None
+        # Chat input selector that matched last; tried first next time
+        self._chat_input_selector: Optional[str] = None
+        # Seconds from navigation start until the page was ready for chat
+        self.last_hydration_time: Optional[float] = None
+        self._script_timeout = DEFAULT_SCRIPT_TIMEOUT
+        # DevTools port of this client's browser, unique per host
+        self.debugging_port: Optional[int] = None
+        # Attached to a Chrome we did not start as a chromedriver child
+        self.detached = False
+        self._prefetch_task: Optional["asyncio.Task[None]"] = None
+
+    async def _run_browser(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking driver call in the executor, one at a time"""
+        async with self._browser_lock:
+            # The caller's context carries its request trace into the thread
+            call = functools.partial(contextvars.copy_context().run, func, *args)
+            return await asyncio.get_event_loop().run_in_executor(None, call)
 
     async def start(self) -> None:
         """Start browser session"""
@@ -44,54 +151,62 @@ class NotebookLMClient:
 
     def _start_browser(self) -> None:
         """Initialize browser with proper configuration"""
-        if USE_UNDETECTED:
+        self.debugging_port = None
+        self.detached = False
+        if (
+            self.config.compact_profile_on_start
+            and self.uses_profile
+            and not self.config.detach_browser
+        ):
+            self._compact_profile()
+
+        if self.config.detach_browser:
+            self._start_detached_chrome()
+        elif USE_UNDETECTED:
             logger.info("Using undetected-chromedriver for better compatibility")
 
             # Create persistent profile directory
-            if self.config.auth.use_persistent_session:
+            if self.uses_profile:
                 profile_path = Path(self.config.auth.profile_dir).absolute()
                 profile_path.mkdir(exist_ok=True)
 
-            options = uc.ChromeOptions()
-            if self.config.auth.use_persistent_session:
-                options.add_argument(f"--user-data-dir={profile_path}")
-            options.add_argument("--no-first-run")
-            options.add_argument("--no-default-browser-check")
-            options.add_argument("--disable-extensions")
-
-            # Additional stability options for Windows
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-software-rasterizer")
-            options.add_argument("--disable-features=VizDisplayCompositor")
-
-            if self.config.headless:
-                options.add_argument("--headless=new")
-                options.add_argument("--window-size=1920,1080")
-                options.add_argument("--disable-background-networking")
-                options.add_argument("--disable-background-timer-throttling")
-                options.add_argument("--disable-backgrounding-occluded-windows")
-                options.add_argument("--disable-breakpad")
-                options.add_argument("--disable-component-extensions-with-background-pages")
-                options.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees")
-                options.add_argument("--disable-ipc-flooding-protection")
-                options.add_argument("--disable-renderer-backgrounding")
-                options.add_argument("--enable-features=NetworkService,NetworkServiceInProcess")
-                options.add_argument("--force-color-profile=srgb")
-                options.add_argument("--hide-scrollbars")
-                options.add_argument("--metrics-recording-only")
-                options.add_argument("--mute-audio")
-                # Fix for DevToolsActivePort crash on Windows
-                options.add_argument("--remote-debugging-port=9222")
-                options.add_argument("--disable-popup-blocking")
+            # A port of our own (set explicitly, this also avoids the
+            # DevToolsActivePort crash on Windows) so browsers can run side by side
+            port = allocate_debugging_port()
+
+            startup = None
+            chrome_kwargs = {"version_main": None}
+            if self.config.browser_cache:
+                try:
+                    startup = browser_cache.prepare(uc, self.config.browser_cache_dir)
+                except Exception as e:
+                    logger.warning(f"Browser startup cache unavailable: {e}")
+                if startup is not None:
+                    chrome_kwargs = startup.chrome_kwargs()
 
             try:
-                self.driver = uc.Chrome(options=options, version_main=None, headless=self.config.headless)
+                try:
+                    self.driver = self._start_undetected_chrome(port, chrome_kwargs)
+                except Exception as e:
+                    if startup is None:
+                        raise
+                    logger.warning(f"Cached chromedriver failed to start: {e}")
+                    # Next start probes and patches from scratch
+                    browser_cache.invalidate(startup, self.config.browser_cache_dir)
+                    logger.info(
+                        "Retrying undetected-chromedriver without the startup cache"
+                    )
+                    self.driver = self._start_undetected_chrome(
+                        port, {"version_main": None}
+                    )
+                self.debugging_port = port
             except Exception as e:
                 logger.warning(f"Failed to start undetected-chromedriver: {e}")
                 logger.info("Falling back to regular Chrome WebDriver")
                 self._start_regular_chrome()
+            finally:
+                # Chrome holds the port now, or never will
+                release_debugging_port(port)
         else:
             logger.warning(
                 "undetected-chromedriver not available, using regular Selenium"
@@ -101,14 +216,224 @@ class NotebookLMClient:
 
         if self.driver is None:
             raise RuntimeError("Failed to initialize browser driver")
+        self.debugging_port = debugger_port(self.driver) or self.debugging_port
+        logger.info(f"Browser DevTools listening on port {self.debugging_port}")
+        self.tracer.install(self.driver)
         self.driver.set_page_load_timeout(self.config.timeout)
+        if self.config.block_resources:
+            self._apply_resource_blocking()
+        if self.config.auth.cookies_path:
+            self._inject_cookies()
+
+    def _start_undetected_chrome(self, port: int, chrome_kwargs: Dict[str, Any]) -> Any:
+        """Start Chrome through undetected-chromedriver on DevTools ``port``"""
+        # A fresh options object each time: uc refuses to reuse one
+        options = uc.ChromeOptions()
+        if self.uses_profile:
+            profile_path = Path(self.config.auth.profile_dir).absolute()
+            options.add_argument(f"--user-data-dir={profile_path}")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        options.add_argument("--disable-extensions")
+
+        # Additional stability options for Windows
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-software-rasterizer")
+        options.add_argument("--disable-features=VizDisplayCompositor")
+
+        if self.config.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+            options.add_argument("--disable-background-networking")
+            options.add_argument("--disable-background-timer-throttling")
+            options.add_argument("--disable-backgrounding-occluded-windows")
+            options.add_argument("--disable-breakpad")
+            options.add_argument("--disable-component-extensions-with-background-pages")
+            options.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees")
+            options.add_argument("--disable-ipc-flooding-protection")
+            options.add_argument("--disable-renderer-backgrounding")
+            options.add_argument(
+                "--enable-features=NetworkService,NetworkServiceInProcess"
+            )
+            options.add_argument("--force-color-profile=srgb")
+            options.add_argument("--hide-scrollbars")
+            options.add_argument("--metrics-recording-only")
+            options.add_argument("--mute-audio")
+            options.add_argument("--disable-popup-blocking")
+
+        # undetected-chromedriver appends its own --remote-debugging-port built
+        # from debugger_address, and Chrome takes the last one, so the port
+        # has to go in there
+        options.debugger_address = f"{DEBUG_HOST}:{port}"
+        return uc.Chrome(
+            options=options, headless=self.config.headless, **chrome_kwargs
+        )
+
+    @property
+    def uses_profile(self) -> bool:
+        """Whether Chrome runs on the configured profile directory
+
+        With a cookie jar configured, Chrome gets an empty throwaway profile
+        of its own and the jar supplies the session.
+        """
+        return (
+            self.config.auth.use_persistent_session
+            and not self.config.auth.cookies_path
+        )
+
+    def _inject_cookies(self) -> None:
+        """Load the encrypted cookie jar into the fresh browser"""
+        jar = cookies.load_cookie_jar(
+            self.config.auth.cookies_path, key_file=self.config.auth.cookies_key_file
+        )
+        self.driver.execute_cdp_cmd(
+            "Network.setCookies",
+            {"cookies": [cookies.cookie_param(cookie) for cookie in jar]},
+        )
+        logger.info(f"Injected {len(jar)} cookies from {self.config.auth.cookies_path}")
+
+    async def export_cookies(self) -> List[Dict[str, Any]]:
+        """The browser's Google cookies, for ``cookies.save_cookie_jar``"""
+        if not self.driver:
+            raise AuthenticationError("Browser not started")
+        return await self._run_browser(self._export_cookies_sync)
+
+    def _export_cookies_sync(self) -> List[Dict[str, Any]]:
+        try:
+            result = self.driver.execute_cdp_cmd("Storage.getCookies", {})
+        except WebDriverException:
+            # Older Chrome only has the (since deprecated) Network domain call
+            result = self.driver.execute_cdp_cmd("Network.getAllCookies", {})
+        return cookies.google_cookies(result.get("cookies", []))
+
+    def _compact_profile(self) -> None:
+        """Prune regenerable profile data if the profile has grown large"""
+        profile_path = Path(self.config.auth.profile_dir)
+        if not profile_path.exists():
+            return
+        if tree_size(profile_path) < self.config.compact_profile_min_mb * 1024 * 1024:
+            return
+        try:
+            report = compact_profile(profile_path)
+        except Exception as e:
+            logger.warning(f"Skipping profile compaction: {e}")
+            return
+        logger.info(f"Compacted Chrome profile: {report.summary()}")
+
+    def blocked_url_patterns(self) -> List[str]:
+        """Deny patterns to send to Chrome, minus any that hit an allowed URL"""
+        allowed = self.config.allowed_urls
+        patterns = []
+        for pattern in self.config.blocked_url_patterns:
+            if any(fnmatch.fnmatchcase(url, pattern) for url in allowed):
+                logger.debug(f"Not blocking {pattern}: matches an allowed URL")
+                continue
+            patterns.append(pattern)
+        return patterns
+
+    def _apply_resource_blocking(self) -> None:
+        """Tell the active tab to drop requests for heavy, unused resources"""
+        patterns = self.blocked_url_patterns()
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            logger.warning(f"Resource blocking unavailable: {e}")
+            return
+        logger.info(f"Blocking {len(patterns)} resource URL patterns")
+
+    async def update_config(self, config: ServerConfig) -> None:
+        """Adopt settings that apply without restarting the browser
+
+        The config object is swapped whole, so a browser call in flight sees
+        either the old or the new settings, never a mix.
+        """
+        timeout_changed = config.timeout != self.config.timeout
+        if (
+            config.default_notebook_id != self.config.default_notebook_id
+            and self.current_notebook_id == self.config.default_notebook_id
+        ):
+            # Still on the default: follow it. A notebook picked explicitly
+            # since then stays; the next message navigates if needed.
+            self.current_notebook_id = config.default_notebook_id
+        self.config = config
+        if timeout_changed and self.driver is not None:
+            await self._run_browser(self.driver.set_page_load_timeout, config.timeout)
+
+    async def restart(self, seen_generation: Optional[int] = None) -> bool:
+        """Replace a dead browser in place, restoring auth and notebook
+
+        ``seen_generation`` is the generation the caller failed on; if another
+        caller already restarted since then, nothing is done and False is
+        returned.
+        """
+        async with self._restart_lock:
+            if seen_generation is not None and seen_generation != self.generation:
+                return False
+            await self._run_browser(self._restart_sync)
+            self.generation += 1
+            return True
+
+    def _restart_sync(self) -> None:
+        was_authenticated = self._is_authenticated
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.debug(f"Ignoring error while quitting dead browser: {e}")
+        self.driver = None
+        self._is_authenticated = False
+        self._prefetched = None
+        self.loaded_notebook_id = None
+
+        logger.warning("Restarting browser after lost session")
+        self._start_browser()
+        if was_authenticated:
+            self._is_authenticated = self._authenticate_sync()
+
+    def _start_detached_chrome(self) -> None:
+        """Attach to this profile's detached Chrome, launching it if needed"""
+        state = detached.live_browser(self.config)
+        if state is None:
+            if self.config.compact_profile_on_start:
+                # Nothing holds the profile between launches
+                self._compact_profile()
+            browser_path = browser_cache.find_chrome(uc if USE_UNDETECTED else None)
+            if browser_path is None:
+                raise RuntimeError("Chrome not found, cannot launch a detached browser")
+            state = detached.launch_browser(self.config, browser_path)
+        else:
+            logger.info(f"Reattaching to detached Chrome (pid {state['pid']})")
+
+        opts = ChromeOptions()
+        opts.debugger_address = state["debugger_address"]
+
+        # Prefer the cached patched driver so pages do not see chromedriver
+        service = None
+        if USE_UNDETECTED and self.config.browser_cache:
+            try:
+                startup = browser_cache.prepare(uc, self.config.browser_cache_dir)
+            except Exception as e:
+                logger.warning(f"Browser startup cache unavailable: {e}")
+                startup = None
+            if startup is not None and startup.driver_path:
+                service = ChromeService(executable_path=startup.driver_path)
+
+        if service is not None:
+            self.driver = webdriver.Chrome(options=opts, service=service)
+        else:
+            self.driver = webdriver.Chrome(options=opts)
+        self.debugging_port = state["port"]
+        self.detached = True
 
     def _start_regular_chrome(self) -> None:
         """Fallback Chrome initialization"""
         opts = ChromeOptions()
 
         # Use profile directory if persistent session is enabled
-        if self.config.auth.use_persistent_session:
+        if self.uses_profile:
             profile_path = Path(self.config.auth.profile_dir).absolute()
             profile_path.mkdir(exist_ok=True, parents=True)
             opts.add_argument(f"--user-data-dir={profile_path}")
@@ -134,7 +459,6 @@ class NotebookLMClient:
             opts.add_argument("--disable-software-rasterizer")
             opts.add_argument("--disable-background-networking")
             opts.add_argument("--disable-renderer-backgrounding")
-            opts.add_argument("--remote-debugging-port=9222")
             opts.add_argument("--disable-extensions")
             opts.add_argument("--disable-popup-blocking")
 
@@ -143,6 +467,8 @@ class NotebookLMClient:
         opts.add_experimental_option("excludeSwitches", ["enable-automation"])
         opts.add_experimental_option("useAutomationExtension", False)
 
+        # No --remote-debugging-port: chromedriver then asks Chrome for port 0
+        # and reads back the one it bound, so there is nothing to collide with
         self.driver = webdriver.Chrome(options=opts)
 
         # Remove automation indicators
@@ -151,31 +477,96 @@ class NotebookLMClient:
         )
 
 
+    def _cookie_session_state(self) -> Optional[bool]:
+        """Session verdict from Google cookies, None when they can't tell"""
+        if not self.config.cookie_auth_probe or not cookies.is_google_url(
+            self.config.base_url
+        ):
+            return None
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Network.getCookies",
+                {"urls": [*cookies.GOOGLE_COOKIE_URLS, self.config.base_url]},
+            )
+        except Exception as e:
+            logger.debug(f"Cookie auth probe unavailable: {e}")
+            return None
+        return cookies.session_state(result.get("cookies", []))
+
+    async def check_session(self) -> Optional[bool]:
+        """Cheap re-check of authentication from session cookies
+
+        Skipped (None) while another browser call is running, so health
+        checks never queue behind a chat.
+        """
+        if self.driver is None or self._browser_lock.locked():
+            return None
+        state = await self._run_browser(self._cookie_session_state)
+        if state is not None:
+            self._is_authenticated = state
+        return state
+
     async def authenticate(self) -> bool:
         """Authenticate with NotebookLM"""
         if not self.driver:
             raise AuthenticationError("Browser not started")
 
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self._authenticate_sync
-        )
+        with telemetry.span(
+            "notebooklm.authenticate",
+            {"notebooklm.notebook_id": self.current_notebook_id},
+        ) as span:
+            authenticated = await self._run_browser(self._authenticate_sync)
+            span.set_attribute("notebooklm.authenticated", authenticated)
+            return authenticated
+
+    async def refresh_session(self) -> bool:
+        """Reload the notebook so Google renews the session, detecting sign-out
+
+        Always navigates; the cookie shortcut would renew nothing.
+        """
+        if not self.driver:
+            raise AuthenticationError("Browser not started")
+
+        with telemetry.span(
+            "notebooklm.refresh_session",
+            {"notebooklm.notebook_id": self.current_notebook_id},
+        ) as span:
+            authenticated = await self._run_browser(self._authenticate_sync, False)
+            span.set_attribute("notebooklm.authenticated", authenticated)
+            return authenticated
 
-    def _authenticate_sync(self) -> bool:
+    @traced_phase("auth")
+    def _authenticate_sync(self, probe_cookies: bool = True) -> bool:
         """Synchronous authentication logic"""
         if self.driver is None:
             raise RuntimeError("Browser driver not initialized")
 
+        # Session cookies usually settle it without loading the app; the
+        # notebook is then opened by the first chat call
+        state = self._cookie_session_state() if probe_cookies else None
+        if state is True:
+            logger.info("Authenticated via session cookies")
+            self._is_authenticated = True
+            return True
+        if state is False and self.config.headless:
+            logger.warning("No live Google session cookies - manual login required")
+            self._is_authenticated = False
+            return False
+
         target_url = self.config.base_url
         if self.current_notebook_id:
             target_url = f"{self.config.base_url}/notebook/{self.current_notebook_id}"
 
         logger.info(f"Navigating to: {target_url}")
+        self.loaded_notebook_id = None
         self.driver.get(target_url)
 
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            state = self._wait_for_page_ready()
+            if state not in ("ready", "signin"):
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
 
             current_url = self.driver.current_url
             logger.info(f"Current URL after navigation: {current_url}")
@@ -184,6 +575,8 @@ class NotebookLMClient:
             if "signin" not in current_url and "accounts.google.com" not in current_url:
                 logger.info("Already authenticated via persistent session!")
                 self._is_authenticated = True
+                if state == "ready":
+                    self.loaded_notebook_id = self.current_notebook_id
                 return True
             else:
                 logger.warning(f"Authentication required - please log in manually")
@@ -212,9 +605,15 @@ class NotebookLMClient:
             if not auth_success:
                 raise ChatError("Authentication failed - manual login required")
 
-        await asyncio.get_event_loop().run_in_executor(
-            None, self._send_message_sync, message
-        )
+        with telemetry.span(
+            "notebooklm.send_message",
+            {
+                "notebooklm.notebook_id": self.current_notebook_id,
+                "notebooklm.prompt_length": len(message),
+            },
+        ):
+            await self._run_browser(self._send_message_sync, message)
+        self._remember_notebook(self.current_notebook_id)
 
     def _send_message_sync(self, message: str) -> None:
         """Synchronous message sending"""
@@ -228,75 +627,123 @@ class NotebookLMClient:
         logger.debug(f"Sanitized message: {message[:100]}...")
 
         # Ensure we're on the right notebook
+        trusted = False
         if self.current_notebook_id:
-            current_url = self.driver.current_url
-            expected_url = f"notebook/{self.current_notebook_id}"
-            if expected_url not in current_url:
+            trusted = self.loaded_notebook_id == self.current_notebook_id
+            if not self._on_notebook(self.current_notebook_id):
                 self._navigate_to_notebook_sync(self.current_notebook_id)
 
-        # Find chat input with multiple fallback selectors
-        chat_selectors = [
-            "textarea[placeholder*='Ask']",
-            "textarea[data-testid*='chat']",
-            "textarea[aria-label*='message']",
-            "[contenteditable='true'][role='textbox']",
-            "input[type='text'][placeholder*='Ask']",
-            "textarea:not([disabled])",
-        ]
-
-        chat_input = None
-        for selector in chat_selectors:
-            try:
-                chat_input = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                logger.info(f"Found chat input with selector: {selector}")
-                break
-            except TimeoutException:
-                continue
+        chat_input = self._locate_chat_input()
+        if chat_input is None and trusted:
+            # The tracked page state was stale (e.g. a redirect); reload once
+            logger.info("Chat input missing on tracked notebook page, reloading")
+            self.loaded_notebook_id = None
+            self._navigate_to_notebook_sync(self.current_notebook_id)
+            chat_input = self._locate_chat_input()
 
         if chat_input is None:
             raise ChatError("Could not find chat input element")
 
         # Send message
-        chat_input.clear()
-        chat_input.send_keys(message)
+        with self.tracer.phase("type"):
+            chat_input.clear()
+            chat_input.send_keys(message)
 
         # Submit message
         try:
             from selenium.webdriver.common.keys import Keys
 
-            chat_input.send_keys(Keys.RETURN)
+            with self.tracer.phase("submit"):
+                chat_input.send_keys(Keys.RETURN)
             logger.info("Message sent successfully")
         except Exception as e:
+            self.loaded_notebook_id = None
             raise ChatError(f"Failed to submit message: {e}")
 
+    def _on_notebook(self, notebook_id: str) -> bool:
+        """Whether the active tab shows ``notebook_id``
+
+        Trusts the tracked page state when it matches, so the common case
+        issues no WebDriver command; otherwise falls back to the URL.
+        """
+        if self.loaded_notebook_id == notebook_id:
+            return True
+        if f"notebook/{notebook_id}" in self.driver.current_url:
+            self.loaded_notebook_id = notebook_id
+            return True
+        return False
+
+    def _chat_selectors(self) -> List[str]:
+        """Chat input selectors, the last one that matched first"""
+        selectors = list(CHAT_INPUT_SELECTORS)
+        if self._chat_input_selector in selectors:
+            selectors.remove(self._chat_input_selector)
+            selectors.insert(0, self._chat_input_selector)
+        return selectors
+
+    def _locate_chat_input(self) -> Optional[Any]:
+        """Find the chat input with multiple fallback selectors"""
+        with self.tracer.phase("locate_input"):
+            for selector in self._chat_selectors():
+                try:
+                    chat_input = WebDriverWait(self.driver, 2).until(
+                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+                    )
+                    logger.info(f"Found chat input with selector: {selector}")
+                    self._chat_input_selector = selector
+                    return chat_input
+                except TimeoutException:
+                    continue
+
+        return None
+
     async def get_response(
-        self, wait_for_completion: bool = True, max_wait: int = 60
+        self, wait_for_completion: bool = True, max_wait: Optional[int] = None
     ) -> str:
-        """Get response from NotebookLM with streaming support"""
+        """Get response from NotebookLM with streaming support
+
+        ``max_wait`` defaults to the configured ``streaming_timeout``.
+        """
         if not self.driver:
             raise ChatError("Browser not ready")
+        if max_wait is None:
+            max_wait = self.config.streaming_timeout
+
+        with telemetry.span(
+            "notebooklm.get_response",
+            {
+                "notebooklm.notebook_id": self.current_notebook_id,
+                "notebooklm.wait_for_completion": wait_for_completion,
+            },
+        ) as span:
+            if wait_for_completion:
+                response = await self._run_browser(
+                    self._wait_for_streaming_response, max_wait
+                )
+                span.set_attribute(
+                    "notebooklm.poll_iterations", self.last_poll_iterations
+                )
+            else:
+                response = await self._run_browser(self._get_current_response)
+            span.set_attribute("notebooklm.answer_length", len(response))
 
-        if wait_for_completion:
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._wait_for_streaming_response, max_wait
-            )
-        else:
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._get_current_response
-            )
+        # The answer is done; use the idle time to preload the next notebook
+        self._schedule_prefetch()
+        return response
 
+    @traced_phase("wait_stream")
     def _wait_for_streaming_response(self, max_wait: int) -> str:
         """Wait for streaming response to complete"""
         start_time = time.time()
         last_response = ""
         stable_count = 0
         required_stable_count = self.config.response_stability_checks
+        self.last_poll_iterations = 0
 
         logger.info("Waiting for streaming response to complete...")
 
         while time.time() - start_time < max_wait:
+            self.last_poll_iterations += 1
             current_response = self._get_current_response()
 
             if current_response == last_response:
@@ -348,9 +795,12 @@ class NotebookLMClient:
                         return True
 
             return False
-        except Exception:
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
             return False
 
+    @traced_phase("extract")
     def _get_current_response(self) -> str:
         """Get current response text, excluding user input"""
         if self.driver is None:
@@ -381,7 +831,9 @@ class NotebookLMClient:
                     if len(text) > len(best_response):
                         best_response = text
 
-            except Exception:
+            except Exception as e:
+                if is_dead_session_error(e):
+                    raise
                 continue
 
         if not best_response:
@@ -407,8 +859,9 @@ class NotebookLMClient:
                     ):
                         best_response = text
                         break
-            except Exception:
-                pass
+            except Exception as e:
+                if is_dead_session_error(e):
+                    raise
 
         # Clean up response by removing user input if it appears at the beginning
         if best_response:
@@ -416,6 +869,7 @@ class NotebookLMClient:
 
         return best_response if best_response else "No response content found"
 
+    @traced_phase("clean")
     def _clean_response_text(self, response_text: str) -> str:
         """Clean response text by removing user input and extracting AI response"""
         if not response_text:
@@ -516,30 +970,207 @@ class NotebookLMClient:
         if not self.driver:
             raise NavigationError("Browser not started")
 
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self._navigate_to_notebook_sync, notebook_id
-        )
+        with telemetry.span(
+            "notebooklm.navigate_to_notebook",
+            {"notebooklm.notebook_id": notebook_id},
+        ) as span:
+            url = await self._run_browser(self._navigate_to_notebook_sync, notebook_id)
+            span.set_attribute("notebooklm.hydration_time", self.last_hydration_time)
+        self._remember_notebook(notebook_id)
+        return url
 
+    @traced_phase("navigate")
     def _navigate_to_notebook_sync(self, notebook_id: str) -> str:
         """Synchronous notebook navigation"""
         if self.driver is None:
             raise RuntimeError("Browser driver not initialized")
 
-        url = f"{self.config.base_url}/notebook/{notebook_id}"
-        self.driver.get(url)
+        self.loaded_notebook_id = None
+        if self._activate_prefetched(notebook_id):
+            logger.info(f"Using prefetched tab for notebook {notebook_id}")
+        else:
+            url = f"{self.config.base_url}/notebook/{notebook_id}"
+            self.driver.get(url)
 
         try:
-            WebDriverWait(self.driver, self.config.timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            state = self._wait_for_page_ready()
+            if state != "ready":
+                WebDriverWait(self.driver, self.config.timeout).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
             self.current_notebook_id = notebook_id
+            if state == "ready":
+                self.loaded_notebook_id = notebook_id
             return self.driver.current_url
         except TimeoutException:
             raise NavigationError(f"Failed to navigate to notebook {notebook_id}")
 
-    async def close(self) -> None:
-        """Close browser session"""
+    @traced_phase("hydrate")
+    def _wait_for_page_ready(self) -> Optional[str]:
+        """Wait in-page for the chat input and network idle, up to a deadline
+
+        Returns "ready", "signin" or "timeout", or None if the probe could not
+        run (e.g. the document was replaced mid-wait); callers then fall back
+        to a plain presence-of-body wait.
+        """
+        deadline = self.config.page_ready_timeout
+        if deadline + 5 > self._script_timeout:
+            self._script_timeout = deadline + 5
+            self.driver.set_script_timeout(self._script_timeout)
+
+        try:
+            result = self.driver.execute_async_script(
+                PAGE_READY_SCRIPT,
+                self._chat_selectors(),
+                int(deadline * 1000),
+                self.config.network_idle_ms,
+            )
+        except WebDriverException as e:
+            if is_dead_session_error(e):
+                raise
+            logger.debug(f"Page readiness probe failed: {e}")
+            return None
+
+        state = result.get("state")
+        if state == "ready":
+            self._chat_input_selector = result.get("selector")
+            self.last_hydration_time = result.get("since_navigation", 0) / 1000
+            logger.info(
+                f"Page ready for chat after {self.last_hydration_time:.2f}s "
+                f"(waited {result.get('waited', 0) / 1000:.2f}s)"
+            )
+        elif state == "timeout":
+            logger.warning(f"Page not ready for chat after {deadline}s")
+        return state
+
+    async def ensure_notebook(self, notebook_id: str) -> bool:
+        """Make ``notebook_id`` the active notebook, navigating only if needed
+
+        Returns whether a navigation happened.
+        """
+        if self.driver is not None and self.loaded_notebook_id == notebook_id:
+            self.current_notebook_id = notebook_id
+            self._remember_notebook(notebook_id)
+            return False
+
+        await self.navigate_to_notebook(notebook_id)
+        return True
+
+    def _remember_notebook(self, notebook_id: Optional[str]) -> None:
+        if notebook_id:
+            self._notebook_history.append(notebook_id)
+
+    def predict_next_notebook(self) -> Optional[str]:
+        """Most likely next notebook other than the current one
+
+        The most frequently used notebook in recent history wins (ties go to
+        the most recent); the default notebook is the fallback.
+        """
+        counts = Counter(self._notebook_history)
+        counts.pop(self.current_notebook_id, None)
+        if counts:
+            recency = {nb: i for i, nb in enumerate(self._notebook_history)}
+            return max(counts, key=lambda nb: (counts[nb], recency[nb]))
+
+        default = self.config.default_notebook_id
+        if default and default != self.current_notebook_id:
+            return default
+        return None
+
+    def _schedule_prefetch(self) -> None:
+        if not self.config.prefetch_notebooks or self.driver is None:
+            return
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            self._prefetch_task.cancel()
+        self._prefetch_task = asyncio.get_running_loop().create_task(
+            self._prefetch_when_idle()
+        )
+
+    async def _prefetch_when_idle(self) -> None:
+        self.tracer.detach()
+        await asyncio.sleep(self.config.prefetch_idle_delay)
+        target = self.predict_next_notebook()
+        if target is None or self._browser_lock.locked():
+            return
+        if self._prefetched and self._prefetched[0] == target:
+            return
+        try:
+            await self._run_browser(self._prefetch_sync, target)
+        except Exception as e:
+            logger.debug(f"Prefetch of notebook {target} failed: {e}")
+
+    @traced_phase("prefetch")
+    def _prefetch_sync(self, notebook_id: str) -> None:
+        """Open ``notebook_id`` in a background tab without switching to it"""
+        if self.driver is None:
+            return
+        self._discard_prefetched()
+
+        before = set(self.driver.window_handles)
+        url = f"{self.config.base_url}/notebook/{notebook_id}"
+        # A background CDP target loads without stealing focus or blocking on
+        # page load, unlike switch_to.new_window() + get()
+        target = self.driver.execute_cdp_cmd(
+            "Target.createTarget", {"url": url, "background": True}
+        )
+        new_handles = set(self.driver.window_handles) - before
+        handle = new_handles.pop() if new_handles else target.get("targetId")
+        if handle:
+            self._prefetched = (notebook_id, handle)
+            logger.debug(f"Prefetching notebook {notebook_id} in background tab")
+
+    def _activate_prefetched(self, notebook_id: str) -> bool:
+        """Swap to the prefetched tab for ``notebook_id`` and close the old tab"""
+        if self._prefetched is None or self._prefetched[0] != notebook_id:
+            return False
+
+        _, handle = self._prefetched
+        self._prefetched = None
+        if handle not in self.driver.window_handles:
+            return False
+
+        self.driver.close()
+        self.driver.switch_to.window(handle)
+        # Network settings are per tab; later loads in this one are blocked too
+        if self.config.block_resources:
+            self._apply_resource_blocking()
+        return True
+
+    def _discard_prefetched(self) -> None:
+        """Close a prefetched tab that is no longer wanted"""
+        if self._prefetched is None:
+            return
+
+        _, handle = self._prefetched
+        self._prefetched = None
+        current = self.driver.current_window_handle
+        if handle == current or handle not in self.driver.window_handles:
+            return
+        self.driver.switch_to.window(handle)
+        self.driver.close()
+        self.driver.switch_to.window(current)
+
+    async def close(self, keep_detached: bool = True) -> None:
+        """Close browser session
+
+        A detached browser is left running for the next server to attach to,
+        unless ``keep_detached`` is False.
+        """
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+        self._prefetched = None
+        self.loaded_notebook_id = None
         if self.driver:
-            await asyncio.get_event_loop().run_in_executor(None, self.driver.quit)
+            loop = asyncio.get_event_loop()
+            if self.detached and keep_detached:
+                # Stop only our chromedriver; quit() would end the browser
+                await loop.run_in_executor(None, self.driver.service.stop)
+            else:
+                await loop.run_in_executor(None, self.driver.quit)
+                if self.detached:
+                    await loop.run_in_executor(None, detached.stop_browser, self.config)
             self.driver = None
             self._is_authenticated = False
+            self.debugging_port = None
+            metrics_collector.forget_browser(self.browser_id)
@@ -4,11 +4,61 @@ Configuration management for NotebookLM MCP Server
 
 import json
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, replace
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from .exceptions import ConfigurationError
+from .profile import clone_profile
+
+# URL patterns (CDP wildcard syntax) for assets the automation never needs
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*fonts.googleapis.com/*",
+    "*fonts.gstatic.com/*",
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.ico",
+    "*.mp4",
+    "*.webm",
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+    "*/gen_204*",
+    "*analytics.js*",
+)
+
+# Settings a running server adopts from a reloaded config file; any other
+# change (browser flags, profile, auth, ...) waits for the next browser start
+RUNTIME_SETTINGS = frozenset(
+    {
+        "default_notebook_id",
+        "timeout",
+        "streaming_timeout",
+        "response_stability_checks",
+        "retry_attempts",
+        "page_ready_timeout",
+        "network_idle_ms",
+        "cookie_auth_probe",
+        "keepalive_interval",
+        "keepalive_idle_after",
+        "health_sample_interval",
+        "health_max_staleness",
+        "recycle_max_rss_mb",
+        "recycle_max_age",
+        "recycle_max_requests",
+        "recycle_check_interval",
+        "recycle_drain_timeout",
+        "prefetch_notebooks",
+        "prefetch_idle_delay",
+    }
+)
 
 
 @dataclass
@@ -24,6 +74,13 @@ class AuthConfig:
     export_profile_to: Optional[str] = None  # Path to export current profile
     skip_manual_login: bool = False  # Skip manual login if profile exists
 
+    # Encrypted cookie jar (`cookies export`); when set, Chrome starts on an
+    # empty throwaway profile and the jar's session is injected into it
+    cookies_path: Optional[str] = None
+    # Key for the jar when NOTEBOOKLM_COOKIE_KEY is not set; must live outside
+    # the jar's directory so copying the jar around does not copy the key
+    cookies_key_file: Optional[str] = None
+
 
 @dataclass
 class ServerConfig:
@@ -48,7 +105,68 @@ class ServerConfig:
     # Advanced settings
     streaming_timeout: int = 60
     response_stability_checks: int = 3
-    retry_attempts: int = 3
+    retry_attempts: int = 3  # Browser restarts per call after a crashed session
+    page_ready_timeout: float = 15.0  # Max wait for the chat input after loading
+    network_idle_ms: int = 500  # Quiet period with no new requests = hydrated
+
+    # Seconds between checks of the config file for changes; 0 disables
+    # polling (SIGHUP still reloads)
+    config_watch_interval: float = 2.0
+
+    # Decide authentication from Google session cookies when they are clear,
+    # navigating to NotebookLM only when they are not
+    cookie_auth_probe: bool = True
+
+    # Reload the notebook every keepalive_interval seconds (0, the default,
+    # disables) once no request has run for keepalive_idle_after seconds, so
+    # the Google session is renewed, and a sign-out is noticed, off the
+    # request path
+    keepalive_interval: float = 0.0
+    keepalive_idle_after: float = 60.0
+
+    # Reuse the detected Chrome version and patched chromedriver across starts
+    browser_cache: bool = True
+    browser_cache_dir: Optional[str] = None  # Default: ~/.cache/notebooklm-mcp
+
+    # Run Chrome as its own process so it survives server restarts; the next
+    # server attaches to it instead of starting a new browser
+    detach_browser: bool = False
+
+    # In stdio mode, proxy to one shared HTTP backend per profile (spawned on
+    # demand) instead of starting a browser per stdio client
+    shared_backend: bool = False
+
+    # Prune caches and browsing history from the profile before each start
+    # once it has grown past compact_profile_min_mb
+    compact_profile_on_start: bool = False
+    compact_profile_min_mb: float = 200.0
+
+    # Observability
+    telemetry_exporter: Optional[str] = None  # "otlp" or "file"; None disables
+    telemetry_endpoint: Optional[str] = None  # OTLP endpoint (default: OTEL_* env)
+    telemetry_file: str = "logs/notebooklm-traces.jsonl"
+    health_sample_interval: float = 15.0  # Seconds between background samples
+    health_max_staleness: float = 60.0  # Older snapshots are refreshed on read
+
+    # Browser recycling; a threshold of 0/None disables it
+    recycle_max_rss_mb: Optional[int] = None
+    recycle_max_age: Optional[int] = None  # Seconds
+    recycle_max_requests: Optional[int] = None
+    recycle_check_interval: float = 60.0
+    recycle_drain_timeout: float = 120.0
+
+    # Block heavy page resources via CDP; deny patterns that match any of
+    # allowed_urls are dropped so those URLs keep loading
+    block_resources: bool = False
+    blocked_url_patterns: List[str] = field(
+        default_factory=lambda: list(DEFAULT_BLOCKED_URL_PATTERNS)
+    )
+    allowed_urls: List[str] = field(default_factory=list)
+
+    # Preload the likely next notebook in a background tab after each answer
+    prefetch_notebooks: bool = False
+    prefetch_idle_delay: float = 1.0  # Seconds of idle time before prefetching
+    prefetch_history_size: int = 20
 
     @classmethod
     def from_file(cls, config_path: str) -> "ServerConfig":
@@ -77,6 +195,8 @@ class ServerConfig:
             timeout=int(os.getenv("NOTEBOOKLM_TIMEOUT", "60")),
             debug=os.getenv("NOTEBOOKLM_DEBUG", "false").lower() == "true",
             default_notebook_id=os.getenv("NOTEBOOKLM_NOTEBOOK_ID"),
+            telemetry_exporter=os.getenv("NOTEBOOKLM_TELEMETRY_EXPORTER"),
+            telemetry_endpoint=os.getenv("NOTEBOOKLM_TELEMETRY_ENDPOINT"),
             auth=AuthConfig(
                 profile_dir=os.getenv(
                     "NOTEBOOKLM_PROFILE_DIR", "./chrome_profile_notebooklm"
@@ -121,9 +241,50 @@ class ServerConfig:
         if self.response_stability_checks <= 0:
             raise ConfigurationError("Response stability checks must be positive")
 
+        if self.page_ready_timeout <= 0:
+            raise ConfigurationError("Page ready timeout must be positive")
+
         if self.retry_attempts < 0:
             raise ConfigurationError("Retry attempts cannot be negative")
 
+        if self.health_sample_interval <= 0:
+            raise ConfigurationError("Health sample interval must be positive")
+
+        if self.health_max_staleness <= 0:
+            raise ConfigurationError("Health max staleness must be positive")
+
+        for name in ("recycle_max_rss_mb", "recycle_max_age", "recycle_max_requests"):
+            if (getattr(self, name) or 0) < 0:
+                raise ConfigurationError(f"{name} cannot be negative")
+
+        if self.prefetch_history_size <= 0:
+            raise ConfigurationError("Prefetch history size must be positive")
+
+        if self.auth.cookies_path and self.detach_browser:
+            raise ConfigurationError(
+                "cookies_path cannot be combined with detach_browser"
+            )
+
+        if self.config_watch_interval < 0:
+            raise ConfigurationError("Config watch interval cannot be negative")
+
+        if self.keepalive_interval < 0:
+            raise ConfigurationError("Keepalive interval cannot be negative")
+
+        if self.keepalive_idle_after < 0:
+            raise ConfigurationError("Keepalive idle time cannot be negative")
+
+        if self.compact_profile_min_mb < 0:
+            raise ConfigurationError("compact_profile_min_mb cannot be negative")
+
+        if self.recycle_check_interval <= 0:
+            raise ConfigurationError("Recycle check interval must be positive")
+
+        if self.telemetry_exporter and self.telemetry_exporter not in ("otlp", "file"):
+            raise ConfigurationError(
+                f"Unknown telemetry exporter: {self.telemetry_exporter}"
+            )
+
         if self.auth.profile_dir and not Path(self.auth.profile_dir).parent.exists():
             raise ConfigurationError(
                 f"Profile directory parent does not exist: {self.auth.profile_dir}"
@@ -141,19 +302,16 @@ class ServerConfig:
 
     def setup_profile(self) -> None:
         """Setup Chrome profile based on configuration"""
-        from shutil import copytree, rmtree
-
         profile_path = Path(self.auth.profile_dir)
 
         # Import existing profile if specified
         if self.auth.import_profile_from and self.auth.import_profile_from.strip():
             import_path = Path(self.auth.import_profile_from)
+            if not import_path.exists():
+                raise ConfigurationError(f"Import profile not found: {import_path}")
 
-            if profile_path.exists():
-                rmtree(profile_path)
-
-            copytree(import_path, profile_path)
-            print(f"✅ Imported profile from: {import_path}")
+            report = clone_profile(import_path, profile_path)
+            print(f"✅ Imported profile from: {import_path} ({report.summary()})")
 
         # Create profile directory if it doesn't exist
         elif not profile_path.exists():
@@ -165,19 +323,35 @@ class ServerConfig:
         if not self.auth.export_profile_to:
             return
 
-        from shutil import copytree, rmtree
-
         source_path = Path(self.auth.profile_dir)
         export_path = Path(self.auth.export_profile_to)
 
         if not source_path.exists():
             raise ConfigurationError(f"Source profile does not exist: {source_path}")
 
-        if export_path.exists():
-            rmtree(export_path)
-
-        copytree(source_path, export_path)
-        print(f"✅ Exported profile to: {export_path}")
+        report = clone_profile(source_path, export_path)
+        print(f"✅ Exported profile to: {export_path} ({report.summary()})")
+
+
+def changed_settings(old: ServerConfig, new: ServerConfig) -> Dict[str, Any]:
+    """Settings that differ, as ``{name: new value}`` (``auth.<name>`` for auth)"""
+    changes = {}
+    for f in fields(ServerConfig):
+        if f.name == "auth":
+            continue
+        if getattr(old, f.name) != getattr(new, f.name):
+            changes[f.name] = getattr(new, f.name)
+    for f in fields(AuthConfig):
+        if getattr(old.auth, f.name) != getattr(new.auth, f.name):
+            changes[f"auth.{f.name}"] = getattr(new.auth, f.name)
+    return changes
+
+
+def with_settings(config: ServerConfig, settings: Dict[str, Any]) -> ServerConfig:
+    """Copy of ``config`` with ``changed_settings`` output applied"""
+    auth = {k[len("auth.") :]: v for k, v in settings.items() if k.startswith("auth.")}
+    top = {k: v for k, v in settings.items() if not k.startswith("auth.")}
+    return replace(config, auth=replace(config.auth, **auth), **top)
 
 
 def load_config(config_path: Optional[str] = None) -> ServerConfig:
@@ -0,0 +1,110 @@
+"""
+Config file hot reload for a running server
+
+The config file is polled for a new mtime every ``config_watch_interval``
+seconds, and SIGHUP forces a reload. Only the settings that changed in the
+file since it was last read are applied, so CLI overrides and values set
+through tools survive a reload. Runtime settings take effect immediately;
+anything that needs a new browser is held for the next recycle instead of
+restarting the live session.
+"""
+
+import asyncio
+import os
+import signal
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from .config import ServerConfig, changed_settings
+
+
+class ConfigWatcher:
+    """Reloads the server's config file when it changes"""
+
+    def __init__(self, server: Any, path: str) -> None:
+        self.server = server
+        self.path = path
+        self._mtime = self._read_mtime()
+        self._file_config = self._load()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._lock = asyncio.Lock()
+        self._sighup = False
+
+    def _read_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _load(self) -> Optional[ServerConfig]:
+        try:
+            return ServerConfig.from_file(self.path)
+        except Exception as e:
+            logger.error(f"Cannot read config file {self.path}: {e}")
+            return None
+
+    def start(self) -> None:
+        """Start polling and listen for SIGHUP (where the platform has it)"""
+        loop = asyncio.get_running_loop()
+        if hasattr(signal, "SIGHUP"):
+            try:
+                loop.add_signal_handler(signal.SIGHUP, self._on_sighup)
+                self._sighup = True
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Not the main thread, or no signal support in this loop
+                pass
+        if self.server.config.config_watch_interval and self._task is None:
+            self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._sighup:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+            self._sighup = False
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _on_sighup(self) -> None:
+        logger.info("SIGHUP received, reloading config")
+        asyncio.get_running_loop().create_task(self.reload())
+
+    async def _run(self) -> None:
+        while self.server.config.config_watch_interval:
+            await asyncio.sleep(self.server.config.config_watch_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Config reload failed: {e}")
+        self._task = None
+
+    async def check(self) -> bool:
+        """Reload if the file's mtime moved; True if anything was applied"""
+        mtime = self._read_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+        return await self.reload()
+
+    async def reload(self) -> bool:
+        """Apply the settings that changed in the file since the last read"""
+        async with self._lock:
+            self._mtime = self._read_mtime()
+            new = self._load()
+            if new is None:
+                return False
+            if self._file_config is None:
+                # Unreadable before: treat every setting as changed
+                settings: Dict[str, Any] = changed_settings(self.server.config, new)
+            else:
+                settings = changed_settings(self._file_config, new)
+            if settings:
+                logger.info(f"Config file changed: {', '.join(sorted(settings))}")
+                # An invalid change raises here and is retried with the next edit
+                await self.server.apply_settings(settings)
+            self._file_config = new
+            return bool(settings)
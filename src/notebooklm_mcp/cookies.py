@@ -0,0 +1,225 @@
+"""
+Google session cookies as an authentication signal
+
+A signed-in profile carries Google's session cookies (SID, __Secure-1PSID,
+...) on the google.com domain. Reading them through CDP takes milliseconds,
+while proving the session by loading NotebookLM and watching for a redirect
+to accounts.google.com is a full page load. The cookie verdict is only
+trusted when it is clear; anything borderline falls back to navigation.
+
+The same cookies, exported from a signed-in browser into a small encrypted
+jar, authenticate headless workers on empty throwaway profiles.
+"""
+
+import importlib.util
+import json
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlparse
+
+from .exceptions import ConfigurationError
+
+# Imported on first use; only cookie jars need it
+CRYPTO_AVAILABLE = importlib.util.find_spec("cryptography") is not None
+
+# Set by Google sign-in and cleared on sign-out
+SESSION_COOKIES = frozenset(
+    {
+        "SID",
+        "HSID",
+        "SSID",
+        "SAPISID",
+        "__Secure-1PSID",
+        "__Secure-3PSID",
+        "__Secure-1PAPISID",
+        "__Secure-3PAPISID",
+    }
+)
+GOOGLE_COOKIE_URLS = (
+    "https://accounts.google.com",
+    "https://www.google.com",
+    "https://notebooklm.google.com",
+)
+# Cookies this close to expiry are not trusted either way
+EXPIRY_MARGIN = 300.0
+
+# Key for cookie jars; without it an explicit key file is required
+COOKIE_KEY_ENV = "NOTEBOOKLM_COOKIE_KEY"
+JAR_VERSION = 1
+# CDP Network.CookieParam fields carried over from exported cookies
+COOKIE_PARAM_FIELDS = (
+    "name",
+    "value",
+    "domain",
+    "path",
+    "secure",
+    "httpOnly",
+    "sameSite",
+    "priority",
+    "sourceScheme",
+    "sourcePort",
+)
+
+
+def is_google_url(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return host == "google.com" or host.endswith(".google.com")
+
+
+def is_google_domain(domain: str) -> bool:
+    domain = domain.lstrip(".")
+    return domain == "google.com" or domain.endswith(".google.com")
+
+
+def session_cookies(cookies: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The Google session cookies among CDP ``Network.Cookie`` records"""
+    return [
+        cookie
+        for cookie in cookies
+        if cookie.get("name") in SESSION_COOKIES
+        and is_google_domain(str(cookie.get("domain", "")))
+    ]
+
+
+def session_state(
+    cookies: Iterable[Dict[str, Any]], now: Optional[float] = None
+) -> Optional[bool]:
+    """Whether the cookies prove a live Google session
+
+    True when at least one session cookie is comfortably unexpired, False
+    when there are none or all have expired, None when the only live ones
+    are about to expire.
+    """
+    now = time.time() if now is None else now
+    found = session_cookies(cookies)
+    if not found:
+        return False
+
+    expiring = False
+    for cookie in found:
+        expires = cookie.get("expires", -1)
+        # Browser-session cookies report -1 (or session=True) and never expire
+        if cookie.get("session") or expires is None or expires <= 0:
+            return True
+        if expires > now + EXPIRY_MARGIN:
+            return True
+        if expires > now:
+            expiring = True
+    return None if expiring else False
+
+
+def google_cookies(cookies: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The cookies a Google session needs, dropping every other site's"""
+    return [c for c in cookies if is_google_domain(str(c.get("domain", "")))]
+
+
+def cookie_param(cookie: Dict[str, Any]) -> Dict[str, Any]:
+    """CDP ``Network.setCookies`` entry for an exported cookie"""
+    param = {key: cookie[key] for key in COOKIE_PARAM_FIELDS if key in cookie}
+    expires = cookie.get("expires")
+    if not cookie.get("session") and expires is not None and expires > 0:
+        param["expires"] = expires
+    return param
+
+
+def _fernet() -> Any:
+    """The ``cryptography.fernet`` module"""
+    if not CRYPTO_AVAILABLE:
+        raise ConfigurationError(
+            "Encrypted cookie jars need the 'cryptography' package: "
+            "pip install notebooklm-mcp[cookies]"
+        )
+    from cryptography import fernet
+
+    return fernet
+
+
+def load_key(
+    jar_path: Union[str, Path],
+    key_file: Optional[Union[str, Path]] = None,
+    create: bool = False,
+) -> bytes:
+    """Jar key from ``NOTEBOOKLM_COOKIE_KEY`` or ``key_file``
+
+    The key file must not sit in the jar's directory: whoever copies the jar
+    to the workers would copy the key with it. With ``create`` a missing key
+    file is generated, readable by the owner only.
+    """
+    fernet = _fernet()
+    env_key = os.getenv(COOKIE_KEY_ENV)
+    if env_key:
+        return env_key.encode()
+
+    if key_file is None:
+        raise ConfigurationError(
+            f"No key for cookie jar {jar_path}: set {COOKIE_KEY_ENV} or "
+            "auth.cookies_key_file"
+        )
+    path = Path(key_file)
+    if path.absolute().parent == Path(jar_path).absolute().parent:
+        raise ConfigurationError(
+            f"Key file {path} is in the same directory as cookie jar "
+            f"{jar_path}; keep it elsewhere or set {COOKIE_KEY_ENV}"
+        )
+    if path.exists():
+        return path.read_bytes().strip()
+    if not create:
+        raise ConfigurationError(f"Key file {path} for cookie jar does not exist")
+
+    key = fernet.Fernet.generate_key()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def save_cookie_jar(
+    cookies: List[Dict[str, Any]],
+    path: Union[str, Path],
+    key: Optional[bytes] = None,
+    key_file: Optional[Union[str, Path]] = None,
+) -> int:
+    """Write ``cookies`` compressed and encrypted, returning the jar's size"""
+    key = key or load_key(path, key_file, create=True)
+    payload = json.dumps(
+        {"version": JAR_VERSION, "exported_at": time.time(), "cookies": cookies},
+        separators=(",", ":"),
+    ).encode()
+    token = _fernet().Fernet(key).encrypt(zlib.compress(payload, 9))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(token)
+    return len(token)
+
+
+def load_cookie_jar(
+    path: Union[str, Path],
+    key: Optional[bytes] = None,
+    key_file: Optional[Union[str, Path]] = None,
+) -> List[Dict[str, Any]]:
+    """Decrypt a jar written by ``save_cookie_jar``"""
+    key = key or load_key(path, key_file)
+    fernet = _fernet()
+    try:
+        token = Path(path).read_bytes()
+    except OSError as e:
+        raise ConfigurationError(f"Cannot read cookie jar {path}: {e}")
+
+    try:
+        data = json.loads(zlib.decompress(fernet.Fernet(key).decrypt(token)))
+    except (fernet.InvalidToken, ValueError, zlib.error):
+        raise ConfigurationError(
+            f"Cookie jar {path} cannot be decrypted with the configured key"
+        )
+    if data.get("version") != JAR_VERSION:
+        raise ConfigurationError(
+            f"Unsupported cookie jar version: {data.get('version')}"
+        )
+    return data["cookies"]
@@ -0,0 +1,312 @@
+"""
+Background browser daemon for one-shot CLI commands
+
+Starting Chrome, patching the driver and authenticating takes several seconds,
+which dominates a single ``notebooklm-mcp chat -m ...``. The daemon keeps one
+warm, authenticated browser alive and serves CLI commands over a localhost TCP
+socket, so later invocations only pay for NotebookLM's answer.
+
+The socket speaks JSON lines: each request is one object carrying the shared
+token from the state file plus an ``op`` and its parameters, and each response
+is ``{"ok": true, "result": ...}`` or ``{"ok": false, "error": "..."}``. The
+state file sits next to the Chrome profile (one browser per profile) and is
+only readable by the owner.
+"""
+
+import asyncio
+import hmac
+import json
+import os
+import secrets
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from .config import ServerConfig
+from .exceptions import DaemonError
+
+DAEMON_HOST = "127.0.0.1"
+STATE_SUFFIX = ".daemon.json"
+CONNECT_TIMEOUT = 2.0
+# Extra seconds on top of the configured page and streaming timeouts
+RESPONSE_MARGIN = 30.0
+
+
+def state_path(config: ServerConfig) -> Path:
+    """Daemon state file for the config's Chrome profile"""
+    profile = Path(config.auth.profile_dir).absolute()
+    return profile.with_name(profile.name + STATE_SUFFIX)
+
+
+def read_state(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_state(path: Path, state: Dict[str, Any]) -> None:
+    """Write the state file with owner-only permissions"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f)
+
+
+def pid_alive(pid: Any) -> bool:
+    """Whether ``pid`` is a running process; a missing or bad pid is not
+
+    ``os.kill(pid, 0)`` would do on POSIX, but on Windows it sends
+    CTRL_C_EVENT to the daemon.
+    """
+    if not isinstance(pid, int) or isinstance(pid, bool) or pid <= 0:
+        return False
+    import psutil  # Deferred: the CLI imports this module on every command
+
+    return psutil.pid_exists(pid)
+
+
+class BrowserDaemon:
+    """Hosts one long-lived NotebookLM browser and serves CLI requests"""
+
+    def __init__(self, config: ServerConfig, idle_timeout: float = 0.0) -> None:
+        # Only the daemon process needs the MCP server stack
+        from .server import NotebookLMFastMCP
+
+        self.config = config
+        self.idle_timeout = idle_timeout
+        self.server = NotebookLMFastMCP(config)
+        self.state_file = state_path(config)
+        self.token = secrets.token_urlsafe(32)
+        self.started_at = time.time()
+        self.requests = 0
+        self._last_request = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._stopped: Optional[asyncio.Event] = None
+
+    async def serve(self) -> None:
+        """Warm the browser, publish the state file and serve until stopped"""
+        self._stopped = asyncio.Event()
+        await self._warm_up()
+
+        listener = await asyncio.start_server(self._handle, DAEMON_HOST, 0)
+        port = listener.sockets[0].getsockname()[1]
+        write_state(
+            self.state_file,
+            {
+                "host": DAEMON_HOST,
+                "port": port,
+                "pid": os.getpid(),
+                "token": self.token,
+                "started_at": self.started_at,
+            },
+        )
+        logger.info(f"Browser daemon listening on {DAEMON_HOST}:{port}")
+
+        watchdog = None
+        if self.idle_timeout:
+            watchdog = asyncio.get_running_loop().create_task(self._watch_idle())
+        try:
+            async with listener:
+                await self._stopped.wait()
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+            self._remove_state()
+            await self.server.stop()
+            logger.info("Browser daemon stopped")
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _warm_up(self) -> None:
+        await self.server._ensure_client()
+        try:
+            if not await self.server.client.authenticate():
+                logger.warning("Daemon browser is not authenticated yet")
+        except Exception as e:
+            logger.warning(f"Daemon authentication check failed: {e}")
+
+    async def _watch_idle(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30.0))
+            if time.monotonic() - self._last_request >= self.idle_timeout:
+                logger.info(f"Daemon idle for {self.idle_timeout:.0f}s, stopping")
+                self.stop()
+                return
+
+    def _remove_state(self) -> None:
+        state = read_state(self.state_file)
+        if state and state.get("pid") == os.getpid():
+            self.state_file.unlink(missing_ok=True)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self._reply(line)
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _reply(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"ok": False, "error": "Malformed request"}
+
+        if not hmac.compare_digest(str(request.get("token", "")), self.token):
+            return {"ok": False, "error": "Invalid daemon token"}
+
+        op = request.get("op")
+        handler = getattr(self, f"_op_{op}", None)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown operation: {op}"}
+
+        self._last_request = time.monotonic()
+        try:
+            # One command at a time, like a single interactive user
+            async with self._lock:
+                result = await handler(request)
+        except Exception as e:
+            logger.error(f"Daemon {op} failed: {e}")
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, "result": result}
+
+    async def _op_status(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        client = self.server.client
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "requests": self.requests,
+            "notebook_id": getattr(client, "current_notebook_id", None),
+            "authenticated": bool(getattr(client, "_is_authenticated", False)),
+        }
+
+    async def _op_chat(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        message = request["message"]
+        notebook_id = request.get("notebook_id") or self.config.default_notebook_id
+        self.requests += 1
+
+        async with self.server.recycler.lease() as client:
+
+            async def exchange(client: Any) -> str:
+                if notebook_id:
+                    await self.server._switch_notebook(client, notebook_id)
+                await client.send_message(message)
+                return await client.get_response()
+
+            response = await self.server._with_recovery(client, exchange)
+        return {"response": response, "notebook_id": notebook_id}
+
+    async def _op_test(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        notebook_id = request.get("notebook_id") or self.config.default_notebook_id
+        self.requests += 1
+
+        async with self.server.recycler.lease() as client:
+            authenticated = await self.server._with_recovery(
+                client, lambda client: client.authenticate()
+            )
+            url = await self.server._with_recovery(
+                client, lambda client: client.navigate_to_notebook(notebook_id)
+            )
+        return {"authenticated": authenticated, "url": url}
+
+    async def _op_stop(self, _request: Dict[str, Any]) -> Dict[str, Any]:
+        # Reply first; the listener closes once the event loop gets to it
+        asyncio.get_running_loop().call_soon(self.stop)
+        return {"stopping": True}
+
+
+class DaemonClient:
+    """Synchronous connection to a running browser daemon"""
+
+    def __init__(self, state: Dict[str, Any], timeout: Optional[float] = None) -> None:
+        self.state = state
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file: Any = None
+
+    @classmethod
+    def discover(
+        cls, config: ServerConfig, timeout: Optional[float] = None
+    ) -> Optional["DaemonClient"]:
+        """Connect to the daemon serving this config's profile, if one is up
+
+        A state file left behind by a dead daemon is removed.
+        """
+        path = state_path(config)
+        state = read_state(path)
+        if not state:
+            return None
+
+        if not pid_alive(state.get("pid")):
+            path.unlink(missing_ok=True)
+            return None
+
+        if timeout is None:
+            timeout = config.timeout + config.streaming_timeout + RESPONSE_MARGIN
+        client = cls(state, timeout=timeout)
+        try:
+            client.connect()
+        except OSError as e:
+            logger.debug(f"Browser daemon not reachable: {e}")
+            return None
+        return client
+
+    def connect(self) -> None:
+        self._sock = socket.create_connection(
+            (self.state["host"], self.state["port"]), timeout=CONNECT_TIMEOUT
+        )
+        self._sock.settimeout(self.timeout)
+        self._file = self._sock.makefile("rwb")
+
+    def request(self, op: str, **params: Any) -> Any:
+        """Send one request and return its result, raising DaemonError on failure"""
+        if self._file is None:
+            self.connect()
+
+        payload = {"token": self.state["token"], "op": op, **params}
+        try:
+            self._file.write(json.dumps(payload).encode("utf-8") + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        except OSError as e:
+            raise DaemonError(f"Lost connection to browser daemon: {e}")
+        if not line:
+            raise DaemonError("Browser daemon closed the connection")
+
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise DaemonError(reply.get("error", "Unknown daemon error"))
+        return reply["result"]
+
+    def chat(self, message: str, notebook_id: Optional[str] = None) -> str:
+        return self.request("chat", message=message, notebook_id=notebook_id)[
+            "response"
+        ]
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
@@ -0,0 +1,151 @@
+"""
+Detached Chrome that outlives the MCP server process
+
+With ``detach_browser`` enabled, Chrome is launched as its own process
+session instead of as a chromedriver child, and its DevTools address is saved
+next to the profile. A restarted server finds the browser still running and
+attaches chromedriver to it through ``debuggerAddress``, which takes
+milliseconds instead of a cold Chrome start plus authentication.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from .config import ServerConfig
+from .ports import DEBUG_HOST, allocate_debugging_port, release_debugging_port
+
+STATE_SUFFIX = ".browser.json"
+PROBE_TIMEOUT = 1.0
+# How long a stopped browser gets to release its profile
+STOP_TIMEOUT = 10.0
+
+
+def state_path(config: ServerConfig) -> Path:
+    """Detached browser state file for the config's Chrome profile"""
+    profile = Path(config.auth.profile_dir).absolute()
+    return profile.with_name(profile.name + STATE_SUFFIX)
+
+
+def devtools_alive(address: str) -> bool:
+    """Whether a browser answers on the DevTools ``host:port``"""
+    import urllib.request  # Deferred: only detached-browser paths need it
+
+    try:
+        with urllib.request.urlopen(
+            f"http://{address}/json/version", timeout=PROBE_TIMEOUT
+        ) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+
+def live_browser(config: ServerConfig) -> Optional[Dict[str, Any]]:
+    """State of the detached browser for this profile, if it is still running"""
+    path = state_path(config)
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if devtools_alive(state["debugger_address"]):
+        return state
+
+    logger.info("Detached browser is gone, a new one will be launched")
+    path.unlink(missing_ok=True)
+    return None
+
+
+def chrome_arguments(config: ServerConfig, port: int) -> List[str]:
+    args = [
+        f"--remote-debugging-port={port}",
+        f"--remote-debugging-address={DEBUG_HOST}",
+        f"--user-data-dir={Path(config.auth.profile_dir).absolute()}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-extensions",
+        "--disable-blink-features=AutomationControlled",
+        "--disable-dev-shm-usage",
+        "--disable-popup-blocking",
+    ]
+    if config.headless:
+        args += [
+            "--headless=new",
+            "--window-size=1920,1080",
+            "--no-sandbox",
+            "--disable-gpu",
+            "--disable-background-networking",
+            "--mute-audio",
+        ]
+    return args
+
+
+def launch_browser(config: ServerConfig, browser_path: str) -> Dict[str, Any]:
+    """Start Chrome in its own session and wait for DevTools to answer"""
+    Path(config.auth.profile_dir).absolute().mkdir(parents=True, exist_ok=True)
+    port = allocate_debugging_port()
+    try:
+        process = subprocess.Popen(
+            [browser_path, *chrome_arguments(config, port)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        address = f"{DEBUG_HOST}:{port}"
+        deadline = time.monotonic() + config.timeout
+        while not devtools_alive(address):
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Detached Chrome exited with status {process.returncode}"
+                )
+            if time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("Detached Chrome did not open DevTools in time")
+            time.sleep(0.1)
+    finally:
+        release_debugging_port(port)
+
+    state = {
+        "pid": process.pid,
+        "port": port,
+        "debugger_address": address,
+        "profile_dir": str(Path(config.auth.profile_dir).absolute()),
+        "started_at": time.time(),
+    }
+    state_path(config).write_text(json.dumps(state))
+    logger.info(f"Launched detached Chrome (pid {process.pid}) on {address}")
+    return state
+
+
+def stop_browser(config: ServerConfig) -> bool:
+    """Terminate the detached browser for this profile, if one is running"""
+    state = live_browser(config)
+    state_path(config).unlink(missing_ok=True)
+    if state is None:
+        return False
+    try:
+        os.kill(state["pid"], signal.SIGTERM)
+    except ProcessLookupError:
+        return False
+    wait_for_exit(state["pid"], STOP_TIMEOUT)
+    logger.info(f"Stopped detached Chrome (pid {state['pid']})")
+    return True
+
+
+def wait_for_exit(pid: int, timeout: float) -> None:
+    """Wait until ``pid`` is gone, so its profile can be reused right away"""
+    import psutil  # Deferred with the rest of the detached-browser path
+
+    try:
+        psutil.Process(pid).wait(timeout)
+    except psutil.NoSuchProcess:
+        pass
+    except psutil.TimeoutExpired:
+        logger.warning(f"Detached Chrome (pid {pid}) is still shutting down")
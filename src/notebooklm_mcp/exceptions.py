@@ -37,3 +37,9 @@ class ConfigurationError(NotebookLMError):
     """Raised when configuration is invalid"""
 
     pass
+
+
+class DaemonError(NotebookLMError):
+    """Raised when the background browser daemon cannot serve a request"""
+
+    pass
@@ -0,0 +1,409 @@
+"""
+Local stand-in for the NotebookLM web app
+
+Serves a small page with the same chat textarea, streaming answer container and
+loading indicators the browser client looks for, so real end-to-end runs and
+benchmarks can execute offline. Point ``ServerConfig.base_url`` at
+``FakeNotebookLMServer.base_url`` to use it.
+
+Run standalone with ``python -m notebooklm_mcp.fake_notebooklm --port 8765``.
+"""
+
+import html
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from loguru import logger
+
+NOTEBOOK_PATH = re.compile(r"^/notebook/([A-Za-z0-9_-]+)/?$")
+ASSET_PATH = re.compile(r"^/assets/([A-Za-z0-9_.-]+)$")
+
+# Heavy assets a real NotebookLM page pulls in that the client never needs
+ASSET_TYPES = {
+    ".css": "text/css",
+    ".woff2": "font/woff2",
+    ".png": "image/png",
+    ".js": "application/javascript",
+}
+
+
+@dataclass
+class FakeNotebookLMOptions:
+    """Behaviour knobs for the fake NotebookLM page"""
+
+    token_rate: float = 40.0  # Answer tokens streamed per second
+    answer_tokens: int = 80  # Words in every generated answer
+    first_token_delay: float = 0.5  # Seconds of "thinking" before streaming
+    hydration_delay: float = 0.0  # Seconds before the chat input is rendered
+    require_login: bool = False  # Redirect notebook pages to a sign-in page
+    asset_kb: int = 0  # Size of each font/image/analytics asset; 0 = no assets
+    asset_count: int = 8  # Images per page when assets are enabled
+    asset_delay: float = 0.0  # Seconds before each asset response
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} - NotebookLM</title>
+<style>
+  body {{ font-family: sans-serif; margin: 0; }}
+  .chat-panel {{ max-width: 960px; margin: 0 auto; padding: 16px; }}
+  .user-query {{ color: #555; margin: 12px 0; }}
+  .response-container {{ margin: 12px 0; white-space: pre-wrap; }}
+  .loading-indicator {{ color: #999; }}
+  textarea {{ width: 100%; height: 48px; }}
+</style>
+{head_assets}
+</head>
+<body>
+<div class="chat-panel">
+  <h1>{title}</h1>
+  {body_assets}
+  <div class="chat-history" id="history"></div>
+  <div id="input-slot"></div>
+</div>
+<script>
+(function () {{
+  const config = {config};
+  const history = document.getElementById("history");
+  const filler = ("the sources describe how notebooks collect documents and "
+    + "answer questions grounded in their content with inline citations").split(" ");
+
+  function buildAnswer(question) {{
+    const words = ["Based", "on", "the", "sources", "in", "notebook",
+                   config.notebook_id + ","];
+    let i = 0;
+    while (words.length < config.answer_tokens) {{
+      words.push(filler[i % filler.length]);
+      i += 1;
+    }}
+    return words.join(" ") + ". You asked: " + question;
+  }}
+
+  function ask(question) {{
+    const query = document.createElement("div");
+    query.className = "user-query";
+    query.textContent = question;
+    history.appendChild(query);
+
+    const container = document.createElement("div");
+    container.className = "response-container";
+    container.setAttribute("data-testid", "chat-response");
+    const text = document.createElement("div");
+    text.className = "response-text";
+    const loading = document.createElement("div");
+    loading.className = "loading-indicator";
+    loading.textContent = "Thinking...";
+    container.appendChild(text);
+    container.appendChild(loading);
+    history.appendChild(container);
+    fetch("/api/ask?notebook=" + encodeURIComponent(config.notebook_id),
+          {{ method: "POST" }}).catch(function () {{}});
+
+    const tokens = buildAnswer(question).split(" ");
+    const interval = Math.max(1, Math.round(1000 / config.token_rate));
+    setTimeout(function () {{
+      let emitted = 0;
+      const timer = setInterval(function () {{
+        text.textContent = tokens.slice(0, emitted + 1).join(" ");
+        emitted += 1;
+        if (emitted >= tokens.length) {{
+          clearInterval(timer);
+          container.removeChild(loading);
+          const actions = document.createElement("div");
+          actions.className = "response-actions";
+          actions.textContent = "copy_all";
+          container.appendChild(actions);
+        }}
+      }}, interval);
+    }}, config.first_token_delay * 1000);
+  }}
+
+  function hydrate() {{
+    const input = document.createElement("textarea");
+    input.setAttribute("placeholder", "Ask about your sources...");
+    input.setAttribute("aria-label", "Query box");
+    input.addEventListener("keydown", function (event) {{
+      if (event.key !== "Enter") {{
+        return;
+      }}
+      event.preventDefault();
+      const question = input.value.trim();
+      input.value = "";
+      if (question) {{
+        ask(question);
+      }}
+    }});
+    document.getElementById("input-slot").appendChild(input);
+  }}
+
+  setTimeout(hydrate, config.hydration_delay * 1000);
+}})();
+</script>
+</body>
+</html>
+"""
+
+SIGNIN_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Sign in - Google Accounts</title></head>
+<body><h1>Sign in</h1><p>Continue to NotebookLM</p></body>
+</html>
+"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>NotebookLM</title></head>
+<body><h1>Welcome to NotebookLM</h1><p>Select a notebook to start chatting.</p></body>
+</html>
+"""
+
+
+class _FakeNotebookLMHandler(BaseHTTPRequestHandler):
+    """Request handler serving the fake NotebookLM routes"""
+
+    server: "_FakeHTTPServer"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        parsed = urlparse(self.path)
+        owner = self.server.owner
+
+        if parsed.path in ("", "/"):
+            self._send_html(HOME_PAGE)
+            return
+
+        if parsed.path == "/signin":
+            self._send_html(SIGNIN_PAGE)
+            return
+
+        if parsed.path == "/stats":
+            self._send_json(owner.stats())
+            return
+
+        match = ASSET_PATH.match(parsed.path)
+        if match:
+            self._send_asset(match.group(1))
+            return
+
+        match = NOTEBOOK_PATH.match(parsed.path)
+        if match:
+            if owner.options.require_login:
+                self.send_response(302)
+                self.send_header("Location", f"/signin?continue={parsed.path}")
+                self.end_headers()
+                return
+            owner._count("page_loads")
+            self._send_html(owner.render_notebook(match.group(1)))
+            return
+
+        self.send_error(404)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        parsed = urlparse(self.path)
+        if parsed.path == "/api/ask":
+            notebook = parse_qs(parsed.query).get("notebook", [""])[0]
+            self.server.owner._count("questions", notebook)
+            self._send_json({"status": "ok"})
+            return
+
+        self.send_error(404)
+
+    def _send_html(self, body: str) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_asset(self, name: str) -> None:
+        owner = self.server.owner
+        content_type = ASSET_TYPES.get(name[name.rfind(".") :])
+        if content_type is None or owner.options.asset_kb <= 0:
+            self.send_error(404)
+            return
+
+        owner._count("asset_requests")
+        if owner.options.asset_delay:
+            time.sleep(owner.options.asset_delay)
+
+        if name.endswith(".css"):
+            payload = (
+                "@font-face { font-family: Product; "
+                "src: url(/assets/product.woff2) format('woff2'); }\n"
+                "body { font-family: Product, sans-serif; }\n"
+            ).encode("utf-8")
+        else:
+            payload = bytes(owner.options.asset_kb * 1024)
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, data: Dict[str, Any]) -> None:
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"fake-notebooklm: {format % args}")
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Any, owner: "FakeNotebookLMServer") -> None:
+        self.owner = owner
+        super().__init__(address, _FakeNotebookLMHandler)
+
+
+class FakeNotebookLMServer:
+    """Threaded local HTTP server impersonating the NotebookLM chat UI"""
+
+    def __init__(
+        self,
+        options: Optional[FakeNotebookLMOptions] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.options = options or FakeNotebookLMOptions()
+        self.host = host
+        self.port = port
+        self._httpd: Optional[_FakeHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "page_loads": 0,
+            "asset_requests": 0,
+            "questions": 0,
+            "questions_by_notebook": {},
+        }
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to use as ``ServerConfig.base_url``"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeNotebookLMServer":
+        """Start serving on a background thread"""
+        if self._httpd is not None:
+            return self
+
+        self._httpd = _FakeHTTPServer((self.host, self.port), self)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="fake-notebooklm",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"Fake NotebookLM serving at {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port"""
+        if self._httpd is None:
+            return
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self) -> "FakeNotebookLMServer":
+        return self.start()
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.stop()
+
+    def render_notebook(self, notebook_id: str) -> str:
+        """Render the chat page for a notebook"""
+        config = asdict(self.options)
+        config["notebook_id"] = notebook_id
+
+        head_assets = body_assets = ""
+        if self.options.asset_kb > 0:
+            head_assets = (
+                '<link rel="stylesheet" href="/assets/fonts.css">\n'
+                '<script async src="/assets/analytics.js"></script>'
+            )
+            body_assets = "".join(
+                f'<img src="/assets/banner-{index}.png" width="1" height="1" alt="">'
+                for index in range(self.options.asset_count)
+            )
+
+        return PAGE_TEMPLATE.format(
+            title=html.escape(f"Notebook {notebook_id}"),
+            config=json.dumps(config),
+            head_assets=head_assets,
+            body_assets=body_assets,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request counters collected so far"""
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    def _count(self, key: str, notebook_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._stats[key] += 1
+            if notebook_id:
+                per_notebook = self._stats["questions_by_notebook"]
+                per_notebook[notebook_id] = per_notebook.get(notebook_id, 0) + 1
+
+
+def main() -> None:
+    """Run the fake NotebookLM server in the foreground"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local fake NotebookLM web app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token-rate", type=float, default=40.0)
+    parser.add_argument("--answer-tokens", type=int, default=80)
+    parser.add_argument("--first-token-delay", type=float, default=0.5)
+    parser.add_argument("--hydration-delay", type=float, default=0.0)
+    parser.add_argument("--require-login", action="store_true")
+    parser.add_argument("--asset-kb", type=int, default=0)
+    parser.add_argument("--asset-count", type=int, default=8)
+    parser.add_argument("--asset-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    options = FakeNotebookLMOptions(
+        token_rate=args.token_rate,
+        answer_tokens=args.answer_tokens,
+        first_token_delay=args.first_token_delay,
+        hydration_delay=args.hydration_delay,
+        require_login=args.require_login,
+        asset_kb=args.asset_kb,
+        asset_count=args.asset_count,
+        asset_delay=args.asset_delay,
+    )
+    server = FakeNotebookLMServer(options, host=args.host, port=args.port).start()
+    print(f"Fake NotebookLM running at {server.base_url} (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Idle-time session keepalive for the NotebookLM browser
+
+Google sessions expire or get signed out while the server sits idle, and
+without a keepalive the first request afterwards is the one that finds out.
+The keepalive reloads the current notebook on a schedule, but only once no
+request has run for a while, which renews the session cookies and surfaces a
+sign-in redirect early. A signed-out client is flagged as degraded for the
+health check instead of failing a live request.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from .recovery import is_dead_session_error
+
+# How often a skipped refresh (busy or recently used) is retried
+RETRY_INTERVAL = 15.0
+
+
+class SessionKeepalive:
+    """Refreshes the server's authenticated browser session while it is idle"""
+
+    def __init__(self, server: Any) -> None:
+        self.server = server
+        self.degraded = False
+        self.reason: Optional[str] = None
+        self.last_refresh: Optional[float] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def config(self) -> Any:
+        return self.server.config
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.keepalive_interval)
+
+    def start(self) -> None:
+        """Start the refresh loop if a keepalive interval is configured"""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        delay = self.config.keepalive_interval
+        while self.enabled:
+            await asyncio.sleep(delay)
+            if not self.enabled:
+                # Switched off by a config reload while asleep
+                break
+            try:
+                refreshed = await self.maybe_refresh()
+            except Exception as e:
+                logger.error(f"Session keepalive failed: {e}")
+                refreshed = False
+            delay = (
+                self.config.keepalive_interval
+                if refreshed
+                else min(RETRY_INTERVAL, self.config.keepalive_interval)
+            )
+        self._task = None
+
+    def skip_reason(self) -> Optional[str]:
+        """Why a refresh must not run right now, if anything"""
+        client = self.server.client
+        if client is None:
+            return "no browser"
+        if not getattr(client, "_is_authenticated", False) and not self.degraded:
+            # Nothing to keep alive until the first tool call authenticates
+            return "not authenticated yet"
+        recycler = self.server.recycler
+        if recycler.recycling:
+            return "recycling"
+        if recycler.idle_for() < self.config.keepalive_idle_after:
+            return "recently used"
+        return None
+
+    async def maybe_refresh(self) -> bool:
+        """Refresh the session if the browser is idle; True if it ran"""
+        reason = self.skip_reason()
+        if reason is not None:
+            logger.debug(f"Session keepalive skipped: {reason}")
+            return False
+        await self.refresh()
+        return True
+
+    async def refresh(self) -> bool:
+        """Reload the notebook and record whether the session survived"""
+        async with self.server.recycler.lease(track=False) as client:
+            try:
+                authenticated = await client.refresh_session()
+            except Exception as e:
+                if is_dead_session_error(e):
+                    # Recovery restarts the browser on the next request
+                    logger.warning(f"Session keepalive found a dead browser: {e}")
+                    return False
+                raise
+
+        self.last_refresh = time.time()
+        if authenticated:
+            if self.degraded:
+                logger.info("Google session restored")
+            self.degraded = False
+            self.reason = None
+        else:
+            logger.warning("Google session signed out - manual login required")
+            self.degraded = True
+            self.reason = "signed out"
+        return authenticated
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "degraded": self.degraded,
+            "reason": self.reason,
+            "last_refresh": self.last_refresh,
+        }
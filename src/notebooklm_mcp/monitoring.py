@@ -3,14 +3,20 @@ Monitoring and observability utilities for NotebookLM MCP Server
 """
 
 import asyncio
+import concurrent.futures
+import threading
 import time
+from bisect import bisect_left
+from collections import deque
 from contextlib import asynccontextmanager
-from dataclasses import asdict, dataclass
-from typing import Any, AsyncGenerator, Dict, Optional
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import psutil
 from loguru import logger
 
+from .sketch import QuantileSketch
+
 try:
     from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
@@ -32,6 +38,8 @@ class HealthStatus:
     browser_status: str
     authentication_status: str
     last_error: Optional[str] = None
+    browser_memory_mb: Optional[float] = None
+    browser_processes: Optional[int] = None
 
 
 @dataclass
@@ -42,18 +50,166 @@ class Metrics:
     requests_success: int = 0
     requests_failed: int = 0
     average_response_time: float = 0.0
+    p50_response_time: float = 0.0
+    p95_response_time: float = 0.0
+    p99_response_time: float = 0.0
     browser_restarts: int = 0
+    browser_recoveries: int = 0
     authentication_failures: int = 0
     active_sessions: int = 0
 
 
+@dataclass
+class BrowserResourceStats:
+    """Resources used by one driver's chromedriver/Chrome process tree"""
+
+    browser: str
+    root_pids: List[int]
+    timestamp: float
+    rss_bytes: int = 0
+    cpu_seconds: float = 0.0
+    process_count: int = 0
+    process_types: Dict[str, int] = field(default_factory=dict)
+    tab_count: int = 0
+
+    @property
+    def rss_mb(self) -> float:
+        return self.rss_bytes / (1024 * 1024)
+
+
+def browser_root_pids(driver: Any) -> List[int]:
+    """PIDs of the chromedriver service and the Chrome browser behind ``driver``"""
+    pids: List[int] = []
+    service = getattr(driver, "service", None)
+    driver_pid = getattr(getattr(service, "process", None), "pid", None)
+    # undetected-chromedriver launches Chrome itself and records its pid
+    browser_pid = getattr(driver, "browser_pid", None)
+
+    for pid in (driver_pid, browser_pid):
+        if isinstance(pid, int) and pid > 0 and pid not in pids:
+            pids.append(pid)
+    return pids
+
+
+def _chrome_process_type(process: Any) -> str:
+    """Classify a process by Chrome's ``--type=`` switch (renderer, gpu-process...)"""
+    for arg in process.cmdline():
+        if arg.startswith("--type="):
+            return arg.split("=", 1)[1]
+    return "driver" if "chromedriver" in process.name().lower() else "browser"
+
+
+def collect_browser_resources(
+    driver: Any, browser: str = "primary"
+) -> Optional[BrowserResourceStats]:
+    """Walk the driver's process tree and total its RSS, CPU time and tabs
+
+    Blocking (psutil plus one WebDriver call); run it off the event loop.
+    Returns None when the driver exposes no process ids.
+    """
+    roots = browser_root_pids(driver)
+    if not roots:
+        return None
+
+    stats = BrowserResourceStats(
+        browser=browser, root_pids=roots, timestamp=time.time()
+    )
+    seen: set = set()
+
+    for pid in roots:
+        try:
+            root = psutil.Process(pid)
+            tree = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+        for process in tree:
+            if process.pid in seen:
+                continue
+            seen.add(process.pid)
+            try:
+                with process.oneshot():
+                    rss = process.memory_info().rss
+                    cpu = process.cpu_times()
+                    kind = _chrome_process_type(process)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+            stats.rss_bytes += rss
+            stats.cpu_seconds += cpu.user + cpu.system
+            stats.process_count += 1
+            stats.process_types[kind] = stats.process_types.get(kind, 0) + 1
+
+    try:
+        stats.tab_count = len(driver.window_handles)
+    except Exception:
+        stats.tab_count = 0
+
+    return stats
+
+
+# Longest the health sampler waits for its turn on the browser
+BROWSER_PROBE_TIMEOUT = 5.0
+
+# Requests kept in the rolling window behind average_response_time
+ROLLING_WINDOW = 100
+REPORTED_QUANTILES = (0.5, 0.95, 0.99)
+
+# Upper bounds (seconds) shared by in-process and Prometheus latency histograms
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+@dataclass
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    count: int = 0
+    total: float = 0.0
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "buckets": dict(zip(bounds, self.counts)),
+        }
+
+
 class MetricsCollector:
     """Collects and manages application metrics"""
 
     def __init__(self) -> None:
         self.metrics = Metrics()
         self.start_time = time.time()
-        self._request_times: list[float] = []
+        self._request_times: deque[float] = deque(maxlen=ROLLING_WINDOW)
+        self._request_time_sum = 0.0
+        self._latency = QuantileSketch()
+        self._tool_latency: Dict[str, QuantileSketch] = {}
+        self._notebook_latency: Dict[str, QuantileSketch] = {}
+        self._phase_histograms: Dict[str, LatencyHistogram] = {}
+        self._command_histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._browser_resources: Dict[str, BrowserResourceStats] = {}
+        self._recovery_histogram = LatencyHistogram()
 
         # Prometheus metrics (if available)
         if PROMETHEUS_AVAILABLE:
@@ -82,9 +238,50 @@ class MetricsCollector:
                 "notebooklm_memory_usage_bytes", "Memory usage"
             )
             self.cpu_usage_gauge = Gauge("notebooklm_cpu_usage_percent", "CPU usage")
+            self.phase_histogram = Histogram(
+                "notebooklm_phase_seconds",
+                "Browser automation phase duration",
+                ["phase"],
+                buckets=LATENCY_BUCKETS,
+            )
+            self.webdriver_command_histogram = Histogram(
+                "notebooklm_webdriver_command_seconds",
+                "WebDriver command duration",
+                ["phase", "command"],
+                buckets=LATENCY_BUCKETS,
+            )
+            self.recovery_histogram = Histogram(
+                "notebooklm_recovery_seconds",
+                "Time to restart a crashed browser and restore its session",
+                buckets=LATENCY_BUCKETS,
+            )
+            self.browser_rss_gauge = Gauge(
+                "notebooklm_browser_rss_bytes",
+                "Resident memory of a browser process tree",
+                ["browser"],
+            )
+            self.browser_cpu_gauge = Gauge(
+                "notebooklm_browser_cpu_seconds",
+                "CPU time consumed by a browser process tree",
+                ["browser"],
+            )
+            self.browser_processes_gauge = Gauge(
+                "notebooklm_browser_processes",
+                "Processes in a browser tree by Chrome process type",
+                ["browser", "type"],
+            )
+            self.browser_tabs_gauge = Gauge(
+                "notebooklm_browser_tabs", "Open tabs per browser", ["browser"]
+            )
 
-    def record_request(self, success: bool, response_time: float) -> None:
-        """Record a request"""
+    def record_request(
+        self,
+        success: bool,
+        response_time: float,
+        tool: Optional[str] = None,
+        notebook_id: Optional[str] = None,
+    ) -> None:
+        """Record a request in constant time"""
         self.metrics.requests_total += 1
 
         if success:
@@ -96,25 +293,104 @@ class MetricsCollector:
             if PROMETHEUS_AVAILABLE:
                 self.requests_failed_counter.inc()
 
+        # Rolling mean over the window without re-summing it
+        if len(self._request_times) == ROLLING_WINDOW:
+            self._request_time_sum -= self._request_times[0]
         self._request_times.append(response_time)
-        if len(self._request_times) > 100:  # Keep last 100 requests
-            self._request_times.pop(0)
+        self._request_time_sum += response_time
+        self.metrics.average_response_time = self._request_time_sum / len(
+            self._request_times
+        )
 
-        if self._request_times:
-            self.metrics.average_response_time = sum(self._request_times) / len(
-                self._request_times
-            )
+        self._latency.add(response_time)
+        if tool:
+            self._sketch_for(self._tool_latency, tool).add(response_time)
+        if notebook_id:
+            self._sketch_for(self._notebook_latency, notebook_id).add(response_time)
 
         if PROMETHEUS_AVAILABLE:
             self.requests_counter.inc()
             self.response_time_histogram.observe(response_time)
 
+    def record_phase(self, phase: str, duration: float) -> None:
+        """Record time spent in a browser automation phase"""
+        histogram = self._phase_histograms.get(phase)
+        if histogram is None:
+            histogram = self._phase_histograms[phase] = LatencyHistogram()
+        histogram.observe(duration)
+
+        if PROMETHEUS_AVAILABLE:
+            self.phase_histogram.labels(phase=phase).observe(duration)
+
+    def record_webdriver_command(
+        self, command: str, phase: str, duration: float
+    ) -> None:
+        """Record a single WebDriver command issued during ``phase``"""
+        key = (phase, command)
+        histogram = self._command_histograms.get(key)
+        if histogram is None:
+            histogram = self._command_histograms[key] = LatencyHistogram()
+        histogram.observe(duration)
+
+        if PROMETHEUS_AVAILABLE:
+            self.webdriver_command_histogram.labels(
+                phase=phase, command=command
+            ).observe(duration)
+
     def record_browser_restart(self) -> None:
         """Record browser restart"""
         self.metrics.browser_restarts += 1
         if PROMETHEUS_AVAILABLE:
             self.browser_restarts_counter.inc()
 
+    def record_recovery(self, duration: float) -> None:
+        """Record a crashed browser being restarted in ``duration`` seconds"""
+        self.metrics.browser_recoveries += 1
+        self._recovery_histogram.observe(duration)
+        self.record_browser_restart()
+        if PROMETHEUS_AVAILABLE:
+            self.recovery_histogram.observe(duration)
+
+    def get_recovery_histogram(self) -> Dict[str, Any]:
+        """Histogram of crash recovery times"""
+        return self._recovery_histogram.to_dict()
+
+    def record_browser_resources(self, stats: BrowserResourceStats) -> None:
+        """Record the latest process-tree sample for one browser"""
+        previous = self._browser_resources.get(stats.browser)
+        self._browser_resources[stats.browser] = stats
+
+        if PROMETHEUS_AVAILABLE:
+            self.browser_rss_gauge.labels(browser=stats.browser).set(stats.rss_bytes)
+            self.browser_cpu_gauge.labels(browser=stats.browser).set(stats.cpu_seconds)
+            self.browser_tabs_gauge.labels(browser=stats.browser).set(stats.tab_count)
+            kinds = set(stats.process_types)
+            if previous is not None:
+                kinds.update(previous.process_types)
+            for kind in kinds:
+                self.browser_processes_gauge.labels(
+                    browser=stats.browser, type=kind
+                ).set(stats.process_types.get(kind, 0))
+
+    def forget_browser(self, browser: str) -> None:
+        """Drop resource stats for a browser that has been closed"""
+        previous = self._browser_resources.pop(browser, None)
+        if PROMETHEUS_AVAILABLE and previous is not None:
+            for gauge in (
+                self.browser_rss_gauge,
+                self.browser_cpu_gauge,
+                self.browser_tabs_gauge,
+            ):
+                gauge.labels(browser=browser).set(0)
+            for kind in previous.process_types:
+                self.browser_processes_gauge.labels(browser=browser, type=kind).set(0)
+
+    def get_browser_resources(self) -> Dict[str, Any]:
+        """Latest process-tree sample per browser"""
+        return {
+            browser: asdict(stats) for browser, stats in self._browser_resources.items()
+        }
+
     def record_auth_failure(self) -> None:
         """Record authentication failure"""
         self.metrics.authentication_failures += 1
@@ -127,49 +403,252 @@ class MetricsCollector:
         if PROMETHEUS_AVAILABLE:
             self.active_sessions_gauge.set(count)
 
-    def update_system_metrics(self) -> None:
-        """Update system metrics"""
+    def update_system_metrics(
+        self, memory_used: Optional[int] = None, cpu_percent: Optional[float] = None
+    ) -> None:
+        """Update system metrics, sampling psutil for values not supplied"""
         if PROMETHEUS_AVAILABLE:
             # Memory usage
-            memory = psutil.virtual_memory()
-            self.memory_usage_gauge.set(memory.used)
+            if memory_used is None:
+                memory_used = psutil.virtual_memory().used
+            self.memory_usage_gauge.set(memory_used)
 
             # CPU usage
-            cpu_percent = psutil.cpu_percent()
+            if cpu_percent is None:
+                cpu_percent = psutil.cpu_percent()
             self.cpu_usage_gauge.set(cpu_percent)
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics"""
+        self.metrics.p50_response_time = self._latency.quantile(0.5)
+        self.metrics.p95_response_time = self._latency.quantile(0.95)
+        self.metrics.p99_response_time = self._latency.quantile(0.99)
         return asdict(self.metrics)
 
+    def get_latency_breakdown(self) -> Dict[str, Any]:
+        """Latency percentiles per tool and per notebook"""
+
+        def describe(sketch: QuantileSketch) -> Dict[str, Any]:
+            summary: Dict[str, Any] = {"count": sketch.count, "mean": sketch.mean}
+            summary.update(sketch.quantiles(REPORTED_QUANTILES))
+            return summary
+
+        return {
+            "overall": describe(self._latency),
+            "tools": {
+                tool: describe(sketch) for tool, sketch in self._tool_latency.items()
+            },
+            "notebooks": {
+                notebook: describe(sketch)
+                for notebook, sketch in self._notebook_latency.items()
+            },
+        }
+
+    def export_sketches(self) -> Dict[str, Any]:
+        """Serialize latency sketches so another process can merge them"""
+        return {
+            "overall": self._latency.to_dict(),
+            "tools": {
+                tool: sketch.to_dict() for tool, sketch in self._tool_latency.items()
+            },
+            "notebooks": {
+                notebook: sketch.to_dict()
+                for notebook, sketch in self._notebook_latency.items()
+            },
+        }
+
+    def merge_sketches(self, exported: Dict[str, Any]) -> None:
+        """Merge sketches produced by ``export_sketches`` in another process"""
+        self._latency.merge(QuantileSketch.from_dict(exported["overall"]))
+        for tool, data in exported.get("tools", {}).items():
+            self._sketch_for(self._tool_latency, tool).merge(
+                QuantileSketch.from_dict(data)
+            )
+        for notebook, data in exported.get("notebooks", {}).items():
+            self._sketch_for(self._notebook_latency, notebook).merge(
+                QuantileSketch.from_dict(data)
+            )
+
+    @staticmethod
+    def _sketch_for(sketches: Dict[str, QuantileSketch], key: str) -> QuantileSketch:
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = QuantileSketch()
+        return sketch
+
+    def get_phase_histograms(self) -> Dict[str, Any]:
+        """Get aggregated phase and WebDriver command histograms"""
+        return {
+            "phases": {
+                phase: histogram.to_dict()
+                for phase, histogram in self._phase_histograms.items()
+            },
+            "commands": {
+                f"{phase}:{command}": histogram.to_dict()
+                for (phase, command), histogram in self._command_histograms.items()
+            },
+        }
 
-class HealthChecker:
-    """Health check functionality"""
 
-    def __init__(self, client: Optional[Any] = None) -> None:
+class HealthChecker:
+    """Health check functionality
+
+    System and browser stats are sampled on a background thread into a cached
+    snapshot, so ``check_health`` answers from memory instead of blocking the
+    event loop on ``psutil`` or a WebDriver round trip.
+    """
+
+    def __init__(
+        self,
+        client: Optional[Any] = None,
+        sample_interval: float = 15.0,
+        max_staleness: float = 60.0,
+    ) -> None:
         self.client = client
+        self.sample_interval = sample_interval
+        self.max_staleness = max_staleness
         self.last_check: Optional[HealthStatus] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Loop that owns the client's browser lock
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def configure(
+        self,
+        client: Optional[Any] = None,
+        sample_interval: Optional[float] = None,
+        max_staleness: Optional[float] = None,
+    ) -> None:
+        """Point the checker at a client and adjust sampling parameters"""
+        if client is not None:
+            self.client = client
+        if sample_interval is not None:
+            self.sample_interval = sample_interval
+        if max_staleness is not None:
+            self.max_staleness = max_staleness
+
+    def start_sampler(self) -> None:
+        """Start the background sampling thread (idempotent)"""
+        self._remember_loop()
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_sampler, name="notebooklm-health", daemon=True
+        )
+        self._thread.start()
+
+    def stop_sampler(self, timeout: float = 5.0) -> None:
+        """Stop the background sampling thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _remember_loop(self) -> None:
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+    def _run_sampler(self) -> None:
+        # Prime psutil so the first non-blocking cpu_percent is meaningful
+        psutil.cpu_percent(interval=None)
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.sample_interval)
+
+    def snapshot(self) -> Optional[HealthStatus]:
+        """Latest cached health status, or None if never sampled"""
+        with self._lock:
+            return self.last_check
+
+    def is_stale(self, max_staleness: Optional[float] = None) -> bool:
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return True
+        limit = self.max_staleness if max_staleness is None else max_staleness
+        return time.time() - snapshot.timestamp > limit
+
+    async def check_health(self, max_staleness: Optional[float] = None) -> HealthStatus:
+        """Return the cached health status, refreshing it off-loop when stale"""
+        self._remember_loop()
+        if not self.is_stale(max_staleness):
+            return self.snapshot()  # type: ignore[return-value]
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.sample)
+
+    def _probe_browser(self) -> Tuple[str, Optional[BrowserResourceStats]]:
+        """Browser status and resources; issues WebDriver commands"""
+        try:
+            # Try to get current URL to test browser responsiveness
+            _ = self.client.driver.current_url
+            status = "healthy"
+        except Exception as e:
+            status = f"unhealthy: {str(e)[:50]}"
+        return status, self._sample_browser_resources()
+
+    def _check_browser(self) -> Tuple[str, Optional[BrowserResourceStats]]:
+        """Run the browser probe in turn with tool calls
+
+        Tool calls share the WebDriver session, so the probe goes through the
+        client's ``_run_browser`` (and its browser lock) on the event loop. A
+        browser busy with a tool call is reported as "busy" rather than
+        waited for.
+        """
+        run_browser = getattr(self.client, "_run_browser", None)
+        if run_browser is None:
+            # No browser lock to honour
+            return self._probe_browser()
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return "unknown", None
+        lock = getattr(self.client, "_browser_lock", None)
+        if lock is not None and lock.locked():
+            return "busy", None
+
+        future = asyncio.run_coroutine_threadsafe(
+            run_browser(self._probe_browser), loop
+        )
+        try:
+            return future.result(BROWSER_PROBE_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return "busy", None
+
+    def _sample_browser_resources(self) -> Optional[BrowserResourceStats]:
+        try:
+            stats = collect_browser_resources(
+                self.client.driver, getattr(self.client, "browser_id", "primary")
+            )
+        except Exception as e:
+            logger.debug(f"Browser resource sampling failed: {e}")
+            return None
+
+        if stats is not None:
+            metrics_collector.record_browser_resources(stats)
+        return stats
 
-    async def check_health(self) -> HealthStatus:
-        """Perform comprehensive health check"""
+    def sample(self) -> HealthStatus:
+        """Collect a fresh health status (blocking; run off the event loop)"""
         start_time = time.time()
 
         try:
-            # System metrics
+            # System metrics; interval=None compares against the previous call
             memory = psutil.virtual_memory()
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)
             uptime = time.time() - metrics_collector.start_time
 
             # Browser status
             browser_status = "unknown"
+            resources: Optional[BrowserResourceStats] = None
             if self.client and hasattr(self.client, "driver"):
                 if self.client.driver is not None:
-                    try:
-                        # Try to get current URL to test browser responsiveness
-                        _ = self.client.driver.current_url
-                        browser_status = "healthy"
-                    except Exception as e:
-                        browser_status = f"unhealthy: {str(e)[:50]}"
+                    browser_status, resources = self._check_browser()
                 else:
                     browser_status = "not_started"
 
@@ -184,7 +663,7 @@ class HealthChecker:
 
             # Overall health
             healthy = (
-                browser_status == "healthy"
+                browser_status in ("healthy", "busy")
                 and memory.percent < 90  # Memory usage < 90%
                 and cpu_percent < 90  # CPU usage < 90%
             )
@@ -198,10 +677,14 @@ class HealthChecker:
                 cpu_usage=cpu_percent,
                 browser_status=browser_status,
                 authentication_status=auth_status,
+                browser_memory_mb=resources.rss_mb if resources else None,
+                browser_processes=resources.process_count if resources else None,
             )
 
-            self.last_check = health
-            logger.debug(f"Health check completed in {time.time() - start_time:.2f}s")
+            with self._lock:
+                self.last_check = health
+            metrics_collector.update_system_metrics(memory.used, cpu_percent)
+            logger.debug(f"Health sample completed in {time.time() - start_time:.2f}s")
 
             return health
 
@@ -226,7 +709,9 @@ health_checker = HealthChecker()
 
 
 @asynccontextmanager
-async def request_timer() -> AsyncGenerator[None, None]:
+async def request_timer(
+    tool: Optional[str] = None, notebook_id: Optional[str] = None
+) -> AsyncGenerator[None, None]:
     """Context manager for timing requests"""
     start_time = time.time()
     success = False
@@ -240,7 +725,12 @@ async def request_timer() -> AsyncGenerator[None, None]:
     finally:
         end_time = time.time()
         response_time = end_time - start_time
-        metrics_collector.record_request(success, response_time)
+        labels = {
+            key: value
+            for key, value in (("tool", tool), ("notebook_id", notebook_id))
+            if value
+        }
+        metrics_collector.record_request(success, response_time, **labels)
 
 
 def setup_monitoring(port: int = 8001) -> None:
@@ -0,0 +1,57 @@
+"""
+Remote debugging port allocation for Chrome
+
+Every browser on a host needs its own DevTools port. Ports are picked by the
+OS (bind to port 0), checked to be free, and reserved within this process
+until Chrome has bound them, so concurrent starts never pick the same one.
+"""
+
+import socket
+import threading
+from typing import Optional, Set
+
+DEBUG_HOST = "127.0.0.1"
+MAX_ATTEMPTS = 20
+
+_reserved: Set[int] = set()
+_lock = threading.Lock()
+
+
+def port_in_use(port: int, host: str = DEBUG_HOST) -> bool:
+    """Whether something already listens on ``host:port``"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.2)
+        return sock.connect_ex((host, port)) == 0
+
+
+def allocate_debugging_port(host: str = DEBUG_HOST) -> int:
+    """Reserve a free port for ``--remote-debugging-port``
+
+    Call ``release_debugging_port`` once Chrome has started (or failed to).
+    """
+    with _lock:
+        for _ in range(MAX_ATTEMPTS):
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.bind((host, 0))
+                port = sock.getsockname()[1]
+            if port not in _reserved and not port_in_use(port, host):
+                _reserved.add(port)
+                return port
+    raise RuntimeError("No free remote debugging port available")
+
+
+def release_debugging_port(port: Optional[int]) -> None:
+    with _lock:
+        _reserved.discard(port)
+
+
+def debugger_port(driver: object) -> Optional[int]:
+    """DevTools port the driver's browser actually listens on, if reported"""
+    capabilities = getattr(driver, "capabilities", None) or {}
+    address = capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if not address:
+        return None
+    try:
+        return int(str(address).rsplit(":", 1)[1])
+    except (IndexError, ValueError):
+        return None
@@ -0,0 +1,204 @@
+"""
+WebDriver command-level tracing for NotebookLM browser automation
+
+Wraps the driver's ``execute`` so every WebDriver command is timed and attributed
+to the high-level phase the client was in when it was issued (auth, navigate,
+hydrate, locate_input, type, submit, wait_stream, extract, clean, prefetch).
+Every command feeds the aggregate histograms; only commands issued on behalf of
+an open request also land in that request's trace.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, cast
+
+PHASES = (
+    "auth",
+    "navigate",
+    "hydrate",
+    "locate_input",
+    "type",
+    "submit",
+    "wait_stream",
+    "extract",
+    "clean",
+    "prefetch",
+)
+UNATTRIBUTED_PHASE = "other"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class CommandRecord:
+    """A single timed WebDriver command"""
+
+    command: str
+    phase: str
+    duration: float
+
+
+@dataclass
+class RequestTrace:
+    """Commands and phase timings collected for one tool request"""
+
+    started: float = field(default_factory=time.perf_counter)
+    commands: List[CommandRecord] = field(default_factory=list)
+    phase_time: Dict[str, float] = field(default_factory=dict)
+    # Set when the request ends; work it left behind is not added any more
+    closed: bool = False
+
+    def add_command(self, record: CommandRecord) -> None:
+        if not self.closed:
+            self.commands.append(record)
+
+    def add_phase_time(self, phase: str, duration: float) -> None:
+        if not self.closed:
+            self.phase_time[phase] = self.phase_time.get(phase, 0.0) + duration
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-phase breakdown suitable for a tool response"""
+        phases: Dict[str, Dict[str, Any]] = {}
+
+        for phase, duration in self.phase_time.items():
+            phases[phase] = {
+                "duration": round(duration, 4),
+                "commands": 0,
+                "command_time": 0.0,
+                "by_command": {},
+            }
+
+        for record in self.commands:
+            entry = phases.setdefault(
+                record.phase,
+                {"duration": 0.0, "commands": 0, "command_time": 0.0, "by_command": {}},
+            )
+            entry["commands"] += 1
+            entry["command_time"] = round(entry["command_time"] + record.duration, 4)
+            stats = entry["by_command"].setdefault(
+                record.command, {"count": 0, "time": 0.0}
+            )
+            stats["count"] += 1
+            stats["time"] = round(stats["time"] + record.duration, 4)
+
+        return {
+            "total": round(time.perf_counter() - self.started, 4),
+            "commands": len(self.commands),
+            "phases": phases,
+        }
+
+
+# Trace of the request the current task serves. Executor calls run in a copy
+# of the caller's context, so commands reach the trace of the request that
+# issued them no matter how many requests are in flight.
+_active_trace: ContextVar[Optional[RequestTrace]] = ContextVar(
+    "notebooklm_request_trace", default=None
+)
+
+
+class CommandTracer:
+    """Times WebDriver commands and groups them by client phase
+
+    Phase timings are exclusive: time spent in a nested phase (for example
+    ``extract`` inside ``wait_stream``) is only counted for the inner phase, so
+    the breakdown adds up to the wall time of the request.
+    """
+
+    def __init__(self, collector: Optional[Any] = None) -> None:
+        self.collector = collector
+        self._local = threading.local()
+
+    def install(self, driver: Any) -> None:
+        """Wrap ``driver.execute`` so every command is recorded"""
+        original = getattr(driver, "execute", None)
+        if original is None or getattr(original, "_notebooklm_traced", False):
+            return
+
+        def traced_execute(driver_command: str, params: Optional[dict] = None) -> Any:
+            start = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                self.record_command(driver_command, time.perf_counter() - start)
+
+        traced_execute._notebooklm_traced = True  # type: ignore[attr-defined]
+        driver.execute = traced_execute
+
+    @contextmanager
+    def request(self) -> Iterator[RequestTrace]:
+        """Collect the commands of the current request into a new trace"""
+        trace = RequestTrace()
+        token = _active_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            trace.closed = True
+            _active_trace.reset(token)
+
+    @staticmethod
+    def detach() -> None:
+        """Keep the current task's commands out of any request trace
+
+        For background tasks, which otherwise inherit the trace of the request
+        that spawned them.
+        """
+        _active_trace.set(None)
+
+    @property
+    def current_phase(self) -> str:
+        stack = getattr(self._local, "stack", None)
+        return stack[-1][0] if stack else UNATTRIBUTED_PHASE
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Attribute commands issued inside the block to ``name``"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        # Each frame is [phase, start, time spent in nested phases]
+        frame = [name, time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            if stack:
+                stack[-1][2] += elapsed
+            self._record_phase(name, elapsed - frame[2])
+
+    def record_command(self, command: str, duration: float) -> None:
+        record = CommandRecord(command, self.current_phase, duration)
+        trace = _active_trace.get()
+        if trace is not None:
+            trace.add_command(record)
+        if self.collector is not None:
+            self.collector.record_webdriver_command(
+                record.command, record.phase, duration
+            )
+
+    def _record_phase(self, phase: str, duration: float) -> None:
+        trace = _active_trace.get()
+        if trace is not None:
+            trace.add_phase_time(phase, duration)
+        if self.collector is not None:
+            self.collector.record_phase(phase, duration)
+
+
+def traced_phase(name: str) -> Callable[[F], F]:
+    """Run a client method inside ``self.tracer.phase(name)``"""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            with self.tracer.phase(name):
+                return func(self, *args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
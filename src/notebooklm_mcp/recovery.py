@@ -0,0 +1,66 @@
+"""
+Dead browser session detection and retry backoff
+
+When Chrome or chromedriver dies, the driver object stays around and every
+command fails with a session or connection error. These helpers tell those
+failures apart from ordinary page errors so the server can restart the
+browser and retry instead of failing every call until a manual restart.
+"""
+
+import random
+from typing import Optional
+
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException
+
+# Fragments of WebDriver/urllib3 error messages that mean the session is gone
+DEAD_SESSION_MARKERS = (
+    "invalid session id",
+    "session deleted",
+    "chrome not reachable",
+    "disconnected: not connected to devtools",
+    "target window already closed",
+    "no such window",
+    "connection refused",
+    "max retries exceeded",
+    "remote end closed connection",
+    "connection reset",
+    "broken pipe",
+)
+
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+
+def is_dead_session_error(error: Optional[BaseException]) -> bool:
+    """Whether ``error`` (or anything it was raised from) means the browser is dead"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+
+        if isinstance(
+            error,
+            (
+                InvalidSessionIdException,
+                NoSuchWindowException,
+                ConnectionRefusedError,
+                ConnectionResetError,
+                BrokenPipeError,
+            ),
+        ):
+            return True
+
+        # Also matches our own wrappers, e.g. ChatError(f"...: {e}")
+        message = str(error).lower()
+        if any(marker in message for marker in DEAD_SESSION_MARKERS):
+            return True
+
+        error = error.__cause__ or error.__context__
+
+    return False
+
+
+def backoff_delay(
+    attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP
+) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (1-based)"""
+    return random.uniform(0, min(cap, base * 2 ** max(attempt - 1, 0)))
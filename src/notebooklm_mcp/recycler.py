@@ -0,0 +1,306 @@
+"""
+Graceful browser recycling for long-lived NotebookLM MCP servers
+
+Chrome sessions grow over time. The recycler watches the active client's
+process-tree RSS, uptime and request count; once a configured threshold is
+crossed it starts and authenticates a replacement client on a copy of the
+profile, swaps it in for new requests, waits for in-flight requests on the old
+client to drain and only then closes the old browser.
+
+A detached browser (``detach_browser``) is restarted in place instead: its
+state file is keyed by the configured profile, so a Chrome left running in an
+A/B slot would never be found again by the next server.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+from loguru import logger
+
+from .monitoring import collect_browser_resources, health_checker, metrics_collector
+from .profile import clone_profile
+
+SLOTS = ("a", "b")
+
+
+class BrowserRecycler:
+    """Replaces the server's browser client when it grows too old or too large"""
+
+    def __init__(self, server: Any) -> None:
+        self.server = server
+        self._leases: Dict[int, int] = {}
+        self._requests = 0
+        self._started_at = time.time()
+        self._last_activity = time.monotonic()
+        self._slot = 0
+        self._profile_dir: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+        # Set while a detached browser restarts in place; leases wait for it
+        self._restarted: Optional[asyncio.Event] = None
+
+    @property
+    def config(self) -> Any:
+        return self.server.config
+
+    @property
+    def enabled(self) -> bool:
+        return bool(
+            self.config.recycle_max_rss_mb
+            or self.config.recycle_max_age
+            or self.config.recycle_max_requests
+        )
+
+    @asynccontextmanager
+    async def lease(self, track: bool = True) -> AsyncIterator[Any]:
+        """Borrow the current client for one request
+
+        The client is captured once, so a swap mid-request never changes the
+        browser a request is talking to, and the old browser is only closed
+        after every lease on it has been released. Background work passes
+        ``track=False`` so it counts neither as a request nor as activity.
+        """
+        while self._restarted is not None:
+            await self._restarted.wait()
+        await self.server._ensure_client()
+        client = self.server.client
+        key = id(client)
+        self._leases[key] = self._leases.get(key, 0) + 1
+        if track:
+            self._requests += 1
+            self._last_activity = time.monotonic()
+        try:
+            yield client
+        finally:
+            remaining = self._leases[key] - 1
+            if remaining:
+                self._leases[key] = remaining
+            else:
+                del self._leases[key]
+            if track:
+                self._last_activity = time.monotonic()
+
+    def in_flight(self, client: Any) -> int:
+        return self._leases.get(id(client), 0)
+
+    def idle_for(self) -> float:
+        """Seconds since the last request finished, 0 while any is running"""
+        if self._leases:
+            return 0.0
+        return time.monotonic() - self._last_activity
+
+    @property
+    def recycling(self) -> bool:
+        return self._lock.locked()
+
+    def client_started(self) -> None:
+        """Reset age and request counters for a freshly started client"""
+        self._started_at = time.time()
+        self._requests = 0
+
+    def start(self) -> None:
+        """Start the periodic threshold check if any threshold is configured"""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.recycle_check_interval)
+            try:
+                await self.maybe_recycle()
+            except Exception as e:
+                logger.error(f"Browser recycle check failed: {e}")
+
+    async def recycle_reason(self) -> Optional[str]:
+        """Name of the first threshold the current client has crossed"""
+        client = self.server.client
+        if client is None:
+            return None
+
+        pending = getattr(self.server, "pending_restart", None)
+        if pending:
+            return f"config change ({', '.join(sorted(pending))})"
+
+        config = self.config
+        if (
+            config.recycle_max_requests
+            and self._requests >= config.recycle_max_requests
+        ):
+            return f"served {self._requests} requests"
+
+        age = time.time() - self._started_at
+        if config.recycle_max_age and age >= config.recycle_max_age:
+            return f"uptime {age:.0f}s"
+
+        driver = getattr(client, "driver", None)
+        if config.recycle_max_rss_mb and driver is not None:
+            stats = await asyncio.get_running_loop().run_in_executor(
+                None,
+                collect_browser_resources,
+                driver,
+                getattr(client, "browser_id", "primary"),
+            )
+            if stats is not None:
+                metrics_collector.record_browser_resources(stats)
+                if stats.rss_mb >= config.recycle_max_rss_mb:
+                    return f"RSS {stats.rss_mb:.0f}MB"
+
+        return None
+
+    async def maybe_recycle(self) -> bool:
+        """Recycle the browser if it has crossed a threshold"""
+        reason = await self.recycle_reason()
+        if reason is None:
+            return False
+        return await self.recycle(reason)
+
+    async def recycle(self, reason: str) -> bool:
+        """Pre-warm a replacement client, cut over, drain and close the old one"""
+        if self._lock.locked():
+            return False
+
+        async with self._lock:
+            old = self.server.client
+            logger.info(f"Recycling browser ({reason})")
+
+            # Restart-only config changes ride along with the replacement
+            pending = getattr(self.server, "pending_restart", None) or {}
+            applied = dict(pending)
+            if self.config.detach_browser:
+                return await self._restart_detached(old, applied, pending)
+
+            slot = SLOTS[self._slot % len(SLOTS)]
+            if "auth.profile_dir" in applied:
+                # Start from the newly configured profile, not the old slot
+                self._profile_dir = None
+            replacement = None
+            try:
+                new_config = await self._replacement_config(slot)
+                replacement = self.server._create_client(new_config)
+                replacement.browser_id = f"slot-{slot}"
+                await replacement.start()
+                if getattr(old, "_is_authenticated", False):
+                    if not await replacement.authenticate():
+                        raise RuntimeError("replacement is not authenticated")
+                await self._carry_over_notebook(old, replacement)
+            except Exception as e:
+                logger.error(f"Replacement browser failed to warm up: {e}")
+                if replacement is not None:
+                    await replacement.close()
+                return False
+
+            # Cut over: new leases get the warm client from here on
+            self.server.client = replacement
+            health_checker.configure(client=replacement)
+            self._slot += 1
+            for key in applied:
+                pending.pop(key, None)
+            if new_config.auth.use_persistent_session:
+                self._profile_dir = new_config.auth.profile_dir
+            self.client_started()
+
+            await self._drain(old)
+            await old.close()
+            metrics_collector.record_browser_restart()
+            logger.info(f"Browser recycled into slot {slot}")
+            return True
+
+    async def _restart_detached(
+        self, old: Any, applied: Dict[str, Any], pending: Dict[str, Any]
+    ) -> bool:
+        """Stop the detached Chrome and start a new one on the same profile
+
+        Two browsers cannot share the profile, so there is no pre-warming:
+        new requests wait until the new browser is up.
+        """
+        self._restarted = asyncio.Event()
+        replacement = None
+        try:
+            await self._drain(old)
+            # Also ends the detached Chrome and removes its state file
+            await old.close(keep_detached=False)
+            replacement = self.server._create_client(self.config)
+            await replacement.start()
+            if getattr(old, "_is_authenticated", False):
+                if not await replacement.authenticate():
+                    raise RuntimeError("replacement is not authenticated")
+            await self._carry_over_notebook(old, replacement)
+        except Exception as e:
+            logger.error(f"Detached browser failed to restart: {e}")
+            if replacement is not None:
+                await replacement.close(keep_detached=False)
+            # The next request starts a browser from scratch
+            self.server.client = None
+            return False
+        finally:
+            self._restarted.set()
+            self._restarted = None
+
+        self.server.client = replacement
+        health_checker.configure(client=replacement)
+        for key in applied:
+            pending.pop(key, None)
+        self.client_started()
+        metrics_collector.record_browser_restart()
+        logger.info("Detached browser restarted")
+        return True
+
+    async def _carry_over_notebook(self, old: Any, replacement: Any) -> None:
+        """Move the replacement onto the notebook the old client was using
+
+        A fresh client starts on the default notebook, so without this the
+        next request after a cut-over would chat with the wrong one.
+        """
+        notebook_id = old.current_notebook_id
+        if notebook_id:
+            replacement.current_notebook_id = notebook_id
+            if getattr(old, "_is_authenticated", False):
+                await replacement.ensure_notebook(notebook_id)
+        # Prefetch predictions keep the old client's usage, not the warm-up's
+        replacement._notebook_history.clear()
+        replacement._notebook_history.extend(old._notebook_history)
+
+    async def _drain(self, client: Any) -> None:
+        deadline = time.monotonic() + self.config.recycle_drain_timeout
+        while self.in_flight(client) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        if self.in_flight(client):
+            logger.warning(
+                f"Closing recycled browser with {self.in_flight(client)} "
+                "request(s) still in flight"
+            )
+
+    async def _replacement_config(self, slot: str) -> Any:
+        """Config for the replacement client, with its own copy of the profile
+
+        Two Chrome instances cannot share a user data directory, so the
+        replacement runs on an A/B slot cloned from the active profile.
+        """
+        config = self.config
+        if not config.auth.use_persistent_session or config.auth.cookies_path:
+            # Throwaway profiles are never shared between browsers
+            return config
+
+        source = self._profile_dir or config.auth.profile_dir
+        target = f"{Path(config.auth.profile_dir).absolute()}-{slot}"
+        report = await asyncio.get_running_loop().run_in_executor(
+            None, partial(clone_profile, source, target, hardlink=True)
+        )
+        logger.info(f"Cloned profile into slot {slot}: {report.summary()}")
+        return replace(config, auth=replace(config.auth, profile_dir=target))
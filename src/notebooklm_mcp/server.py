@@ -5,15 +5,26 @@ Modern MCP server implementation using FastMCP v2 framework
 """
 
 import asyncio
-from typing import Any, Dict, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
 
 from fastmcp import FastMCP
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from . import telemetry
 from .client import NotebookLMClient
-from .config import ServerConfig
+from .config import RUNTIME_SETTINGS, ServerConfig, with_settings
+from .config_watch import ConfigWatcher
 from .exceptions import NotebookLMError
+from .keepalive import SessionKeepalive
+from .monitoring import health_checker, metrics_collector, request_timer
+from .profiler import RequestTrace
+from .recovery import backoff_delay, is_dead_session_error
+from .recycler import BrowserRecycler
+
+T = TypeVar("T")
 
 
 # Pydantic models for type-safe tool parameters
@@ -56,10 +67,27 @@ class SetNotebookRequest(BaseModel):
 class NotebookLMFastMCP:
     """FastMCP v2 server for NotebookLM automation with enhanced error handling"""
 
-    def __init__(self, config: ServerConfig):
+    def __init__(self, config: ServerConfig, config_path: Optional[str] = None):
         self.config = config
         self.client: Optional[NotebookLMClient] = None
 
+        # Changed settings that only a new browser picks up (next recycle)
+        self.pending_restart: Dict[str, Any] = {}
+        self.config_watcher = ConfigWatcher(self, config_path) if config_path else None
+
+        # Tracing is a no-op unless an exporter is configured
+        telemetry.setup_telemetry(config)
+        health_checker.configure(
+            sample_interval=config.health_sample_interval,
+            max_staleness=config.health_max_staleness,
+        )
+
+        # Replaces the browser when it crosses memory/age/request thresholds
+        self.recycler = BrowserRecycler(self)
+
+        # Renews the Google session while idle and flags sign-outs early
+        self.keepalive = SessionKeepalive(self)
+
         # Initialize FastMCP application
         self.app = FastMCP(name="NotebookLM MCP Server v2")
 
@@ -74,14 +102,128 @@ class NotebookLMFastMCP:
         """Ensure NotebookLM client is initialized (lazy initialization)"""
         try:
             if self.client is None:
-                logger.info("First tool call - initializing browser...")
-                self.client = NotebookLMClient(self.config)
-                await self.client.start()
-                logger.info("NotebookLM client initialized successfully")
+                with telemetry.span("notebooklm.ensure_client"):
+                    logger.info("First tool call - initializing browser...")
+                    self.client = self._create_client(self.config)
+                    await self.client.start()
+                    self.recycler.client_started()
+                    logger.info("NotebookLM client initialized successfully")
+
+                # Browser/system stats are sampled off the event loop from now on
+                health_checker.configure(client=self.client)
+                health_checker.start_sampler()
+                self.recycler.start()
+                self.keepalive.start()
         except Exception as e:
             logger.error(f"Failed to initialize client: {e}")
             raise NotebookLMError(f"Client initialization failed: {e}")
 
+    def _create_client(self, config: ServerConfig) -> NotebookLMClient:
+        return NotebookLMClient(config)
+
+    async def apply_settings(self, settings: Dict[str, Any]) -> None:
+        """Adopt changed settings (``config.changed_settings``) while running
+
+        Runtime settings reach the live client at once. The rest go into
+        ``self.config`` for the next browser the recycler starts, and are
+        listed in ``pending_restart`` until then.
+        """
+        config = with_settings(self.config, settings)
+        config.validate()
+
+        runtime = {k: v for k, v in settings.items() if k in RUNTIME_SETTINGS}
+        restart = {k: v for k, v in settings.items() if k not in RUNTIME_SETTINGS}
+        self.config = config
+        health_checker.configure(
+            sample_interval=config.health_sample_interval,
+            max_staleness=config.health_max_staleness,
+        )
+
+        client = self.client
+        if client is None:
+            # The first browser starts with the whole new config
+            return
+        update_config = getattr(client, "update_config", None)
+        if runtime and update_config is not None:
+            await update_config(with_settings(client.config, runtime))
+        if restart:
+            self.pending_restart.update(restart)
+            logger.warning(
+                f"Config changes wait for the next browser recycle: "
+                f"{', '.join(sorted(restart))}"
+            )
+        # Thresholds or intervals may have just been switched on
+        self.recycler.start()
+        self.keepalive.start()
+
+    @asynccontextmanager
+    async def _tool_call(
+        self, tool: str, attributes: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Any]:
+        """Time a tool call into the metrics and wrap it in a telemetry span"""
+        notebook_id = (attributes or {}).get("notebooklm.notebook_id")
+        with telemetry.span(f"mcp.tool.{tool}", attributes) as span:
+            async with request_timer(tool=tool, notebook_id=notebook_id):
+                yield span
+
+    async def _with_recovery(
+        self, client: Any, operation: Callable[[Any], Awaitable[T]]
+    ) -> T:
+        """Run ``operation`` on ``client``, restarting a crashed browser and retrying
+
+        Only dead-session errors are retried, at most ``retry_attempts`` times
+        with jittered exponential backoff; anything else propagates as is.
+        """
+        retries = self.config.retry_attempts
+        attempt = 0
+        while True:
+            generation = getattr(client, "generation", None)
+            try:
+                return await operation(client)
+            except Exception as e:
+                if (
+                    attempt >= retries
+                    or not hasattr(client, "restart")
+                    or not is_dead_session_error(e)
+                ):
+                    raise
+                attempt += 1
+                delay = backoff_delay(attempt)
+                logger.warning(
+                    f"Browser session lost ({e}); restarting and retrying "
+                    f"({attempt}/{retries}) in {delay:.1f}s"
+                )
+
+            await asyncio.sleep(delay)
+            started = time.perf_counter()
+            try:
+                restarted = await client.restart(generation)
+            except Exception as e:
+                logger.error(f"Browser restart failed: {e}")
+                continue
+            if restarted:
+                metrics_collector.record_recovery(time.perf_counter() - started)
+
+    async def _switch_notebook(self, client: Any, notebook_id: str) -> None:
+        """Navigate only when ``notebook_id`` is not already loaded and ready"""
+        ensure = getattr(client, "ensure_notebook", None)
+        if ensure is not None:
+            await ensure(notebook_id)
+        else:
+            await client.navigate_to_notebook(notebook_id)
+
+    @asynccontextmanager
+    async def _request_trace(
+        self, client: Any
+    ) -> AsyncIterator[Optional[RequestTrace]]:
+        """Trace this request's WebDriver commands when debug mode is on"""
+        tracer = getattr(client, "tracer", None)
+        if not self.config.debug or tracer is None:
+            yield None
+            return
+        with tracer.request() as trace:
+            yield trace
+
     def _setup_tools(self) -> None:
         """Setup FastMCP v2 tools with enhanced error handling and performance"""
 
@@ -92,20 +234,41 @@ class NotebookLMFastMCP:
             This will initialize the browser on first call if not already initialized.
             """
             try:
-                # Initialize client if not already done (lazy initialization)
-                if not self.client:
-                    logger.info("Healthcheck triggered - initializing browser...")
-                    await self._ensure_client()
-
-                auth_status = getattr(self.client, "_is_authenticated", False)
-
-                return {
-                    "status": "healthy" if auth_status else "needs_auth",
-                    "message": "Server is running and client initialized",
-                    "authenticated": auth_status,
-                    "notebook_id": self.config.default_notebook_id,
-                    "mode": "headless" if self.config.headless else "gui",
-                }
+                async with self._tool_call("healthcheck"):
+                    # Initialize client if not already done (lazy initialization)
+                    if not self.client:
+                        logger.info("Healthcheck triggered - initializing browser...")
+                        await self._ensure_client()
+
+                    # Session cookies answer in milliseconds; no page load
+                    check_session = getattr(self.client, "check_session", None)
+                    if check_session is not None:
+                        await check_session()
+                    auth_status = getattr(self.client, "_is_authenticated", False)
+
+                    status = "healthy" if auth_status else "needs_auth"
+                    if self.keepalive.degraded:
+                        status = "degraded"
+
+                    result = {
+                        "status": status,
+                        "message": "Server is running and client initialized",
+                        "authenticated": auth_status,
+                        "session": self.keepalive.status(),
+                        "pending_restart": sorted(self.pending_restart),
+                        "notebook_id": self.config.default_notebook_id,
+                        "mode": "headless" if self.config.headless else "gui",
+                    }
+
+                    # Cached by the background sampler, and re-sampled off the
+                    # loop once older than health_max_staleness
+                    snapshot = await health_checker.check_health()
+                    result["browser_status"] = snapshot.browser_status
+                    result["memory_usage"] = snapshot.memory_usage
+                    result["cpu_usage"] = snapshot.cpu_usage
+                    result["sampled_at"] = snapshot.timestamp
+
+                    return result
 
             except Exception as e:
                 logger.error(f"Health check failed: {e}")
@@ -126,15 +289,34 @@ class NotebookLMFastMCP:
                 wait_for_response: Whether to wait for response after sending
             """
             try:
-                await self._ensure_client()
-                await self.client.send_message(message)
-
-                response_data = {"status": "sent", "message": message}
-
-                if wait_for_response:
-                    response = await self.client.get_response()
-                    response_data["response"] = response
-                    response_data["status"] = "completed"
+                async with (
+                    self._tool_call(
+                        "send_chat_message",
+                        {
+                            "notebooklm.notebook_id": self.config.default_notebook_id,
+                            "notebooklm.prompt_length": len(message),
+                        },
+                    ) as span,
+                    self.recycler.lease() as client,
+                    self._request_trace(client) as trace,
+                ):
+
+                    async def exchange(client: Any) -> Optional[str]:
+                        await client.send_message(message)
+                        if wait_for_response:
+                            return await client.get_response()
+                        return None
+
+                    response = await self._with_recovery(client, exchange)
+                    response_data = {"status": "sent", "message": message}
+
+                    if response is not None:
+                        response_data["response"] = response
+                        response_data["status"] = "completed"
+                        span.set_attribute("notebooklm.answer_length", len(response))
+
+                    if trace:
+                        response_data["trace"] = trace.summary()
 
                 logger.info(f"Message sent successfully: {message[:50]}...")
                 return response_data
@@ -151,15 +333,25 @@ class NotebookLMFastMCP:
                 timeout: Timeout in seconds for waiting for response
             """
             try:
-                await self._ensure_client()
-                response = await self.client.get_response()
+                async with (
+                    self._tool_call("get_chat_response") as span,
+                    self.recycler.lease() as client,
+                    self._request_trace(client) as trace,
+                ):
+                    response = await self._with_recovery(
+                        client, lambda client: client.get_response()
+                    )
+                    span.set_attribute("notebooklm.answer_length", len(response))
 
                 logger.info("Response retrieved successfully")
-                return {
+                result = {
                     "status": "success",
                     "response": response,
                     "message": "Response retrieved successfully",
                 }
+                if trace:
+                    result["trace"] = trace.summary()
+                return result
 
             except Exception as e:
                 logger.error(f"Failed to get response: {e}")
@@ -169,14 +361,24 @@ class NotebookLMFastMCP:
         async def get_quick_response() -> Dict[str, Any]:
             """Get current response without waiting for completion."""
             try:
-                await self._ensure_client()
-                response = await self.client.get_response()
-
-                return {
+                async with (
+                    self._tool_call("get_quick_response") as span,
+                    self.recycler.lease() as client,
+                    self._request_trace(client) as trace,
+                ):
+                    response = await self._with_recovery(
+                        client, lambda client: client.get_response()
+                    )
+                    span.set_attribute("notebooklm.answer_length", len(response))
+
+                result = {
                     "status": "success",
                     "response": response,
                     "message": "Quick response retrieved",
                 }
+                if trace:
+                    result["trace"] = trace.summary()
+                return result
 
             except Exception as e:
                 logger.error(f"Failed to get quick response: {e}")
@@ -193,23 +395,41 @@ class NotebookLMFastMCP:
                 notebook_id: Optional notebook ID to switch to
             """
             try:
-                await self._ensure_client()
-
-                # Switch notebook if specified
-                if notebook_id:
-                    await self.client.navigate_to_notebook(notebook_id)
-
-                # Send message and get response
-                await self.client.send_message(message)
-                response = await self.client.get_response()
+                async with (
+                    self._tool_call(
+                        "chat_with_notebook",
+                        {
+                            "notebooklm.notebook_id": notebook_id
+                            or self.config.default_notebook_id,
+                            "notebooklm.prompt_length": len(message),
+                        },
+                    ) as span,
+                    self.recycler.lease() as client,
+                    self._request_trace(client) as trace,
+                ):
+
+                    async def exchange(client: Any) -> str:
+                        # Switch notebook if specified
+                        if notebook_id:
+                            await self._switch_notebook(client, notebook_id)
+
+                        # Send message and get response
+                        await client.send_message(message)
+                        return await client.get_response()
+
+                    response = await self._with_recovery(client, exchange)
+                    span.set_attribute("notebooklm.answer_length", len(response))
 
                 logger.info(f"Chat completed: {message[:50]}...")
-                return {
+                result = {
                     "status": "success",
                     "message": message,
                     "response": response,
                     "notebook_id": notebook_id or self.config.default_notebook_id,
                 }
+                if trace:
+                    result["trace"] = trace.summary()
+                return result
 
             except Exception as e:
                 logger.error(f"Chat interaction failed: {e}")
@@ -223,15 +443,27 @@ class NotebookLMFastMCP:
                 notebook_id: The notebook ID to navigate to
             """
             try:
-                await self._ensure_client()
-                await self.client.navigate_to_notebook(notebook_id)
+                async with (
+                    self._tool_call(
+                        "navigate_to_notebook", {"notebooklm.notebook_id": notebook_id}
+                    ),
+                    self.recycler.lease() as client,
+                    self._request_trace(client) as trace,
+                ):
+                    await self._with_recovery(
+                        client,
+                        lambda client: self._switch_notebook(client, notebook_id),
+                    )
 
                 logger.info(f"Navigated to notebook: {notebook_id}")
-                return {
+                result = {
                     "status": "success",
                     "notebook_id": notebook_id,
                     "message": f"Successfully navigated to notebook {notebook_id}",
                 }
+                if trace:
+                    result["trace"] = trace.summary()
+                return result
 
             except Exception as e:
                 logger.error(f"Navigation failed: {e}")
@@ -278,6 +510,8 @@ class NotebookLMFastMCP:
         try:
             # Client initialization is deferred until first tool call for faster startup
             logger.info("MCP server starting - browser will initialize on first tool use")
+            if self.config_watcher is not None:
+                self.config_watcher.start()
 
             # Run the FastMCP server with specified transport
             if transport == "http":
@@ -297,11 +531,18 @@ class NotebookLMFastMCP:
     async def stop(self):
         """Gracefully stop the server"""
         try:
+            await self.recycler.stop()
+            await self.keepalive.stop()
+            if self.config_watcher is not None:
+                await self.config_watcher.stop()
             if self.client:
                 await self.client.close()
                 logger.info("FastMCP server stopped gracefully")
         except Exception as e:
             logger.error(f"Error during server shutdown: {e}")
+        finally:
+            health_checker.stop_sampler()
+            telemetry.shutdown_telemetry()
 
 
 # Factory function for easy server creation
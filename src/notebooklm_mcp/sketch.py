@@ -0,0 +1,136 @@
+"""
+Mergeable streaming quantile sketch for latency metrics
+
+Values are counted in logarithmically sized buckets (the DDSketch scheme), so
+every quantile is reported within a fixed relative error, recording is O(1),
+memory is bounded, and sketches from different processes merge by adding
+bucket counts.
+"""
+
+import math
+from typing import Any, Dict, Iterable
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+# Values at or below this are counted as zero (sub-microsecond latencies)
+MIN_INDEXABLE_VALUE = 1e-6
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch over non-negative values"""
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Record a single observation"""
+        value = max(value, 0.0)
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if value <= MIN_INDEXABLE_VALUE:
+            self.zero_count += 1
+            return
+
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        if len(self._buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile ``q`` (0..1); 0.0 when empty"""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket keeps the error symmetric
+                estimate = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+
+        return self.max
+
+    def quantiles(self, qs: Iterable[float]) -> Dict[str, float]:
+        """Several quantiles keyed as ``p50``, ``p95`` ..."""
+        return {f"p{round(q * 100):g}": self.quantile(q) for q in qs}
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch with the same accuracy into this one"""
+        if not math.isclose(self._gamma, other._gamma):
+            raise ValueError("Cannot merge sketches with different accuracy")
+        if other.count == 0:
+            return
+
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        while len(self._buckets) > self.max_buckets:
+            self._collapse_lowest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, e.g. to ship to another process"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(index): count for index, count in self._buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(relative_accuracy=data["relative_accuracy"])
+        sketch._buckets = {
+            int(index): count for index, count in data["buckets"].items()
+        }
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+    def _collapse_lowest(self) -> None:
+        """Fold the two lowest buckets together to bound memory"""
+        lowest, second = sorted(self._buckets)[:2]
+        self._buckets[second] += self._buckets.pop(lowest)
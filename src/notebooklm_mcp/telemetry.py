@@ -0,0 +1,156 @@
+"""
+Optional OpenTelemetry tracing for NotebookLM MCP Server
+
+Spans are only created once ``setup_telemetry`` has configured an exporter;
+until then ``span()`` hands back a shared no-op object, so instrumented code
+paths cost a single global lookup when tracing is disabled.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from loguru import logger
+
+from .config import ServerConfig
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+TRACER_NAME = "notebooklm_mcp"
+
+_tracer: Optional[Any] = None
+_provider: Optional[Any] = None
+
+
+class _NoopSpan:
+    """Stand-in for a span when tracing is disabled"""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        return None
+
+    def set_attribute(self, _key: str, _value: Any) -> None:
+        return None
+
+    def set_attributes(self, _attributes: Dict[str, Any]) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """Start a span as the current span, or a no-op when tracing is disabled"""
+    if _tracer is None:
+        return _NOOP_SPAN
+
+    clean = {
+        key: value for key, value in (attributes or {}).items() if value is not None
+    }
+    return _tracer.start_as_current_span(name, attributes=clean)
+
+
+def is_enabled() -> bool:
+    """Whether spans are currently being recorded"""
+    return _tracer is not None
+
+
+if OTEL_AVAILABLE:
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """Append finished spans to a local file, one JSON document per line"""
+
+        def __init__(self, path: str) -> None:
+            self.path = Path(path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._lock = threading.Lock()
+
+        def export(self, spans: Sequence[ReadableSpan]) -> "SpanExportResult":
+            lines = [
+                json.dumps(json.loads(item.to_json()), separators=(",", ":"))
+                for item in spans
+            ]
+            with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+                for line in lines:
+                    handle.write(line + "\n")
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            return None
+
+
+def _create_exporter(config: ServerConfig) -> Optional[Any]:
+    exporter = (config.telemetry_exporter or "").lower()
+
+    if exporter == "file":
+        return JsonLinesSpanExporter(config.telemetry_file)
+
+    if exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning(
+                "OTLP exporter requested but opentelemetry-exporter-otlp-proto-http "
+                "is not installed; tracing disabled"
+            )
+            return None
+        return OTLPSpanExporter(endpoint=config.telemetry_endpoint)
+
+    logger.warning(f"Unknown telemetry exporter '{exporter}'; tracing disabled")
+    return None
+
+
+def setup_telemetry(config: ServerConfig) -> bool:
+    """Configure span export from ``config``; returns whether tracing is on"""
+    global _tracer, _provider
+
+    if not config.telemetry_exporter:
+        return False
+    if _tracer is not None:
+        return True
+    if not OTEL_AVAILABLE:
+        logger.warning(
+            "Telemetry requested but opentelemetry-sdk is not installed; "
+            "tracing disabled"
+        )
+        return False
+
+    exporter = _create_exporter(config)
+    if exporter is None:
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": config.server_name})
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    _provider = provider
+    _tracer = provider.get_tracer(TRACER_NAME)
+
+    logger.info(f"OpenTelemetry tracing enabled ({config.telemetry_exporter})")
+    return True
+
+
+def shutdown_telemetry() -> None:
+    """Flush pending spans and disable tracing"""
+    global _tracer, _provider
+
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
@@ -0,0 +1,82 @@
+import importlib.util
+import math
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).resolve().parent.parent / "benchmarks"
+
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location(
+        "run_benchmarks", BENCHMARKS / "run_benchmarks.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def results(**metrics):
+    return {"metrics": metrics}
+
+
+def by_metric(rows):
+    return {row["metric"]: row for row in rows}
+
+
+def test_percentile_interpolates_between_samples(bench):
+    values = [4.0, 1.0, 3.0, 2.0]
+
+    assert bench.percentile(values, 0) == 1.0
+    assert bench.percentile(values, 100) == 4.0
+    assert bench.percentile(values, 50) == pytest.approx(2.5)
+    assert bench.percentile(values, 95) == pytest.approx(3.85)
+    assert bench.percentile([7.0], 99) == 7.0
+    assert bench.percentile([], 50) == 0.0
+
+
+def test_compare_flags_changes_beyond_threshold(bench):
+    baseline = results(
+        chat={"p50": 1.0, "p95": 2.0, "n": 20},
+        throughput={"4": {"rps": 10.0}},
+    )
+    current = results(
+        chat={"p50": 1.05, "p95": 2.5, "n": 40},
+        throughput={"4": {"rps": 8.0}},
+    )
+
+    rows = by_metric(bench.compare(baseline, current, 0.10))
+
+    assert rows["chat.p50"]["regression"] is False
+    assert rows["chat.p95"]["regression"] is True
+    assert rows["chat.p95"]["change"] == pytest.approx(0.25)
+    # Lower throughput is worse even though the number went down
+    assert rows["throughput.4.rps"]["regression"] is True
+    # Sample counts are not performance
+    assert "chat.n" not in rows
+
+
+def test_compare_handles_negative_baseline(bench):
+    baseline = results(notebook_switch={"overhead_p50_s": -0.2})
+    slower = results(notebook_switch={"overhead_p50_s": -0.1})
+    faster = results(notebook_switch={"overhead_p50_s": -0.3})
+
+    regressed = by_metric(bench.compare(baseline, slower, 0.10))
+    improved = by_metric(bench.compare(baseline, faster, 0.10))
+
+    assert regressed["notebook_switch.overhead_p50_s"]["change"] == pytest.approx(0.5)
+    assert regressed["notebook_switch.overhead_p50_s"]["regression"] is True
+    assert improved["notebook_switch.overhead_p50_s"]["regression"] is False
+
+
+def test_compare_handles_zero_baseline(bench):
+    baseline = results(first_call_s=0.0, idle_s=0.0, throughput={"1": {"rps": 0.0}})
+    current = results(first_call_s=0.4, idle_s=0.0, throughput={"1": {"rps": 3.0}})
+
+    rows = by_metric(bench.compare(baseline, current, 0.10))
+
+    assert rows["first_call_s"]["regression"] is True
+    assert rows["first_call_s"]["change"] == math.inf
+    assert rows["idle_s"]["regression"] is False
+    assert rows["throughput.1.rps"]["regression"] is False
@@ -0,0 +1,106 @@
+import json
+import socket
+
+import pytest
+
+from notebooklm_mcp import bridge
+from notebooklm_mcp.config import AuthConfig, ServerConfig
+
+
+@pytest.fixture
+def config(tmp_path):
+    return ServerConfig(auth=AuthConfig(profile_dir=str(tmp_path / "profile")))
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+def test_backend_url_maps_wildcard_host_to_loopback():
+    assert bridge.backend_url("http", "0.0.0.0", 8001) == "http://127.0.0.1:8001/mcp/"
+    assert bridge.backend_url("sse", "localhost", 8002) == "http://localhost:8002/sse/"
+
+
+def test_register_then_discover_backend(config, listener):
+    with bridge.register_backend(config, "http", "127.0.0.1", listener) as state:
+        assert bridge.discover_backend(config) == state
+
+    assert not bridge.state_path(config).exists()
+
+
+def test_discover_drops_unreachable_backend(config):
+    path = bridge.state_path(config)
+    path.write_text(json.dumps({"url": "http://127.0.0.1:1/mcp/", "pid": 1}))
+
+    assert bridge.discover_backend(config) is None
+    assert not path.exists()
+
+
+def test_ensure_backend_spawns_once_when_missing(config, listener, monkeypatch):
+    spawned = []
+
+    class FakeProcess:
+        pid = 4242
+
+        def __init__(self, command, **_kwargs):
+            spawned.append(command)
+            # The "backend" comes up and registers itself
+            bridge.state_path(config).write_text(
+                json.dumps({"url": f"http://127.0.0.1:{listener}/mcp/", "pid": 1})
+            )
+
+        def poll(self):
+            return None
+
+    monkeypatch.setattr(bridge.subprocess, "Popen", FakeProcess)
+
+    first = bridge.ensure_backend(config, timeout=5)
+    second = bridge.ensure_backend(config, timeout=5)
+
+    assert first == second
+    assert len(spawned) == 1
+    assert spawned[0][-6:-2] == ["--transport", "http", "--host", "127.0.0.1"]
+
+
+def test_spawn_command_carries_server_overrides(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text("{}")
+
+    command = bridge.spawn_command(
+        str(config_file),
+        4321,
+        debug=True,
+        server_args=["--root-dir", "/work", "--notebook", "nb-1", "--headless"],
+    )
+
+    assert command[1:] == [
+        "-m",
+        "notebooklm_mcp.cli",
+        "--config",
+        str(config_file),
+        "--debug",
+        "server",
+        "--root-dir",
+        "/work",
+        "--notebook",
+        "nb-1",
+        "--headless",
+        "--transport",
+        "http",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        "4321",
+    ]
+
+
+def test_create_proxy_builds_fastmcp_server():
+    proxy = bridge.create_proxy("http://127.0.0.1:1/mcp/", name="bridge")
+
+    assert proxy.name == "bridge"
+    assert hasattr(proxy, "run_async")
@@ -0,0 +1,96 @@
+import os
+import sys
+
+import pytest
+
+from notebooklm_mcp import browser_cache
+
+pytestmark = pytest.mark.skipif(
+    sys.platform.startswith("win"), reason="uses a shell script as fake Chrome"
+)
+
+
+class FakeUC:
+    def __init__(self, chrome, driver_source):
+        self.chrome = chrome
+        self.driver_source = driver_source
+        self.patches = 0
+        fake = self
+
+        class Patcher:
+            def __init__(self, version_main=0):
+                self.version_main = version_main
+                self.executable_path = str(driver_source)
+
+            def is_binary_patched(self, path):
+                return open(path).read() == "patched"
+
+            def auto(self):
+                fake.patches += 1
+                driver_source.write_text("patched")
+
+        self.Patcher = Patcher
+
+    def find_chrome_executable(self):
+        return str(self.chrome)
+
+
+@pytest.fixture
+def fake_uc(tmp_path):
+    chrome = tmp_path / "chrome"
+    chrome.write_text("#!/bin/sh\necho 'Google Chrome 126.0.6478.126'\n")
+    os.chmod(chrome, 0o755)
+    return FakeUC(chrome, tmp_path / "downloaded-driver")
+
+
+def test_prepare_probes_once_and_reuses_cached_driver(fake_uc, tmp_path):
+    cache = tmp_path / "cache"
+
+    first = browser_cache.prepare(fake_uc, str(cache))
+    second = browser_cache.prepare(fake_uc, str(cache))
+
+    assert first == second
+    assert first.version_main == 126
+    assert first.driver_path == str(cache / "chromedriver-126")
+    assert fake_uc.patches == 1
+    assert first.chrome_kwargs() == {
+        "browser_executable_path": str(fake_uc.chrome),
+        "version_main": 126,
+        "driver_executable_path": str(cache / "chromedriver-126"),
+    }
+
+
+def test_prepare_refreshes_when_chrome_binary_changes(fake_uc, tmp_path):
+    cache = tmp_path / "cache"
+    browser_cache.prepare(fake_uc, str(cache))
+
+    fake_uc.chrome.write_text("#!/bin/sh\necho 'Google Chrome 127.0.6533.72'\n")
+    startup = browser_cache.prepare(fake_uc, str(cache))
+
+    assert startup.version_main == 127
+    assert fake_uc.patches == 2
+
+
+def test_invalidate_drops_entry_and_driver(fake_uc, tmp_path):
+    cache = tmp_path / "cache"
+    startup = browser_cache.prepare(fake_uc, str(cache))
+
+    browser_cache.invalidate(startup, str(cache))
+
+    assert not os.path.exists(startup.driver_path)
+    browser_cache.prepare(fake_uc, str(cache))
+    assert fake_uc.patches == 2
+
+
+def test_prepare_without_chrome_returns_none(monkeypatch, tmp_path):
+    monkeypatch.setattr(browser_cache.shutil, "which", lambda _name: None)
+    assert browser_cache.prepare(None, str(tmp_path)) is None
+
+
+def test_prepare_skips_cache_when_version_unknown(fake_uc, tmp_path):
+    fake_uc.chrome.write_text("#!/bin/sh\necho 'Chromium (custom build)'\n")
+    cache = tmp_path / "cache"
+
+    assert browser_cache.prepare(fake_uc, str(cache)) is None
+    assert fake_uc.patches == 0
+    assert not (cache / browser_cache.CACHE_FILE).exists()
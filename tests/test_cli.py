@@ -1,9 +1,12 @@
 import asyncio
+import subprocess
+import sys
 from pathlib import Path
 
 from click.testing import CliRunner
 
 from notebooklm_mcp import cli as cli_module
+from notebooklm_mcp import cookies
 from notebooklm_mcp.config import ServerConfig
 
 
@@ -46,8 +49,9 @@ def test_server_command_invokes_start(monkeypatch, tmp_path):
     calls = {}
 
     class DummyServer:
-        def __init__(self, cfg):
+        def __init__(self, cfg, config_path=None):
             calls["config"] = cfg
+            calls["config_path"] = config_path
 
         async def start(self, transport="stdio", host="127.0.0.1", port=8000):
             calls["params"] = (transport, host, port)
@@ -71,6 +75,7 @@ def test_server_command_invokes_start(monkeypatch, tmp_path):
 
     assert result.exit_code == 0
     assert calls["config"] is config
+    assert calls["config_path"] == str(config_path)
     assert calls["params"] == ("stdio", "127.0.0.1", 8000)
 
 
@@ -135,3 +140,131 @@ def test_extract_notebook_id_invalid():
         assert "Invalid NotebookLM URL" in str(exc)
     else:  # pragma: no cover - defensive
         raise AssertionError("Expected ValueError for invalid URL")
+
+
+def test_chat_command_uses_running_daemon(monkeypatch, tmp_path):
+    setup_cli(monkeypatch, tmp_path)
+    config_path = make_config_file(tmp_path)
+
+    class DummyDaemonClient:
+        def __init__(self):
+            self.chats = []
+
+        def chat(self, message, notebook_id=None):
+            self.chats.append((message, notebook_id))
+            return "warm answer"
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return None
+
+    daemon = DummyDaemonClient()
+    monkeypatch.setattr(
+        cli_module.DaemonClient, "discover", staticmethod(lambda config: daemon)
+    )
+
+    def no_browser(cfg):
+        raise AssertionError("chat started its own browser")
+
+    monkeypatch.setattr(cli_module, "NotebookLMClient", no_browser)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_module.cli,
+        ["--config", str(config_path), "chat", "--message", "hello"],
+    )
+
+    assert result.exit_code == 0
+    assert daemon.chats == [("hello", "abc")]
+
+
+def test_server_shared_stdio_runs_bridge(monkeypatch, tmp_path):
+    config = setup_cli(monkeypatch, tmp_path)
+    config_path = make_config_file(tmp_path)
+    calls = {}
+
+    async def fake_bridge(cfg, config_file=None, server_args=()):
+        calls["bridge"] = (cfg, config_file, server_args)
+
+    def no_server(cfg):
+        raise AssertionError("shared stdio mode started its own server")
+
+    monkeypatch.setattr(cli_module.bridge, "run_stdio_bridge", fake_bridge)
+    monkeypatch.setattr(cli_module, "NotebookLMFastMCP", no_server)
+    monkeypatch.setattr(cli_module.asyncio, "run", run_asyncio)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_module.cli,
+        [
+            "--config",
+            str(config_path),
+            "server",
+            "--root-dir",
+            str(tmp_path),
+            "--shared",
+            "--headless",
+            "--notebook",
+            "nb-1",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert calls["bridge"] == (
+        config,
+        str(config_path),
+        ["--root-dir", str(tmp_path.resolve()), "--notebook", "nb-1", "--headless"],
+    )
+
+
+def test_cookies_export_writes_encrypted_jar(monkeypatch, tmp_path):
+    setup_cli(monkeypatch, tmp_path)
+    config_path = make_config_file(tmp_path)
+    monkeypatch.delenv(cookies.COOKIE_KEY_ENV, raising=False)
+    jar = [{"name": "SID", "value": "v", "domain": ".google.com", "expires": -1}]
+
+    class DummyClient:
+        def __init__(self, cfg):
+            assert cfg.headless is True
+            assert cfg.auth.cookies_path is None
+
+        async def start(self):
+            pass
+
+        async def export_cookies(self):
+            return jar
+
+        async def close(self):
+            pass
+
+    monkeypatch.setattr(cli_module, "NotebookLMClient", DummyClient)
+    output = tmp_path / "jars" / "worker.cookies"
+    key_file = tmp_path / "keys" / "worker.key"
+    args = ["--config", str(config_path), "cookies", "export", "-o", str(output)]
+
+    runner = CliRunner()
+    # No key, then a key next to the jar: both refused before Chrome starts
+    assert runner.invoke(cli_module.cli, args).exit_code == 1
+    same_dir = ["--key-file", str(output.parent / "worker.key")]
+    assert runner.invoke(cli_module.cli, args + same_dir).exit_code == 1
+    assert not output.exists()
+
+    result = runner.invoke(cli_module.cli, args + ["--key-file", str(key_file)])
+
+    assert result.exit_code == 0, result.output
+    assert cookies.load_cookie_jar(output, key_file=key_file) == jar
+
+
+def test_cli_import_skips_browser_and_server_stacks():
+    probe = (
+        "import sys, notebooklm_mcp.cli\n"
+        "heavy = ('selenium', 'undetected_chromedriver', 'fastmcp')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
@@ -1,11 +1,13 @@
 import asyncio
+import time
 from types import MethodType, SimpleNamespace
 
 import pytest
 from selenium.common.exceptions import TimeoutException
 
+from notebooklm_mcp import cookies
 from notebooklm_mcp.client import NotebookLMClient
-from notebooklm_mcp.config import ServerConfig
+from notebooklm_mcp.config import AuthConfig, ServerConfig
 from notebooklm_mcp.exceptions import AuthenticationError, ChatError, NavigationError
 
 
@@ -44,6 +46,7 @@ class DummyElement:
 class DummyDriver:
     def __init__(self):
         self.current_url = "https://notebooklm.google.com/notebook/original"
+        self.ready_state = "ready"
         self.calls = []
         self.elements = {}
 
@@ -60,6 +63,18 @@ class DummyDriver:
     def quit(self):
         self.calls.append(("quit", None))
 
+    def set_script_timeout(self, timeout):
+        self.calls.append(("script_timeout", timeout))
+
+    def execute_async_script(self, _script, *args):
+        # Readiness probe: report the page as hydrated unless told otherwise
+        self.calls.append(("ready_probe", args))
+        return {
+            "state": self.ready_state,
+            "selector": args[0][0],
+            "since_navigation": 250.0,
+        }
+
 
 @pytest.fixture
 def config(tmp_path):
@@ -196,6 +211,7 @@ def test_navigate_to_notebook_sync_timeout(monkeypatch):
     client = NotebookLMClient(ServerConfig())
     driver = DummyDriver()
     client.driver = driver
+    driver.ready_state = "timeout"
 
     class DummyWait:
         def __init__(self, *_args, **_kwargs):
@@ -333,6 +349,43 @@ async def test_get_response_streaming(monkeypatch):
     assert result == "complete"
 
 
+@pytest.mark.asyncio
+async def test_get_response_waits_for_streaming_timeout(monkeypatch):
+    client = NotebookLMClient(ServerConfig(streaming_timeout=60))
+    client.driver = DummyDriver()
+    waits = []
+    monkeypatch.setattr(
+        client,
+        "_wait_for_streaming_response",
+        MethodType(lambda self, max_wait: waits.append(max_wait) or "", client),
+    )
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr(
+        "notebooklm_mcp.client.asyncio.get_event_loop",
+        lambda: ImmediateLoop(loop),
+    )
+
+    await client.get_response()
+    await client.update_config(ServerConfig(streaming_timeout=5, timeout=30))
+    await client.get_response()
+
+    assert waits == [60, 5]
+    assert ("timeout", 30) in client.driver.calls
+
+
+@pytest.mark.asyncio
+async def test_update_config_follows_new_default_notebook():
+    client = NotebookLMClient(ServerConfig(default_notebook_id="old"))
+
+    await client.update_config(ServerConfig(default_notebook_id="new"))
+    assert client.current_notebook_id == "new"
+
+    # A notebook switched to explicitly is kept
+    client.current_notebook_id = "picked"
+    await client.update_config(ServerConfig(default_notebook_id="newer"))
+    assert client.current_notebook_id == "picked"
+
+
 @pytest.mark.asyncio
 async def test_start_invokes_browser(monkeypatch):
     client = NotebookLMClient(ServerConfig())
@@ -490,6 +543,9 @@ def test_authenticate_sync_success(monkeypatch):
         def get(self, url):
             self.current_url = url
 
+        def execute_async_script(self, _script, *_args):
+            return {"state": "ready", "selector": None, "since_navigation": 0}
+
     class DummyWait:
         def __init__(self, *_args, **_kwargs):
             pass
@@ -516,6 +572,9 @@ def test_authenticate_sync_requires_manual_login(monkeypatch):
         def get(self, url):
             self.current_url = "https://accounts.google.com/signin"
 
+        def execute_async_script(self, _script, *_args):
+            return {"state": "signin", "selector": None}
+
     class DummyWait:
         def __init__(self, *_args, **_kwargs):
             pass
@@ -533,7 +592,9 @@ def test_authenticate_sync_requires_manual_login(monkeypatch):
 def test_authenticate_sync_timeout(monkeypatch):
     client = NotebookLMClient(ServerConfig())
     client.driver = SimpleNamespace(
-        get=lambda _url: None, current_url="https://notebooklm.google.com"
+        get=lambda _url: None,
+        current_url="https://notebooklm.google.com",
+        execute_async_script=lambda *_args: {"state": "timeout"},
     )
 
     class TimeoutWait:
@@ -549,6 +610,105 @@ def test_authenticate_sync_timeout(monkeypatch):
         client._authenticate_sync()
 
 
+class CookieDriver(DummyDriver):
+    def __init__(self, cookies):
+        super().__init__()
+        self.cookies = cookies
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+        return {"cookies": self.cookies}
+
+
+def session_cookie(expires):
+    return {"name": "__Secure-1PSID", "domain": ".google.com", "expires": expires}
+
+
+def test_authenticate_sync_trusts_live_session_cookies():
+    client = NotebookLMClient(ServerConfig())
+    driver = CookieDriver([session_cookie(time.time() + 86400)])
+    client.driver = driver
+
+    assert client._authenticate_sync() is True
+    assert client._is_authenticated is True
+    assert not any(call[0] == "get" for call in driver.calls)
+
+
+def test_authenticate_sync_headless_without_cookies_skips_navigation():
+    client = NotebookLMClient(ServerConfig(headless=True))
+    driver = CookieDriver([])
+    client.driver = driver
+
+    assert client._authenticate_sync() is False
+    assert not any(call[0] == "get" for call in driver.calls)
+
+
+def test_authenticate_sync_navigates_when_cookies_are_undecided():
+    client = NotebookLMClient(ServerConfig())
+    driver = CookieDriver([session_cookie(time.time() + 5)])
+    client.driver = driver
+
+    assert client._authenticate_sync() is True
+    assert any(call[0] == "get" for call in driver.calls)
+
+
+def test_cookie_probe_skipped_for_non_google_base_url():
+    client = NotebookLMClient(ServerConfig(base_url="http://127.0.0.1:8080"))
+    driver = CookieDriver([])
+    client.driver = driver
+
+    assert client._cookie_session_state() is None
+    assert driver.calls == []
+
+
+def test_start_browser_injects_cookie_jar(monkeypatch, tmp_path):
+    monkeypatch.delenv(cookies.COOKIE_KEY_ENV, raising=False)
+    jar = tmp_path / "worker.cookies"
+    key_file = tmp_path / "keys" / "worker.key"
+    cookies.save_cookie_jar([session_cookie(-1)], jar, key_file=key_file)
+    config = ServerConfig(
+        auth=AuthConfig(cookies_path=str(jar), cookies_key_file=str(key_file))
+    )
+    client = NotebookLMClient(config)
+    driver = CookieDriver([])
+    monkeypatch.setattr("notebooklm_mcp.client.USE_UNDETECTED", False, raising=False)
+    monkeypatch.setattr(
+        client, "_start_regular_chrome", lambda: setattr(client, "driver", driver)
+    )
+
+    client._start_browser()
+
+    assert client.uses_profile is False
+    assert (
+        "Network.setCookies",
+        {"cookies": [{"name": "__Secure-1PSID", "domain": ".google.com"}]},
+    ) in driver.calls
+
+
+@pytest.mark.asyncio
+async def test_refresh_session_navigates_despite_live_cookies(monkeypatch):
+    client = NotebookLMClient(ServerConfig())
+    driver = CookieDriver([session_cookie(time.time() + 86400)])
+    client.driver = driver
+    monkeypatch.setattr(
+        asyncio, "get_event_loop", lambda: ImmediateLoop(asyncio.get_running_loop())
+    )
+
+    assert await client.refresh_session() is True
+    assert any(call[0] == "get" for call in driver.calls)
+    assert not any(call[0] == "Network.getCookies" for call in driver.calls)
+
+
+@pytest.mark.asyncio
+async def test_check_session_updates_auth_flag():
+    client = NotebookLMClient(ServerConfig())
+    client.driver = CookieDriver([session_cookie(time.time() - 60)])
+    client._is_authenticated = True
+
+    assert await client.check_session() is False
+    assert client._is_authenticated is False
+
+
 @pytest.mark.asyncio
 async def test_get_response_requires_driver():
     client = NotebookLMClient(ServerConfig())
@@ -613,3 +773,409 @@ def test_wait_for_streaming_response_timeout(monkeypatch):
 
     result = client._wait_for_streaming_response(max_wait=1)
     assert "timeout" in result.lower()
+
+
+@pytest.mark.asyncio
+async def test_restart_replaces_dead_driver(monkeypatch):
+    client = NotebookLMClient(ServerConfig(default_notebook_id="abc"))
+    dead = DummyDriver()
+    client.driver = dead
+    client._is_authenticated = True
+    fresh = DummyDriver()
+
+    def fake_start(self):
+        self.driver = fresh
+
+    def fake_auth(self):
+        self._is_authenticated = True
+        return True
+
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr(
+        "notebooklm_mcp.client.asyncio.get_event_loop",
+        lambda: ImmediateLoop(loop),
+    )
+    client._start_browser = MethodType(fake_start, client)
+    client._authenticate_sync = MethodType(fake_auth, client)
+
+    assert await client.restart(seen_generation=0) is True
+    assert client.driver is fresh
+    assert client._is_authenticated is True
+    assert ("quit", None) in dead.calls
+
+    # A caller that failed on the old generation does not restart again
+    assert await client.restart(seen_generation=0) is False
+    assert client.generation == 1
+
+
+class TabDriver(DummyDriver):
+    def __init__(self):
+        super().__init__()
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.switch_to = SimpleNamespace(window=self._switch)
+
+    def _switch(self, handle):
+        self.calls.append(("switch", handle))
+        self.current_window_handle = handle
+
+    def close(self):
+        self.calls.append(("close", self.current_window_handle))
+        self.window_handles.remove(self.current_window_handle)
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls.append((command, params["url"]))
+        self.window_handles.append("tab-2")
+        return {"targetId": "tab-2"}
+
+
+def test_predict_next_notebook_prefers_frequent_then_default():
+    client = NotebookLMClient(ServerConfig(default_notebook_id="default"))
+    assert client.predict_next_notebook() is None
+
+    client.current_notebook_id = "other"
+    assert client.predict_next_notebook() == "default"
+
+    for notebook_id in ["a", "b", "a", "other"]:
+        client._remember_notebook(notebook_id)
+    assert client.predict_next_notebook() == "a"
+
+
+def test_navigate_uses_prefetched_tab(monkeypatch):
+    config = ServerConfig(default_notebook_id="abc")
+    client = NotebookLMClient(config)
+    driver = TabDriver()
+    client.driver = driver
+
+    class DummyWait:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def until(self, _condition):
+            return True
+
+    monkeypatch.setattr("notebooklm_mcp.client.WebDriverWait", DummyWait)
+
+    client._prefetch_sync("next")
+    assert client._prefetched == ("next", "tab-2")
+    assert ("Target.createTarget", f"{config.base_url}/notebook/next") in driver.calls
+
+    client._navigate_to_notebook_sync("next")
+    assert driver.window_handles == ["tab-2"]
+    assert driver.current_window_handle == "tab-2"
+    assert not any(call[0] == "get" for call in driver.calls)
+    assert client.current_notebook_id == "next"
+    assert client._prefetched is None
+
+
+@pytest.mark.asyncio
+async def test_get_response_schedules_prefetch(monkeypatch):
+    config = ServerConfig(
+        default_notebook_id="abc", prefetch_notebooks=True, prefetch_idle_delay=0
+    )
+    client = NotebookLMClient(config)
+    client.driver = TabDriver()
+    client.current_notebook_id = "other"
+    client._get_current_response = MethodType(lambda self: "answer", client)
+
+    loop = asyncio.get_running_loop()
+    monkeypatch.setattr(
+        "notebooklm_mcp.client.asyncio.get_event_loop",
+        lambda: ImmediateLoop(loop),
+    )
+
+    assert await client.get_response(wait_for_completion=False) == "answer"
+    await client._prefetch_task
+    assert client._prefetched == ("abc", "tab-2")
+
+
+@pytest.mark.asyncio
+async def test_ensure_notebook_skips_loaded_page(monkeypatch):
+    client = NotebookLMClient(ServerConfig(default_notebook_id="abc"))
+    client.driver = DummyDriver()
+    client.loaded_notebook_id = "abc"
+    navigations = []
+
+    async def fake_navigate(notebook_id):
+        navigations.append(notebook_id)
+
+    client.navigate_to_notebook = fake_navigate
+
+    assert await client.ensure_notebook("abc") is False
+    assert await client.ensure_notebook("xyz") is True
+    assert navigations == ["xyz"]
+
+
+def test_send_message_sync_trusts_tracked_page(monkeypatch):
+    class NoUrlDriver(DummyDriver):
+        @property
+        def current_url(self):
+            raise AssertionError("current_url should not be read")
+
+        @current_url.setter
+        def current_url(self, _value):
+            pass
+
+    client = NotebookLMClient(ServerConfig(default_notebook_id="abc"))
+    client.driver = NoUrlDriver()
+    client.loaded_notebook_id = "abc"
+    element = DummyElement()
+
+    class DummyWait:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def until(self, _condition):
+            return element
+
+    monkeypatch.setattr("notebooklm_mcp.client.WebDriverWait", DummyWait)
+
+    client._send_message_sync("hello")
+    assert element.sent[0] == "hello"
+
+
+def test_send_message_sync_reloads_stale_tracked_page(monkeypatch):
+    client = NotebookLMClient(ServerConfig(default_notebook_id="abc"))
+    client.driver = DummyDriver()
+    client.loaded_notebook_id = "abc"
+    element = DummyElement()
+    located = iter([None, element])
+    reloads = []
+
+    client._locate_chat_input = MethodType(lambda self: next(located), client)
+
+    def fake_navigate(self, notebook_id):
+        reloads.append(notebook_id)
+        self.loaded_notebook_id = notebook_id
+
+    client._navigate_to_notebook_sync = MethodType(fake_navigate, client)
+
+    client._send_message_sync("hello")
+    assert reloads == ["abc"]
+    assert element.sent[0] == "hello"
+
+
+def test_page_ready_probe_records_hydration_and_selector():
+    client = NotebookLMClient(ServerConfig(page_ready_timeout=40))
+    driver = DummyDriver()
+    client.driver = driver
+
+    driver.execute_async_script = lambda _script, selectors, deadline, idle: {
+        "state": "ready",
+        "selector": "textarea:not([disabled])",
+        "since_navigation": 1250.0,
+        "waited": 900.0,
+    }
+
+    assert client._wait_for_page_ready() == "ready"
+    assert client.last_hydration_time == pytest.approx(1.25)
+    assert client._chat_selectors()[0] == "textarea:not([disabled])"
+    # Script timeout is raised above the probe deadline once
+    assert ("script_timeout", 45) in driver.calls
+
+
+def test_navigate_falls_back_when_page_not_ready(monkeypatch):
+    client = NotebookLMClient(ServerConfig())
+    driver = DummyDriver()
+    driver.ready_state = "timeout"
+    client.driver = driver
+    waits = []
+
+    class DummyWait:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def until(self, condition):
+            waits.append(condition)
+            return True
+
+    monkeypatch.setattr("notebooklm_mcp.client.WebDriverWait", DummyWait)
+
+    client._navigate_to_notebook_sync("slow")
+    assert len(waits) == 1
+    assert client.current_notebook_id == "slow"
+    assert client.loaded_notebook_id is None
+
+
+def test_resource_blocking_skips_allowed_urls():
+    config = ServerConfig(
+        block_resources=True,
+        blocked_url_patterns=["*.png", "*.woff2", "*google-analytics.com/*"],
+        allowed_urls=["https://notebooklm.google.com/logo.png"],
+    )
+    client = NotebookLMClient(config)
+    driver = DummyDriver()
+    driver.execute_cdp_cmd = lambda command, params: driver.calls.append(
+        (command, params)
+    )
+    client.driver = driver
+
+    client._apply_resource_blocking()
+
+    assert driver.calls == [
+        ("Network.enable", {}),
+        (
+            "Network.setBlockedURLs",
+            {"urls": ["*.woff2", "*google-analytics.com/*"]},
+        ),
+    ]
+
+
+def test_compact_profile_only_past_size_threshold(tmp_path):
+    profile = tmp_path / "profile"
+    (profile / "Default" / "Cache").mkdir(parents=True)
+    (profile / "Default" / "Cache" / "data_1").write_bytes(b"x" * 2048)
+    config = ServerConfig(
+        compact_profile_on_start=True,
+        compact_profile_min_mb=1.0,
+        auth=AuthConfig(profile_dir=str(profile)),
+    )
+    client = NotebookLMClient(config)
+
+    client._compact_profile()
+    assert (profile / "Default" / "Cache").exists()
+
+    config.compact_profile_min_mb = 0.001
+    client._compact_profile()
+    assert not (profile / "Default" / "Cache").exists()
+
+
+def test_start_browser_gives_each_client_its_own_debugging_port(monkeypatch):
+    class DummyChromeOptions:
+        def __init__(self):
+            self.arguments = []
+            self.debugger_address = None
+
+        def add_argument(self, arg):
+            self.arguments.append(arg)
+
+    class DummyChromeDriver:
+        def __init__(self, options):
+            # Chrome honours the last of duplicate switches
+            port = [
+                arg.split("=", 1)[1]
+                for arg in options.arguments
+                if arg.startswith("--remote-debugging-port=")
+            ][-1]
+            self.capabilities = {
+                "goog:chromeOptions": {"debuggerAddress": f"127.0.0.1:{port}"}
+            }
+
+        def set_page_load_timeout(self, timeout):
+            pass
+
+    class DummyUCModule:
+        def ChromeOptions(self):
+            return DummyChromeOptions()
+
+        def Chrome(self, options=None, **_kwargs):
+            # Like undetected-chromedriver: a port of its own unless told one
+            if not options.debugger_address:
+                options.debugger_address = "127.0.0.1:1"
+            host, port = options.debugger_address.split(":")
+            options.add_argument(f"--remote-debugging-host={host}")
+            options.add_argument(f"--remote-debugging-port={port}")
+            return DummyChromeDriver(options)
+
+    allocated = []
+
+    def allocate():
+        allocated.append(45000 + len(allocated))
+        return allocated[-1]
+
+    monkeypatch.setattr("notebooklm_mcp.client.allocate_debugging_port", allocate)
+    monkeypatch.setattr("notebooklm_mcp.client.USE_UNDETECTED", True)
+    monkeypatch.setattr("notebooklm_mcp.client.uc", DummyUCModule(), raising=False)
+    config = ServerConfig(
+        headless=True,
+        browser_cache=False,
+        auth=AuthConfig(use_persistent_session=False),
+    )
+
+    first, second = NotebookLMClient(config), NotebookLMClient(config)
+    first._start_browser()
+    second._start_browser()
+
+    assert [first.debugging_port, second.debugging_port] == allocated
+
+
+def test_start_browser_retries_uncached_driver_before_plain_chrome(monkeypatch):
+    from notebooklm_mcp import browser_cache
+
+    class DummyChromeOptions:
+        def __init__(self):
+            self.arguments = []
+            self.debugger_address = None
+
+        def add_argument(self, arg):
+            self.arguments.append(arg)
+
+    class DummyUCModule:
+        def __init__(self):
+            self.starts = []
+
+        def ChromeOptions(self):
+            return DummyChromeOptions()
+
+        def Chrome(self, options=None, **kwargs):
+            self.starts.append(kwargs)
+            if "driver_executable_path" in kwargs:
+                raise RuntimeError("session not created: version mismatch")
+            return DummyDriver()
+
+    uc = DummyUCModule()
+    startup = browser_cache.BrowserStartup("/usr/bin/chrome", 126, "/cache/driver")
+    invalidated = []
+    monkeypatch.setattr("notebooklm_mcp.client.USE_UNDETECTED", True)
+    monkeypatch.setattr("notebooklm_mcp.client.uc", uc, raising=False)
+    monkeypatch.setattr(browser_cache, "prepare", lambda *_args: startup)
+    monkeypatch.setattr(
+        browser_cache, "invalidate", lambda entry, _dir: invalidated.append(entry)
+    )
+    client = NotebookLMClient(
+        ServerConfig(headless=True, auth=AuthConfig(use_persistent_session=False))
+    )
+    monkeypatch.setattr(
+        client, "_start_regular_chrome", lambda: pytest.fail("fell back too early")
+    )
+
+    client._start_browser()
+
+    assert invalidated == [startup]
+    assert [s.get("driver_executable_path") for s in uc.starts] == [
+        "/cache/driver",
+        None,
+    ]
+    assert uc.starts[1]["version_main"] is None
+    assert isinstance(client.driver, DummyDriver)
+
+
+@pytest.mark.asyncio
+async def test_detached_browser_is_attached_and_left_running(monkeypatch):
+    state = {"pid": 4321, "port": 45678, "debugger_address": "127.0.0.1:45678"}
+    monkeypatch.setattr("notebooklm_mcp.client.detached.live_browser", lambda c: state)
+
+    class AttachedDriver(DummyDriver):
+        def __init__(self, options=None):
+            super().__init__()
+            self.options = options
+            self.service = SimpleNamespace(stop=lambda: self.calls.append("stop"))
+
+        def quit(self):
+            self.calls.append("quit")
+
+    monkeypatch.setattr(
+        "notebooklm_mcp.client.webdriver.Chrome",
+        lambda options=None: AttachedDriver(options),
+    )
+    client = NotebookLMClient(ServerConfig(detach_browser=True, browser_cache=False))
+
+    client._start_browser()
+    driver = client.driver
+    assert driver.options.debugger_address == "127.0.0.1:45678"
+    assert client.detached is True
+    assert client.debugging_port == 45678
+
+    await client.close()
+    assert driver.calls[-1] == "stop"
+    assert "quit" not in driver.calls
@@ -34,6 +34,7 @@ class DummyElement:
 class DummyDriver:
     def __init__(self):
         self.current_url = "https://notebooklm.google.com/notebook/original"
+        self.ready_state = "ready"
         self.calls: list[tuple[str, object]] = []
         self.elements: dict[str, list[DummyElement]] = {}
         self.chat_element = DummyElement()
@@ -51,6 +52,18 @@ class DummyDriver:
     def quit(self) -> None:
         self.calls.append(("quit", None))
 
+    def set_script_timeout(self, timeout: float) -> None:
+        self.calls.append(("script_timeout", timeout))
+
+    def execute_async_script(self, _script, *args) -> dict:
+        # Readiness probe: report the page as hydrated unless told otherwise
+        self.calls.append(("ready_probe", args))
+        return {
+            "state": self.ready_state,
+            "selector": args[0][0],
+            "since_navigation": 250.0,
+        }
+
 
 class DummyFastMCP:
     def __init__(self, name: str):
@@ -459,6 +472,7 @@ def test_navigate_to_notebook_sync_timeout(monkeypatch):
     client = NotebookLMClient(ServerConfig(default_notebook_id="abc"))
     driver = DummyDriver()
     client.driver = driver
+    driver.ready_state = "timeout"
 
     def failing_wait(driver, timeout):
         return SimpleNamespace(
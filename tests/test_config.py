@@ -2,7 +2,13 @@ import json
 
 import pytest
 
-from notebooklm_mcp.config import AuthConfig, ServerConfig, load_config
+from notebooklm_mcp.config import (
+    AuthConfig,
+    ServerConfig,
+    changed_settings,
+    load_config,
+    with_settings,
+)
 from notebooklm_mcp.exceptions import ConfigurationError
 
 
@@ -39,6 +45,8 @@ def test_server_config_round_trip(tmp_path):
     assert restored.server_name == "custom"
     assert restored.auth.profile_dir == str(profile_dir)
     assert restored.auth.use_persistent_session is False
+    # Background page reloads are opt-in
+    assert restored.keepalive_interval == 0.0
 
 
 @pytest.mark.parametrize(
@@ -51,6 +59,7 @@ def test_server_config_round_trip(tmp_path):
             "Response stability checks must be positive",
         ),
         ({"retry_attempts": -1}, "Retry attempts cannot be negative"),
+        ({"keepalive_interval": -1}, "Keepalive interval cannot be negative"),
     ],
 )
 def test_server_config_validate_errors(tmp_path, overrides, expected):
@@ -160,3 +169,14 @@ def test_load_config_falls_back_to_env(tmp_path, monkeypatch):
     assert config.timeout == 42
     assert config.default_notebook_id == "env-id"
     assert config.auth.profile_dir == str(tmp_path / "profiles")
+
+
+def test_changed_settings_round_trip():
+    old = ServerConfig(timeout=60)
+    new = ServerConfig(timeout=90, auth=AuthConfig(profile_dir="other"))
+
+    changes = changed_settings(old, new)
+
+    assert changes == {"timeout": 90, "auth.profile_dir": "other"}
+    assert with_settings(old, changes) == new
+    assert old.timeout == 60
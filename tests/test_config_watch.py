@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+from notebooklm_mcp import server as server_module
+from notebooklm_mcp.config import ServerConfig
+from notebooklm_mcp.config_watch import ConfigWatcher
+from notebooklm_mcp.exceptions import ConfigurationError
+
+
+class DummyFastMCP:
+    def __init__(self, name):
+        self.name = name
+
+    def tool(self):
+        return lambda func: func
+
+
+class DummyClient:
+    def __init__(self, config):
+        self.config = config
+        self.updates = []
+
+    async def start(self):
+        pass
+
+    async def update_config(self, config):
+        self.updates.append(config)
+        self.config = config
+
+
+class RecordingServer:
+    def __init__(self, config):
+        self.config = config
+        self.applied = []
+
+    async def apply_settings(self, settings):
+        self.applied.append(settings)
+
+
+def write_config(path, mtime, **data):
+    path.write_text(json.dumps(data))
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def make_server(monkeypatch):
+    monkeypatch.setattr(server_module, "FastMCP", DummyFastMCP)
+    monkeypatch.setattr(server_module, "NotebookLMClient", DummyClient)
+    return server_module.NotebookLMFastMCP
+
+
+@pytest.mark.asyncio
+async def test_check_applies_only_settings_changed_in_file(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, 1000, timeout=60, default_notebook_id="a")
+    # headless came from a CLI flag and must survive reloads
+    server = RecordingServer(ServerConfig(timeout=60, headless=True))
+    watcher = ConfigWatcher(server, str(path))
+
+    assert await watcher.check() is False
+
+    write_config(path, 2000, timeout=90, default_notebook_id="a")
+    assert await watcher.check() is True
+    assert server.applied == [{"timeout": 90}]
+
+
+@pytest.mark.asyncio
+async def test_reload_ignores_unreadable_file(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, 1000, timeout=60)
+    server = RecordingServer(ServerConfig())
+    watcher = ConfigWatcher(server, str(path))
+
+    path.write_text("{broken")
+    assert await watcher.reload() is False
+    assert server.applied == []
+
+
+@pytest.mark.asyncio
+async def test_apply_settings_updates_client_and_defers_restart_only(make_server):
+    server = make_server(ServerConfig(timeout=60))
+    await server._ensure_client()
+    client = server.client
+
+    await server.apply_settings({"timeout": 90, "headless": True})
+
+    assert server.config.timeout == 90
+    assert server.config.headless is True
+    assert client.updates[-1].timeout == 90
+    assert client.config.headless is False
+    assert server.pending_restart == {"headless": True}
+    assert await server.recycler.recycle_reason() == "config change (headless)"
+
+
+@pytest.mark.asyncio
+async def test_apply_settings_rejects_invalid_values(make_server):
+    server = make_server(ServerConfig(timeout=60))
+
+    with pytest.raises(ConfigurationError):
+        await server.apply_settings({"timeout": 0})
+    assert server.config.timeout == 60
+
+
+def test_server_watches_config_path(make_server, tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, 1000)
+
+    assert make_server(ServerConfig()).config_watcher is None
+    assert make_server(ServerConfig(), config_path=str(path)).config_watcher.path == (
+        str(path)
+    )
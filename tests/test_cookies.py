@@ -0,0 +1,87 @@
+import pytest
+
+from notebooklm_mcp import cookies
+from notebooklm_mcp.exceptions import ConfigurationError
+
+NOW = 1_700_000_000.0
+
+
+def cookie(name="SID", domain=".google.com", expires=NOW + 86400, **extra):
+    return {"name": name, "domain": domain, "expires": expires, **extra}
+
+
+def test_live_session_cookie_is_authenticated():
+    assert cookies.session_state([cookie()], now=NOW) is True
+    assert cookies.session_state([cookie(expires=-1, session=True)], now=NOW)
+
+
+def test_missing_or_expired_session_cookies_are_signed_out():
+    assert cookies.session_state([], now=NOW) is False
+    assert cookies.session_state([cookie(name="NID")], now=NOW) is False
+    assert cookies.session_state([cookie(domain="example.com")], now=NOW) is False
+    assert cookies.session_state([cookie(expires=NOW - 1)], now=NOW) is False
+
+
+def test_nearly_expired_session_is_undecided():
+    found = [cookie(expires=NOW + 10), cookie(name="HSID", expires=NOW - 5)]
+
+    assert cookies.session_state(found, now=NOW) is None
+
+
+def test_is_google_url():
+    assert cookies.is_google_url("https://notebooklm.google.com")
+    assert not cookies.is_google_url("http://127.0.0.1:8080")
+    assert not cookies.is_google_url("https://google.com.example.org")
+
+
+def test_cookie_jar_round_trip_is_encrypted(tmp_path, monkeypatch):
+    monkeypatch.delenv(cookies.COOKIE_KEY_ENV, raising=False)
+    jar = [cookie(value="secret-session"), cookie(name="NID", value="x")]
+    path = tmp_path / "jars" / "jar.cookies"
+    key_file = tmp_path / "keys" / "jar.key"
+
+    size = cookies.save_cookie_jar(jar, path, key_file=key_file)
+
+    assert size == path.stat().st_size
+    assert b"secret-session" not in path.read_bytes()
+    assert key_file.stat().st_mode & 0o777 == 0o600
+    assert cookies.load_cookie_jar(path, key_file=key_file) == jar
+
+
+def test_cookie_jar_needs_a_key_kept_apart(tmp_path, monkeypatch):
+    monkeypatch.delenv(cookies.COOKIE_KEY_ENV, raising=False)
+    path = tmp_path / "jar.cookies"
+
+    with pytest.raises(ConfigurationError, match="No key"):
+        cookies.save_cookie_jar([cookie()], path)
+    with pytest.raises(ConfigurationError, match="same directory"):
+        cookies.save_cookie_jar([cookie()], path, key_file=tmp_path / "jar.key")
+    assert not path.exists()
+    assert not (tmp_path / "jar.key").exists()
+
+
+def test_cookie_jar_rejects_wrong_key(tmp_path, monkeypatch):
+    monkeypatch.delenv(cookies.COOKIE_KEY_ENV, raising=False)
+    path = tmp_path / "jar.cookies"
+    cookies.save_cookie_jar([cookie()], path, key_file=tmp_path / "keys" / "a.key")
+    other = cookies.load_key(path, tmp_path / "keys" / "b.key", create=True)
+    monkeypatch.setenv(cookies.COOKIE_KEY_ENV, other.decode())
+
+    with pytest.raises(ConfigurationError, match="cannot be decrypted"):
+        cookies.load_cookie_jar(path)
+
+
+def test_cookie_param_drops_session_expiry_and_unknown_fields():
+    session = cookie(expires=-1, session=True, size=42)
+
+    assert cookies.cookie_param(session) == {
+        "name": "SID",
+        "domain": ".google.com",
+    }
+    assert cookies.cookie_param(cookie())["expires"] == NOW + 86400
+
+
+def test_google_cookies_filters_other_sites():
+    found = cookies.google_cookies([cookie(), cookie(domain=".example.com")])
+
+    assert [c["domain"] for c in found] == [".google.com"]
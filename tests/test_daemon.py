@@ -0,0 +1,140 @@
+import asyncio
+import os
+
+import pytest
+
+from notebooklm_mcp import server as server_module
+from notebooklm_mcp.config import AuthConfig, ServerConfig
+from notebooklm_mcp.daemon import BrowserDaemon, DaemonClient, state_path, write_state
+from notebooklm_mcp.exceptions import DaemonError
+
+
+class DummyFastMCP:
+    def __init__(self, name):
+        self.name = name
+
+    def tool(self):
+        return lambda func: func
+
+
+class DummyClient:
+    def __init__(self, config):
+        self.config = config
+        self.current_notebook_id = config.default_notebook_id
+        self._is_authenticated = False
+        self.sent = []
+        self.closed = False
+
+    async def start(self):
+        pass
+
+    async def authenticate(self):
+        self._is_authenticated = True
+        return True
+
+    async def ensure_notebook(self, notebook_id):
+        self.current_notebook_id = notebook_id
+        return True
+
+    async def send_message(self, message):
+        self.sent.append((self.current_notebook_id, message))
+
+    async def get_response(self):
+        return f"answer to {self.sent[-1][1]}"
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setattr(server_module, "FastMCP", DummyFastMCP)
+    monkeypatch.setattr(server_module, "NotebookLMClient", DummyClient)
+    return ServerConfig(
+        default_notebook_id="abc",
+        auth=AuthConfig(profile_dir=str(tmp_path / "profile")),
+    )
+
+
+async def wait_for_daemon(config):
+    loop = asyncio.get_running_loop()
+    for _ in range(100):
+        client = await loop.run_in_executor(None, DaemonClient.discover, config)
+        if client is not None:
+            return client
+        await asyncio.sleep(0.02)
+    raise AssertionError("daemon did not start")
+
+
+def test_state_path_sits_next_to_profile(config, tmp_path):
+    assert state_path(config) == tmp_path / "profile.daemon.json"
+
+
+def test_discover_removes_state_of_dead_daemon(config):
+    path = state_path(config)
+    # Never a live pid on Linux: above the default pid_max
+    write_state(path, {"host": "127.0.0.1", "port": 1, "pid": 2**22 + 1})
+
+    assert DaemonClient.discover(config) is None
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("pid", [None, -1, 0, "123", True])
+def test_discover_treats_missing_or_invalid_pid_as_dead(config, pid, monkeypatch):
+    path = state_path(config)
+    state = {"host": "127.0.0.1", "port": 1}
+    if pid is not None:
+        state["pid"] = pid
+    write_state(path, state)
+    monkeypatch.setattr(
+        "notebooklm_mcp.daemon.os.kill",
+        lambda *_args: pytest.fail("must not signal the daemon"),
+    )
+
+    assert DaemonClient.discover(config) is None
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_daemon_serves_chat_and_stops(config):
+    daemon = BrowserDaemon(config)
+    serving = asyncio.create_task(daemon.serve())
+    loop = asyncio.get_running_loop()
+
+    client = await wait_for_daemon(config)
+    assert oct(os.stat(state_path(config)).st_mode & 0o777) == "0o600"
+
+    answer = await loop.run_in_executor(None, client.chat, "hello", "xyz")
+    status = await loop.run_in_executor(None, client.request, "status")
+    assert answer == "answer to hello"
+    assert daemon.server.client.sent == [("xyz", "hello")]
+    assert status["requests"] == 1
+    assert status["authenticated"] is True
+
+    await loop.run_in_executor(None, client.request, "stop")
+    client.close()
+    await asyncio.wait_for(serving, timeout=5)
+
+    assert daemon.server.client.closed is True
+    assert not state_path(config).exists()
+
+
+@pytest.mark.asyncio
+async def test_daemon_rejects_wrong_token(config):
+    daemon = BrowserDaemon(config)
+    serving = asyncio.create_task(daemon.serve())
+    loop = asyncio.get_running_loop()
+
+    client = await wait_for_daemon(config)
+    good_token = client.state["token"]
+    client.state = dict(client.state, token="wrong")
+    with pytest.raises(DaemonError, match="token"):
+        await loop.run_in_executor(None, client.request, "status")
+
+    client.state = dict(client.state, token=good_token)
+    with pytest.raises(DaemonError, match="Unknown operation"):
+        await loop.run_in_executor(None, client.request, "launch")
+
+    daemon.stop()
+    client.close()
+    await asyncio.wait_for(serving, timeout=5)
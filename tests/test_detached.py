@@ -0,0 +1,75 @@
+import json
+import sys
+import time
+
+import pytest
+
+from notebooklm_mcp import detached
+from notebooklm_mcp.config import AuthConfig, ServerConfig
+
+pytestmark = pytest.mark.skipif(
+    sys.platform.startswith("win"), reason="uses a script as fake Chrome"
+)
+
+# Stands in for Chrome: serves /json/version on --remote-debugging-port
+FAKE_CHROME = """#!{python}
+import http.server, sys
+port = int(next(a for a in sys.argv if a.startswith("--remote-debugging-port="))
+           .split("=")[1])
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{{"Browser": "FakeChrome/1.0"}}')
+    def log_message(self, *args):
+        pass
+http.server.HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+"""
+
+
+@pytest.fixture
+def fake_chrome(tmp_path):
+    path = tmp_path / "chrome"
+    path.write_text(FAKE_CHROME.format(python=sys.executable))
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def config(tmp_path):
+    return ServerConfig(
+        headless=True, timeout=10, auth=AuthConfig(profile_dir=str(tmp_path / "p"))
+    )
+
+
+def test_launch_then_reattach_then_stop(config, fake_chrome):
+    state = detached.launch_browser(config, fake_chrome)
+    try:
+        assert detached.state_path(config).exists()
+        assert detached.live_browser(config) == state
+    finally:
+        assert detached.stop_browser(config) is True
+
+    deadline = time.monotonic() + 5
+    while detached.devtools_alive(state["debugger_address"]):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    assert detached.live_browser(config) is None
+
+
+def test_live_browser_drops_state_of_dead_browser(config):
+    path = detached.state_path(config)
+    path.write_text(
+        json.dumps({"pid": 1, "port": 1, "debugger_address": "127.0.0.1:1"})
+    )
+
+    assert detached.live_browser(config) is None
+    assert not path.exists()
+
+
+def test_chrome_arguments_use_allocated_port_and_profile(config):
+    args = detached.chrome_arguments(config, 45678)
+
+    assert "--remote-debugging-port=45678" in args
+    assert any(arg.startswith("--user-data-dir=") for arg in args)
+    assert "--headless=new" in args
@@ -0,0 +1,86 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from notebooklm_mcp.config import ServerConfig
+from notebooklm_mcp.fake_notebooklm import FakeNotebookLMOptions, FakeNotebookLMServer
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeNotebookLMServer(
+        FakeNotebookLMOptions(token_rate=100.0, answer_tokens=12)
+    ).start()
+    yield server
+    server.stop()
+
+
+def fetch(url, method="GET"):
+    request = urllib.request.Request(url, method=method)
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.geturl(), response.read().decode("utf-8")
+
+
+def test_notebook_page_exposes_chat_markup(fake_server):
+    _url, body = fetch(f"{fake_server.base_url}/notebook/abc")
+
+    assert "Ask about your sources" in body
+    assert "chat-response" in body
+    assert "loading-indicator" in body
+    assert '"answer_tokens": 12' in body
+    assert '"notebook_id": "abc"' in body
+
+
+def test_stats_count_page_loads_and_questions(fake_server):
+    fetch(f"{fake_server.base_url}/notebook/abc")
+    fetch(f"{fake_server.base_url}/api/ask?notebook=abc", method="POST")
+
+    _url, body = fetch(f"{fake_server.base_url}/stats")
+    stats = json.loads(body)
+
+    assert stats["page_loads"] == 1
+    assert stats["questions"] == 1
+    assert stats["questions_by_notebook"] == {"abc": 1}
+
+
+def test_require_login_redirects_to_signin():
+    with FakeNotebookLMServer(FakeNotebookLMOptions(require_login=True)) as server:
+        url, body = fetch(f"{server.base_url}/notebook/abc")
+
+    assert "signin" in url
+    assert "Sign in" in body
+
+
+def test_unknown_route_returns_404(fake_server):
+    with pytest.raises(urllib.error.HTTPError):
+        fetch(f"{fake_server.base_url}/missing")
+
+
+def test_base_url_plugs_into_server_config(fake_server):
+    config = ServerConfig(base_url=fake_server.base_url)
+
+    assert config.base_url.startswith("http://127.0.0.1:")
+    assert fake_server.port != 0
+
+
+def test_assets_are_served_and_counted_when_enabled():
+    options = FakeNotebookLMOptions(asset_kb=2, asset_count=3)
+    with FakeNotebookLMServer(options) as server:
+        _url, page = fetch(f"{server.base_url}/notebook/abc")
+        with urllib.request.urlopen(
+            f"{server.base_url}/assets/banner-0.png", timeout=5
+        ) as response:
+            image = response.read()
+        stats = json.loads(fetch(f"{server.base_url}/stats")[1])
+
+    assert page.count("/assets/banner-") == 3
+    assert "/assets/fonts.css" in page
+    assert len(image) == 2 * 1024
+    assert stats["asset_requests"] == 1
+
+
+def test_assets_return_404_when_disabled(fake_server):
+    with pytest.raises(urllib.error.HTTPError):
+        fetch(f"{fake_server.base_url}/assets/banner-0.png")
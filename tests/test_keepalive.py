@@ -0,0 +1,94 @@
+import pytest
+
+from notebooklm_mcp.config import AuthConfig, ServerConfig
+from notebooklm_mcp.keepalive import SessionKeepalive
+from notebooklm_mcp.recycler import BrowserRecycler
+
+
+class DummyClient:
+    def __init__(self, signed_in=True):
+        self.signed_in = signed_in
+        self.refreshes = 0
+        self._is_authenticated = True
+
+    async def refresh_session(self):
+        self.refreshes += 1
+        self._is_authenticated = self.signed_in
+        return self.signed_in
+
+
+class DummyServer:
+    def __init__(self, client, **config):
+        self.config = ServerConfig(
+            auth=AuthConfig(profile_dir="profile", use_persistent_session=False),
+            **config,
+        )
+        self.client = client
+        self.recycler = BrowserRecycler(self)
+
+    async def _ensure_client(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_refreshes_only_when_idle():
+    client = DummyClient()
+    server = DummyServer(client, keepalive_idle_after=3600)
+    keepalive = SessionKeepalive(server)
+
+    async with server.recycler.lease():
+        pass
+    assert keepalive.skip_reason() == "recently used"
+    assert await keepalive.maybe_refresh() is False
+
+    server.config.keepalive_idle_after = 0
+    assert await keepalive.maybe_refresh() is True
+    assert client.refreshes == 1
+    assert keepalive.last_refresh is not None
+
+
+@pytest.mark.asyncio
+async def test_keepalive_lease_does_not_count_as_activity():
+    server = DummyServer(DummyClient(), keepalive_idle_after=0)
+    keepalive = SessionKeepalive(server)
+    idle_before = server.recycler.idle_for()
+
+    await keepalive.refresh()
+
+    assert server.recycler._requests == 0
+    assert server.recycler.idle_for() >= idle_before
+
+
+@pytest.mark.asyncio
+async def test_sign_out_marks_degraded_until_restored():
+    client = DummyClient(signed_in=False)
+    server = DummyServer(client, keepalive_idle_after=0)
+    keepalive = SessionKeepalive(server)
+
+    assert await keepalive.refresh() is False
+    assert keepalive.status()["degraded"] is True
+    assert client._is_authenticated is False
+
+    # A degraded client keeps being checked so a new login is noticed
+    client.signed_in = True
+    assert keepalive.skip_reason() is None
+    assert await keepalive.refresh() is True
+    assert keepalive.degraded is False
+
+
+@pytest.mark.asyncio
+async def test_skips_unauthenticated_client():
+    client = DummyClient()
+    client._is_authenticated = False
+    keepalive = SessionKeepalive(DummyServer(client, keepalive_idle_after=0))
+
+    assert await keepalive.maybe_refresh() is False
+    assert client.refreshes == 0
+
+
+def test_disabled_by_default():
+    keepalive = SessionKeepalive(DummyServer(None))
+
+    keepalive.start()
+
+    assert keepalive._task is None
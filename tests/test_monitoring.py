@@ -1,4 +1,7 @@
 import asyncio
+import subprocess
+import sys
+import time
 from types import SimpleNamespace
 
 import pytest
@@ -30,6 +33,38 @@ def test_metrics_collector_record_request():
     assert metrics["average_response_time"] > 0
 
 
+def test_metrics_collector_rolling_average_and_percentiles():
+    collector = monitoring.MetricsCollector()
+    for _ in range(monitoring.ROLLING_WINDOW):
+        collector.record_request(True, 10.0)
+    for _ in range(monitoring.ROLLING_WINDOW):
+        collector.record_request(True, 1.0)
+
+    metrics = collector.get_metrics()
+    # Average only covers the last window; percentiles cover every request
+    assert metrics["average_response_time"] == pytest.approx(1.0)
+    assert metrics["p50_response_time"] == pytest.approx(1.0, rel=0.02)
+    assert metrics["p99_response_time"] == pytest.approx(10.0, rel=0.02)
+
+
+def test_metrics_collector_latency_breakdown_and_merge():
+    collector = monitoring.MetricsCollector()
+    collector.record_request(True, 2.0, tool="chat_with_notebook", notebook_id="nb")
+    collector.record_request(True, 0.1, tool="healthcheck")
+
+    breakdown = collector.get_latency_breakdown()
+    assert breakdown["overall"]["count"] == 2
+    assert breakdown["tools"]["healthcheck"]["p50"] == pytest.approx(0.1, rel=0.02)
+    assert breakdown["notebooks"]["nb"]["count"] == 1
+
+    other = monitoring.MetricsCollector()
+    other.merge_sketches(collector.export_sketches())
+    other.merge_sketches(collector.export_sketches())
+    merged = other.get_latency_breakdown()
+    assert merged["overall"]["count"] == 4
+    assert merged["tools"]["chat_with_notebook"]["count"] == 2
+
+
 def test_metrics_collector_update_active_sessions():
     collector = monitoring.MetricsCollector()
     collector.update_active_sessions(3)
@@ -150,6 +185,99 @@ async def test_health_checker_not_started(monkeypatch):
     assert result.authentication_status == "not_authenticated"
 
 
+@pytest.mark.asyncio
+async def test_health_checker_serves_cached_snapshot(monkeypatch):
+    intervals = []
+
+    class CountingPsutil(DummyPsutil):
+        def cpu_percent(self, interval=None):
+            intervals.append(interval)
+            return 5.0
+
+    monkeypatch.setattr(monitoring, "psutil", CountingPsutil())
+    checker = monitoring.HealthChecker(max_staleness=60.0)
+
+    first = await checker.check_health()
+    second = await checker.check_health()
+    assert second is first
+    assert intervals == [None]
+
+    # A tighter staleness bound forces a fresh sample
+    first.timestamp -= 10
+    refreshed = await checker.check_health(max_staleness=1.0)
+    assert refreshed is not first
+    assert intervals == [None, None]
+
+
+def test_health_checker_background_sampler(monkeypatch):
+    monkeypatch.setattr(monitoring, "psutil", DummyPsutil())
+    client = SimpleNamespace(driver=SimpleNamespace(current_url="about:blank"))
+    checker = monitoring.HealthChecker(sample_interval=0.01)
+    checker.configure(client=client)
+
+    checker.start_sampler()
+    try:
+        deadline = time.time() + 2
+        while checker.snapshot() is None and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        checker.stop_sampler()
+
+    assert checker.snapshot().browser_status == "healthy"
+    assert checker._thread is None
+
+
+class LockedClient:
+    """Client double with the real browser lock and executor hand-off"""
+
+    def __init__(self):
+        self.driver = self
+        self._browser_lock = asyncio.Lock()
+        self._is_authenticated = True
+        self.probes = 0
+        self.touched = 0
+
+    @property
+    def current_url(self):
+        assert self._browser_lock.locked(), "driver used without the lock"
+        self.touched += 1
+        return "about:blank"
+
+    async def _run_browser(self, func, *args):
+        async with self._browser_lock:
+            self.probes += 1
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+@pytest.mark.asyncio
+async def test_health_checker_probes_browser_under_its_lock(monkeypatch):
+    monkeypatch.setattr(monitoring, "psutil", DummyPsutil())
+    client = LockedClient()
+    checker = monitoring.HealthChecker(client)
+
+    result = await checker.check_health()
+    assert result.browser_status == "healthy"
+    assert client.probes == 1
+
+    # A tool call holds the browser: report it busy without touching it
+    async with client._browser_lock:
+        busy = await checker.check_health(max_staleness=0)
+    assert busy.browser_status == "busy"
+    assert busy.healthy is True
+    assert client.touched == 1
+
+
+@pytest.mark.asyncio
+async def test_health_checker_resamples_stale_snapshot(monkeypatch):
+    monkeypatch.setattr(monitoring, "psutil", DummyPsutil())
+    checker = monitoring.HealthChecker(max_staleness=30.0)
+
+    first = await checker.check_health()
+    first.timestamp -= 60
+
+    assert await checker.check_health() is not first
+
+
 def test_setup_monitoring_with_prometheus(monkeypatch):
     recorded = {}
 
@@ -294,3 +422,47 @@ async def test_health_checker_handles_exception(monkeypatch):
     result = await checker.check_health()
     assert result.healthy is False
     assert result.browser_status == "error"
+
+
+def test_collect_browser_resources_walks_process_tree():
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(30)", "--type=renderer"]
+    )
+    try:
+        driver = SimpleNamespace(
+            service=SimpleNamespace(process=child), window_handles=["a", "b"]
+        )
+        stats = monitoring.collect_browser_resources(driver, browser="slot-a")
+    finally:
+        child.kill()
+        child.wait()
+
+    assert stats.root_pids == [child.pid]
+    assert stats.process_count == 1
+    assert stats.process_types == {"renderer": 1}
+    assert stats.tab_count == 2
+    assert stats.rss_bytes > 0
+
+
+def test_collect_browser_resources_without_pids():
+    assert monitoring.collect_browser_resources(SimpleNamespace()) is None
+
+
+def test_metrics_collector_browser_resources():
+    collector = monitoring.MetricsCollector()
+    stats = monitoring.BrowserResourceStats(
+        browser="primary",
+        root_pids=[1],
+        timestamp=0.0,
+        rss_bytes=300 * 1024 * 1024,
+        process_count=4,
+        process_types={"browser": 1, "renderer": 2, "gpu-process": 1},
+    )
+    collector.record_browser_resources(stats)
+
+    resources = collector.get_browser_resources()
+    assert resources["primary"]["process_types"]["renderer"] == 2
+    assert stats.rss_mb == pytest.approx(300.0)
+
+    collector.forget_browser("primary")
+    assert collector.get_browser_resources() == {}
@@ -0,0 +1,34 @@
+import socket
+from types import SimpleNamespace
+
+from notebooklm_mcp import ports
+
+
+def test_allocated_ports_are_unique_until_released():
+    first = ports.allocate_debugging_port()
+    second = ports.allocate_debugging_port()
+    try:
+        assert first != second
+        assert first in ports._reserved and second in ports._reserved
+    finally:
+        ports.release_debugging_port(first)
+        ports.release_debugging_port(second)
+
+    assert first not in ports._reserved
+
+
+def test_port_in_use_detects_listener():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind((ports.DEBUG_HOST, 0))
+        server.listen()
+        port = server.getsockname()[1]
+
+        assert ports.port_in_use(port) is True
+
+
+def test_debugger_port_reads_capabilities():
+    driver = SimpleNamespace(
+        capabilities={"goog:chromeOptions": {"debuggerAddress": "localhost:41234"}}
+    )
+    assert ports.debugger_port(driver) == 41234
+    assert ports.debugger_port(SimpleNamespace()) is None
@@ -0,0 +1,110 @@
+import os
+import socket
+
+import pytest
+
+from notebooklm_mcp.exceptions import ConfigurationError
+from notebooklm_mcp.profile import clone_profile, compact_profile
+
+
+def make_profile(root):
+    default = root / "Default"
+    (default / "Cache" / "Cache_Data").mkdir(parents=True)
+    (default / "Cache" / "Cache_Data" / "data_1").write_bytes(b"x" * 4096)
+    (default / "Code Cache").mkdir()
+    (default / "Code Cache" / "index").write_bytes(b"y" * 1024)
+    (default / "Network").mkdir()
+    (default / "Network" / "Cookies").write_text("cookies")
+    (default / "History").write_text("history")
+    (default / "IndexedDB").mkdir()
+    (default / "IndexedDB" / "000005.ldb").write_text("table")
+    (root / "Local State").write_text("{}")
+    (root / "SingletonLock").write_text("host-1")
+    return root
+
+
+def test_clone_skips_caches_and_reports_savings(tmp_path):
+    source = make_profile(tmp_path / "source")
+    target = tmp_path / "target"
+
+    report = clone_profile(source, target)
+
+    assert (target / "Default" / "Network" / "Cookies").read_text() == "cookies"
+    assert (target / "Default" / "History").exists()
+    assert not (target / "Default" / "Cache").exists()
+    assert not (target / "Default" / "Code Cache").exists()
+    assert not (target / "SingletonLock").exists()
+    assert report.bytes_skipped >= 4096 + 1024
+    assert report.files_copied + report.files_reflinked == 4
+    assert report.bytes_saved >= report.bytes_skipped
+
+
+def test_clone_auth_only_copies_session_files(tmp_path):
+    source = make_profile(tmp_path / "source")
+    target = tmp_path / "target"
+
+    clone_profile(source, target, auth_only=True)
+
+    copied = sorted(
+        str(path.relative_to(target)) for path in target.rglob("*") if path.is_file()
+    )
+    assert copied == ["Default/Network/Cookies", "Local State"]
+
+
+def test_clone_hardlinks_only_immutable_files(tmp_path):
+    source = make_profile(tmp_path / "source")
+    target = tmp_path / "target"
+
+    report = clone_profile(source, target, hardlink=True)
+
+    table = "Default/IndexedDB/000005.ldb"
+    cookies = "Default/Network/Cookies"
+    assert os.path.samefile(source / table, target / table)
+    assert not os.path.samefile(source / cookies, target / cookies)
+    assert report.files_linked == 1
+
+
+def test_clone_replaces_existing_target_and_handles_missing_source(tmp_path):
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "stale").write_text("old")
+
+    report = clone_profile(tmp_path / "missing", target)
+
+    assert target.exists()
+    assert list(target.iterdir()) == []
+    assert report.bytes_copied == 0
+
+
+def test_compact_keeps_session_and_drops_regenerable_data(tmp_path):
+    root = make_profile(tmp_path / "profile")
+    (root / "SingletonLock").unlink()
+    (root / "Default" / "Local Storage").mkdir()
+    (root / "Default" / "Local Storage" / "leveldb").write_text("app state")
+
+    report = compact_profile(root)
+
+    assert (root / "Default" / "Network" / "Cookies").exists()
+    assert (root / "Default" / "Local Storage" / "leveldb").exists()
+    assert (root / "Local State").exists()
+    assert not (root / "Default" / "Cache").exists()
+    assert not (root / "Default" / "History").exists()
+    assert "Default/History" in report.removed
+    assert report.bytes_freed >= 4096 + 1024
+
+
+def test_compact_refuses_profile_of_running_chrome(tmp_path):
+    root = make_profile(tmp_path / "profile")
+    (root / "SingletonLock").unlink()
+    os.symlink(f"{socket.gethostname()}-{os.getpid()}", root / "SingletonLock")
+
+    with pytest.raises(ConfigurationError, match="in use"):
+        compact_profile(root)
+
+
+def test_compact_ignores_stale_lock(tmp_path):
+    root = make_profile(tmp_path / "profile")
+    (root / "SingletonLock").unlink()
+    os.symlink(f"{socket.gethostname()}-{2**22 + 1}", root / "SingletonLock")
+
+    assert compact_profile(root).bytes_freed > 0
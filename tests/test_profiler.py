@@ -0,0 +1,156 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from notebooklm_mcp import monitoring
+from notebooklm_mcp.profiler import CommandRecord, CommandTracer, traced_phase
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, driver_command, params=None):
+        self.executed.append((driver_command, params))
+        return {"value": None}
+
+
+class RecordingCollector:
+    def __init__(self):
+        self.phases = []
+        self.commands = []
+
+    def record_phase(self, phase, duration):
+        self.phases.append(phase)
+
+    def record_webdriver_command(self, command, phase, duration):
+        self.commands.append((command, phase))
+
+
+def test_install_wraps_execute_once():
+    tracer = CommandTracer()
+    driver = RecordingDriver()
+
+    tracer.install(driver)
+    wrapped = driver.execute
+    tracer.install(driver)
+
+    assert driver.execute is wrapped
+    driver.execute("get", {"url": "x"})
+    assert driver.executed == [("get", {"url": "x"})]
+
+
+def test_install_ignores_driver_without_execute():
+    tracer = CommandTracer()
+    driver = object()
+
+    tracer.install(driver)
+
+
+def test_commands_attributed_to_innermost_phase():
+    collector = RecordingCollector()
+    tracer = CommandTracer(collector)
+    driver = RecordingDriver()
+    tracer.install(driver)
+
+    with tracer.request() as trace:
+        driver.execute("status")
+        with tracer.phase("wait_stream"):
+            driver.execute("findElements")
+            with tracer.phase("extract"):
+                driver.execute("getElementText")
+
+    summary = trace.summary()
+
+    assert summary["commands"] == 3
+    assert summary["phases"]["other"]["commands"] == 1
+    assert summary["phases"]["wait_stream"]["by_command"]["findElements"]["count"] == 1
+    assert summary["phases"]["extract"]["by_command"]["getElementText"]["count"] == 1
+    assert ("getElementText", "extract") in collector.commands
+    assert collector.phases == ["extract", "wait_stream"]
+
+
+def test_phase_times_are_exclusive(monkeypatch):
+    ticks = iter([0.0, 1.0, 3.0, 4.0])
+    monkeypatch.setattr(
+        "notebooklm_mcp.profiler.time.perf_counter", lambda: next(ticks)
+    )
+    tracer = CommandTracer()
+    with tracer.request() as trace:
+        with tracer.phase("wait_stream"):
+            with tracer.phase("extract"):
+                pass
+
+    assert trace.phase_time == {"extract": 2.0, "wait_stream": 2.0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_keep_separate_traces():
+    collector = RecordingCollector()
+    tracer = CommandTracer(collector)
+    driver = RecordingDriver()
+    tracer.install(driver)
+    both_open = asyncio.Event()
+    opened = []
+
+    async def request(command):
+        with tracer.request() as trace:
+            opened.append(command)
+            if len(opened) == 2:
+                both_open.set()
+            await both_open.wait()
+            # Driver work runs in the executor, like the client's
+            await asyncio.get_running_loop().run_in_executor(
+                None, contextvars.copy_context().run, driver.execute, command
+            )
+        return trace
+
+    first, second = await asyncio.gather(request("get"), request("findElement"))
+    driver.execute("refresh")
+
+    assert [c.command for c in first.commands] == ["get"]
+    assert [c.command for c in second.commands] == ["findElement"]
+    # Work outside any request only feeds the aggregate histograms
+    assert ("refresh", "other") in collector.commands
+
+
+def test_closed_trace_ignores_later_commands():
+    tracer = CommandTracer()
+    driver = RecordingDriver()
+    tracer.install(driver)
+
+    with tracer.request() as trace:
+        driver.execute("get")
+    trace.add_command(CommandRecord("late", "prefetch", 0.1))
+
+    assert [c.command for c in trace.commands] == ["get"]
+
+
+def test_traced_phase_decorator_uses_instance_tracer():
+    class Client:
+        def __init__(self):
+            self.tracer = CommandTracer()
+
+        @traced_phase("navigate")
+        def go(self):
+            return self.tracer.current_phase
+
+    client = Client()
+    assert client.go() == "navigate"
+    assert client.tracer.current_phase == "other"
+
+
+def test_metrics_collector_phase_histograms():
+    collector = monitoring.MetricsCollector()
+    collector.record_phase("navigate", 0.2)
+    collector.record_phase("navigate", 3.0)
+    collector.record_webdriver_command("get", "navigate", 0.15)
+
+    histograms = collector.get_phase_histograms()
+    navigate = histograms["phases"]["navigate"]
+
+    assert navigate["count"] == 2
+    assert navigate["buckets"]["0.25"] == 1
+    assert navigate["buckets"]["5.0"] == 1
+    assert histograms["commands"]["navigate:get"]["count"] == 1
@@ -0,0 +1,43 @@
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from notebooklm_mcp.exceptions import ChatError
+from notebooklm_mcp.recovery import backoff_delay, is_dead_session_error
+
+
+def test_classifies_dead_session_errors():
+    assert is_dead_session_error(InvalidSessionIdException("invalid session id"))
+    assert is_dead_session_error(ConnectionRefusedError(111, "Connection refused"))
+    assert is_dead_session_error(
+        WebDriverException("chrome not reachable\n  (Session info: chrome=120)")
+    )
+    assert is_dead_session_error(
+        WebDriverException(
+            "HTTPConnectionPool(host='localhost', port=5555): Max retries exceeded"
+        )
+    )
+
+
+def test_follows_wrapped_errors():
+    try:
+        try:
+            raise InvalidSessionIdException("gone")
+        except Exception as e:
+            raise ChatError("Failed to submit message") from e
+    except ChatError as wrapped:
+        assert is_dead_session_error(wrapped)
+
+
+def test_ignores_page_errors():
+    assert not is_dead_session_error(TimeoutException("element not found"))
+    assert not is_dead_session_error(ChatError("Could not find chat input element"))
+    assert not is_dead_session_error(None)
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backoff_delay(attempt, base=1.0, cap=4.0) for attempt in range(1, 8)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert backoff_delay(1, base=1.0, cap=4.0) <= 1.0
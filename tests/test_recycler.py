@@ -0,0 +1,229 @@
+import asyncio
+from collections import deque
+
+import pytest
+
+from notebooklm_mcp import monitoring
+from notebooklm_mcp.config import AuthConfig, ServerConfig
+from notebooklm_mcp.recycler import BrowserRecycler, clone_profile
+
+
+class DummyClient:
+    def __init__(self, config, authenticates=True):
+        self.config = config
+        self.browser_id = "primary"
+        self.driver = None
+        self.started = False
+        self.closed = False
+        self._is_authenticated = True
+        self._authenticates = authenticates
+        self.current_notebook_id = config.default_notebook_id
+        self.loaded_notebook_id = None
+        self._notebook_history = deque(maxlen=config.prefetch_history_size)
+        self.sent = []
+
+    async def start(self):
+        self.started = True
+
+    async def authenticate(self):
+        self.loaded_notebook_id = self.current_notebook_id
+        return self._authenticates
+
+    async def ensure_notebook(self, notebook_id):
+        self.current_notebook_id = notebook_id
+        self._notebook_history.append(notebook_id)
+        navigated = self.loaded_notebook_id != notebook_id
+        self.loaded_notebook_id = notebook_id
+        return navigated
+
+    async def send_message(self, message):
+        self.sent.append((self.loaded_notebook_id, message))
+
+    async def close(self, keep_detached=True):
+        self.closed = True
+        self.kept_detached = keep_detached
+
+
+class DummyServer:
+    def __init__(self, config, authenticates=True):
+        self.config = config
+        self.client = DummyClient(config)
+        self.created = []
+        self._authenticates = authenticates
+
+    async def _ensure_client(self):
+        return None
+
+    def _create_client(self, config):
+        client = DummyClient(config, self._authenticates)
+        self.created.append(client)
+        return client
+
+
+def make_config(tmp_path, **kwargs):
+    auth = AuthConfig(
+        profile_dir=str(tmp_path / "profile"), use_persistent_session=False
+    )
+    return ServerConfig(auth=auth, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_lease_tracks_in_flight_requests(tmp_path):
+    server = DummyServer(make_config(tmp_path))
+    recycler = BrowserRecycler(server)
+
+    async with recycler.lease() as client:
+        assert client is server.client
+        assert recycler.in_flight(client) == 1
+
+    assert recycler.in_flight(server.client) == 0
+    assert await recycler.recycle_reason() is None
+
+
+@pytest.mark.asyncio
+async def test_recycles_after_request_threshold(tmp_path, monkeypatch):
+    restarts = []
+    monkeypatch.setattr(
+        monitoring.metrics_collector,
+        "record_browser_restart",
+        lambda: restarts.append(True),
+    )
+    server = DummyServer(make_config(tmp_path, recycle_max_requests=2))
+    recycler = BrowserRecycler(server)
+    old = server.client
+
+    for _ in range(2):
+        async with recycler.lease():
+            pass
+
+    assert await recycler.maybe_recycle() is True
+    assert server.client is server.created[0]
+    assert server.client.started and server.client.browser_id == "slot-a"
+    assert old.closed
+    assert restarts == [True]
+    assert await recycler.recycle_reason() is None
+
+
+@pytest.mark.asyncio
+async def test_recycle_drains_in_flight_requests(tmp_path):
+    server = DummyServer(make_config(tmp_path, recycle_max_age=1))
+    recycler = BrowserRecycler(server)
+    old = server.client
+    released = asyncio.Event()
+
+    async def long_request():
+        async with recycler.lease():
+            await released.wait()
+
+    task = asyncio.create_task(long_request())
+    await asyncio.sleep(0)
+
+    recycle = asyncio.create_task(recycler.recycle("test"))
+    await asyncio.sleep(0.05)
+    # New requests already go to the replacement while the old one drains
+    assert server.client is not old
+    assert not old.closed
+
+    released.set()
+    await task
+    assert await recycle is True
+    assert old.closed
+
+
+@pytest.mark.asyncio
+async def test_recycle_keeps_the_active_notebook(tmp_path):
+    server = DummyServer(make_config(tmp_path, default_notebook_id="default"))
+    recycler = BrowserRecycler(server)
+
+    async with recycler.lease() as client:
+        await client.ensure_notebook("research")
+
+    assert await recycler.recycle("test") is True
+    replacement = server.client
+    assert replacement.current_notebook_id == "research"
+    assert replacement.loaded_notebook_id == "research"
+    assert list(replacement._notebook_history) == ["research"]
+
+    async with recycler.lease() as client:
+        await client.send_message("hello")
+    assert replacement.sent == [("research", "hello")]
+
+
+@pytest.mark.asyncio
+async def test_detached_browser_restarts_in_place(tmp_path):
+    server = DummyServer(make_config(tmp_path, detach_browser=True))
+    recycler = BrowserRecycler(server)
+    old = server.client
+    old.current_notebook_id = "research"
+    started = []
+
+    class SlowClient(DummyClient):
+        async def start(self):
+            # The old Chrome is gone before a new one takes its profile
+            started.append(old.closed)
+            await asyncio.sleep(0.05)
+
+    def create_client(config):
+        server.created.append(SlowClient(config))
+        return server.created[-1]
+
+    server._create_client = create_client
+
+    async def request():
+        async with recycler.lease() as client:
+            return client
+
+    recycle = asyncio.create_task(recycler.recycle("test"))
+    await asyncio.sleep(0.01)
+    waiting = asyncio.create_task(request())
+
+    assert await recycle is True
+    replacement = server.created[0]
+    assert await waiting is replacement
+    assert started == [True]
+    assert old.kept_detached is False
+    assert replacement.config.auth.profile_dir == old.config.auth.profile_dir
+    assert replacement.browser_id == "primary"
+    assert replacement.current_notebook_id == "research"
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_keeps_current_client(tmp_path):
+    server = DummyServer(make_config(tmp_path), authenticates=False)
+    recycler = BrowserRecycler(server)
+    old = server.client
+
+    assert await recycler.recycle("test") is False
+    assert server.client is old
+    assert server.created[0].closed
+
+
+@pytest.mark.asyncio
+async def test_persistent_profile_uses_cloned_slot(tmp_path):
+    config = make_config(tmp_path)
+    config.auth.use_persistent_session = True
+    (tmp_path / "profile" / "Default").mkdir(parents=True)
+    (tmp_path / "profile" / "Default" / "Cookies").write_text("cookies")
+    server = DummyServer(config)
+    recycler = BrowserRecycler(server)
+
+    assert await recycler.recycle("test") is True
+    slot_dir = server.client.config.auth.profile_dir
+    assert slot_dir.endswith("profile-a")
+    assert (tmp_path / "profile-a" / "Default" / "Cookies").read_text() == "cookies"
+    assert config.auth.profile_dir == str(tmp_path / "profile")
+
+
+def test_clone_profile_skips_locks_and_caches(tmp_path):
+    source = tmp_path / "source"
+    (source / "Default" / "Cache").mkdir(parents=True)
+    (source / "Default" / "Cache" / "data_0").write_text("x")
+    (source / "Default" / "Preferences").write_text("{}")
+    (source / "SingletonLock").write_text("host-123")
+
+    clone_profile(str(source), str(tmp_path / "target"))
+
+    target = tmp_path / "target"
+    assert (target / "Default" / "Preferences").exists()
+    assert not (target / "Default" / "Cache").exists()
+    assert not (target / "SingletonLock").exists()
@@ -5,6 +5,7 @@ from types import MethodType, SimpleNamespace
 import pytest
 
 from notebooklm_mcp import server as server_module
+from notebooklm_mcp import telemetry
 from notebooklm_mcp.config import ServerConfig
 from notebooklm_mcp.exceptions import NotebookLMError
 
@@ -500,3 +501,159 @@ async def test_main_handles_general_exception(monkeypatch):
 
     assert exc.value.code == 1
     assert any("Server error" in message for message in logs)
+
+
+@pytest.mark.asyncio
+async def test_chat_with_notebook_includes_trace_in_debug(monkeypatch):
+    from notebooklm_mcp.profiler import CommandTracer
+
+    class TracedClient(DummyClient):
+        def __init__(self, config):
+            super().__init__(config)
+            self.tracer = CommandTracer()
+
+        async def send_message(self, message):
+            with self.tracer.phase("type"):
+                await super().send_message(message)
+
+    monkeypatch.setattr(server_module, "NotebookLMClient", TracedClient)
+    server = server_module.NotebookLMFastMCP(
+        ServerConfig(default_notebook_id="abc", debug=True)
+    )
+    await server._ensure_client()
+
+    response = await server.app.tools["chat_with_notebook"](message="hello")
+
+    assert "type" in response["trace"]["phases"]
+
+
+@pytest.mark.asyncio
+async def test_chat_with_notebook_omits_trace_without_debug(monkeypatch):
+    monkeypatch.setattr(server_module, "NotebookLMClient", DummyClient)
+    server = server_module.NotebookLMFastMCP(ServerConfig(default_notebook_id="abc"))
+    await server._ensure_client()
+
+    response = await server.app.tools["chat_with_notebook"](message="hello")
+
+    assert "trace" not in response
+
+
+@pytest.mark.asyncio
+async def test_tool_call_spans_written_to_file(monkeypatch, tmp_path):
+    pytest.importorskip("opentelemetry.sdk")
+    monkeypatch.setattr(server_module, "NotebookLMClient", DummyClient)
+    trace_file = tmp_path / "traces.jsonl"
+    config = ServerConfig(
+        default_notebook_id="abc",
+        telemetry_exporter="file",
+        telemetry_file=str(trace_file),
+    )
+
+    server = server_module.NotebookLMFastMCP(config)
+    assert telemetry.is_enabled() is True
+
+    await server.app.tools["chat_with_notebook"](message="hello")
+    await server.stop()
+    assert telemetry.is_enabled() is False
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    by_name = {span["name"]: span for span in spans}
+
+    tool_span = by_name["mcp.tool.chat_with_notebook"]
+    child = by_name["notebooklm.ensure_client"]
+    assert child["parent_id"] == tool_span["context"]["span_id"]
+    assert tool_span["attributes"]["notebooklm.notebook_id"] == "abc"
+    assert tool_span["attributes"]["notebooklm.prompt_length"] == 5
+    assert tool_span["attributes"]["notebooklm.answer_length"] == len("response")
+
+
+@pytest.mark.asyncio
+async def test_tool_restarts_dead_browser_and_retries(monkeypatch):
+    from selenium.common.exceptions import InvalidSessionIdException
+
+    class CrashingClient(DummyClient):
+        def __init__(self, config):
+            super().__init__(config)
+            self.generation = 0
+            self.restarts = []
+            self.failures = 1
+
+        async def get_response(self):
+            if self.failures:
+                self.failures -= 1
+                raise InvalidSessionIdException("invalid session id")
+            return "recovered"
+
+        async def restart(self, seen_generation=None):
+            self.restarts.append(seen_generation)
+            self.generation += 1
+            return True
+
+    recoveries = []
+    monkeypatch.setattr(server_module, "backoff_delay", lambda _attempt: 0)
+    monkeypatch.setattr(
+        server_module.metrics_collector,
+        "record_recovery",
+        lambda duration: recoveries.append(duration),
+    )
+    server = server_module.NotebookLMFastMCP(ServerConfig(default_notebook_id="abc"))
+    server.client = CrashingClient(server.config)
+
+    async def fake_ensure(self):
+        return None
+
+    server._ensure_client = MethodType(fake_ensure, server)
+    response = await server.app.tools["get_chat_response"]()
+
+    assert response["response"] == "recovered"
+    assert server.client.restarts == [0]
+    assert len(recoveries) == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_does_not_retry_ordinary_errors(monkeypatch):
+    class FailingClient(DummyClient):
+        generation = 0
+
+        async def get_response(self):
+            raise RuntimeError("element not found")
+
+        async def restart(self, seen_generation=None):  # pragma: no cover
+            raise AssertionError("should not restart")
+
+    server = server_module.NotebookLMFastMCP(
+        ServerConfig(default_notebook_id="abc", retry_attempts=3)
+    )
+    server.client = FailingClient(server.config)
+
+    async def fake_ensure(self):
+        return None
+
+    server._ensure_client = MethodType(fake_ensure, server)
+    with pytest.raises(NotebookLMError, match="element not found"):
+        await server.app.tools["get_chat_response"]()
+
+
+@pytest.mark.asyncio
+async def test_chat_with_notebook_skips_loaded_notebook(monkeypatch):
+    class TrackingClient(DummyClient):
+        def __init__(self, config):
+            super().__init__(config)
+            self.loaded = "abc"
+
+        async def ensure_notebook(self, notebook_id):
+            if notebook_id != self.loaded:
+                await self.navigate_to_notebook(notebook_id)
+                self.loaded = notebook_id
+
+    server = server_module.NotebookLMFastMCP(ServerConfig(default_notebook_id="abc"))
+    server.client = TrackingClient(server.config)
+
+    async def fake_ensure(self):
+        return None
+
+    server._ensure_client = MethodType(fake_ensure, server)
+    await server.app.tools["chat_with_notebook"](message="hi", notebook_id="abc")
+    await server.app.tools["chat_with_notebook"](message="hi", notebook_id="xyz")
+
+    assert server.client.navigated_to == ["xyz"]
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from notebooklm_mcp.sketch import QuantileSketch
+
+
+def test_quantiles_within_relative_error():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 1) for _ in range(5000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.03)
+
+    assert sketch.count == len(values)
+    assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+
+def test_empty_sketch_reports_zero():
+    sketch = QuantileSketch()
+    assert sketch.quantile(0.99) == 0.0
+    assert sketch.quantiles([0.5, 0.95]) == {"p50": 0.0, "p95": 0.0}
+
+
+def test_merge_matches_single_sketch():
+    combined, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in range(1, 201):
+        combined.add(value / 100)
+        (left if value % 2 else right).add(value / 100)
+
+    left.merge(right)
+    assert left.count == combined.count
+    assert left.quantiles([0.5, 0.99]) == combined.quantiles([0.5, 0.99])
+
+
+def test_round_trip_and_accuracy_mismatch():
+    sketch = QuantileSketch()
+    for value in (0.0, 0.2, 1.5, 3.0):
+        sketch.add(value)
+
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+    assert restored.quantile(0.5) == sketch.quantile(0.5)
+    assert restored.zero_count == 1
+
+    with pytest.raises(ValueError):
+        restored.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_bucket_count_is_bounded():
+    sketch = QuantileSketch(max_buckets=16)
+    for exponent in range(-5, 5):
+        for step in range(1, 10):
+            sketch.add(step * 10**exponent)
+
+    assert len(sketch._buckets) <= 16
+    assert sketch.quantile(1.0) == sketch.max
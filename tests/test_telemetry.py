@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from notebooklm_mcp import telemetry
+from notebooklm_mcp.config import ServerConfig
+from notebooklm_mcp.exceptions import ConfigurationError
+
+
+@pytest.fixture(autouse=True)
+def reset_telemetry():
+    telemetry.shutdown_telemetry()
+    yield
+    telemetry.shutdown_telemetry()
+
+
+def test_span_is_noop_when_disabled():
+    assert telemetry.setup_telemetry(ServerConfig()) is False
+    assert telemetry.is_enabled() is False
+
+    with telemetry.span("anything", {"notebooklm.notebook_id": "abc"}) as span:
+        span.set_attribute("notebooklm.answer_length", 3)
+
+    assert span is telemetry._NOOP_SPAN
+
+
+def test_validate_rejects_unknown_exporter():
+    with pytest.raises(ConfigurationError, match="telemetry exporter"):
+        ServerConfig(telemetry_exporter="zipkin").validate()
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    pytest.importorskip("opentelemetry.sdk")
+    trace_file = tmp_path / "traces.jsonl"
+
+    assert telemetry.setup_telemetry(
+        ServerConfig(telemetry_exporter="file", telemetry_file=str(trace_file))
+    )
+    with telemetry.span("outer", {"notebooklm.notebook_id": "abc", "skip": None}):
+        with telemetry.span("inner"):
+            pass
+    telemetry.shutdown_telemetry()
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    by_name = {span["name"]: span for span in spans}
+    assert by_name["inner"]["parent_id"] == by_name["outer"]["context"]["span_id"]
+    assert by_name["outer"]["attributes"] == {"notebooklm.notebook_id": "abc"}